@@ -0,0 +1,502 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+🍗 SCRAPER SADIA - CLI não interativa
+=====================================
+Execução sem menus nem confirmações, pensada para cron e containers.
+
+COMO USAR:
+    python cli.py coletar --workers 4
+    python cli.py extrair --workers 4 --formato parquet
+    python cli.py completo                 # só as etapas desatualizadas
+    python cli.py servico --intervalo-produtos 6
+    python cli.py api --porta 8766
+    python cli.py estatisticas
+    python cli.py analisar
+    python cli.py similares "presunto" --menor "SODIO (mg)"
+
+Os módulos pesados (requests, BeautifulSoup, pandas) só são importados
+pelo subcomando que realmente precisa deles.
+"""
+
+import argparse
+import os
+import sys
+
+ARQUIVO_URLS = "dados/urls_produtos.json"
+ARQUIVO_DADOS = "dados/produtos_sadia.csv"
+
+
+def inteiro_positivo(valor):
+    """Tipo do argparse para inteiros maiores que zero"""
+    numero = int(valor)
+    if numero < 1:
+        raise argparse.ArgumentTypeError(f"deve ser pelo menos 1: {valor}")
+    return numero
+
+
+def criar_cliente(args):
+    """Cliente HTTP compartilhado com os timeouts, o hedge e o protocolo escolhidos"""
+    from config.rede import ClienteHTTP, ClienteHTTP2
+
+    opcoes = dict(
+        timeout_conexao=args.timeout_conexao, timeout_leitura=args.timeout_leitura,
+        hedge=args.hedge, tamanho_pool=max(10, args.workers),
+    )
+    if not args.http2:
+        return ClienteHTTP(**opcoes)
+    try:
+        return ClienteHTTP2(conexoes=args.conexoes, max_streams=args.streams or max(10, args.workers), **opcoes)
+    except ImportError as e:
+        raise SystemExit(f"❌ {e}")
+
+
+def criar_cortesia(args, cliente):
+    """Política do robots.txt (None com --ignorar-robots)"""
+    if args.ignorar_robots:
+        return None
+    from config.cortesia import PoliticaRobots
+
+    return PoliticaRobots(cliente)
+
+
+def criar_sites(args):
+    """Perfis dos sites escolhidos com --site, compilados uma vez para o coletor e o scraper"""
+    from config.sites import PlanosSites
+
+    try:
+        return PlanosSites(args.site)
+    except ValueError as e:
+        raise SystemExit(f"❌ {e}")
+
+
+def criar_rastreamento(args):
+    """Opções do rastreamento do site inteiro (None sem --rastrear: usa a lista de categorias)"""
+    if not args.rastrear:
+        return None
+    return {'max_paginas': args.max_paginas_rastreio, 'profundidade': args.profundidade,
+            'continuar': args.continuar_rastreio}
+
+
+def comando_coletar(args) -> int:
+    """Coleta as URLs de produtos de todas as categorias"""
+    from config.url_collector import URLCollector
+
+    cliente = criar_cliente(args)
+    coletor = URLCollector(max_workers=args.workers, delay=args.delay, cliente=cliente,
+                           cortesia=criar_cortesia(args, cliente), sites=criar_sites(args),
+                           rastreamento=criar_rastreamento(args))
+    coletor.processar_todas_categorias()
+    coletor.mostrar_estatisticas()
+
+    if not coletor.urls_produtos:
+        print("❌ Nenhuma URL de produto encontrada")
+        return 1
+
+    coletor.salvar_json()
+    return 0
+
+
+def comando_extrair(args) -> int:
+    """Extrai os dados nutricionais das URLs coletadas"""
+    from config.scraper import ScraperSadia, carregar_urls
+    from config.saude import MonitorSaude
+
+    urls = carregar_urls(args.entrada)
+    monitor = MonitorSaude(limite_falhas=args.limite_falhas, acao=args.ao_falhar)
+    perfil = None
+    if args.profile:
+        from config.perfil import PerfilPipeline
+        perfil = PerfilPipeline(amostragem=args.profile_amostragem, memoria=args.profile_memoria)
+
+    cliente = criar_cliente(args)
+    scraper = ScraperSadia(max_workers=args.workers, delay=args.delay,
+                           gerar_mudancas=not args.sem_mudancas, monitor=monitor,
+                           cliente=cliente, perfil=perfil, cortesia=criar_cortesia(args, cliente),
+                           sites=criar_sites(args), extrator=args.extrator,
+                           validacao=not args.sem_validacao)
+    try:
+        arquivo_salvo = scraper.processar_lista_urls(
+            urls, formato=args.formato, max_duracao=args.max_duracao, max_paginas=args.max_paginas
+        )
+    finally:
+        if perfil:
+            perfil.finalizar()
+    return 0 if arquivo_salvo else 1
+
+
+def comando_completo(args) -> int:
+    """
+    Coleta, download, extração, validação, gravação e estatísticas como um grafo de etapas
+
+    Cada etapa só roda se as suas entradas, o código ou os parâmetros mudaram
+    desde a última execução (registro em dados/etapas.json).
+    """
+    from config.etapas import pipeline_completo
+    from config.scraper import ScraperSadia
+    from config.saude import MonitorSaude
+    from config.url_collector import URLCollector
+
+    perfil = None
+    if args.profile:
+        from config.perfil import PerfilPipeline
+        perfil = PerfilPipeline(amostragem=args.profile_amostragem, memoria=args.profile_memoria)
+
+    cliente = criar_cliente(args)
+    cortesia = criar_cortesia(args, cliente)
+    sites = criar_sites(args)
+    coletor = URLCollector(max_workers=args.workers, delay=args.delay, cliente=cliente, cortesia=cortesia,
+                           sites=sites, rastreamento=criar_rastreamento(args))
+    scraper = ScraperSadia(max_workers=args.workers, delay=args.delay,
+                           gerar_mudancas=not args.sem_mudancas,
+                           monitor=MonitorSaude(limite_falhas=args.limite_falhas, acao=args.ao_falhar),
+                           cliente=cliente, perfil=perfil, cortesia=cortesia, sites=sites,
+                           extrator=args.extrator, validacao=not args.sem_validacao)
+    grafo = pipeline_completo(coletor, scraper, formato=args.formato, max_duracao=args.max_duracao,
+                              max_paginas=args.max_paginas, forcar=args.forcar or (), arquivo_urls=args.entrada)
+    try:
+        sucesso = grafo.executar()
+    finally:
+        if perfil:
+            perfil.finalizar()
+    print(f"\n🧩 Etapas: {grafo.resumo()}")
+    return 0 if sucesso else 1
+
+
+def comando_servico(args) -> int:
+    """Roda em modo serviço: ciclos agendados com conexões e caches mantidos"""
+    import signal
+    from config.scraper import ScraperSadia
+    from config.saude import MonitorSaude
+    from config.servico import ServicoScraper
+    from config.url_collector import URLCollector
+
+    cliente = criar_cliente(args)
+    perfil = None
+    if args.profile:
+        from config.perfil import PerfilPipeline
+        perfil = PerfilPipeline(amostragem=args.profile_amostragem, memoria=args.profile_memoria)
+
+    cortesia = criar_cortesia(args, cliente)
+    sites = criar_sites(args)
+    coletor = URLCollector(max_workers=args.workers, delay=args.delay, cliente=cliente, cortesia=cortesia,
+                           sites=sites, rastreamento=criar_rastreamento(args))
+    scraper = ScraperSadia(max_workers=args.workers, delay=args.delay,
+                           gerar_mudancas=not args.sem_mudancas,
+                           monitor=MonitorSaude(limite_falhas=args.limite_falhas, acao=args.ao_falhar),
+                           cliente=cliente, perfil=perfil, cortesia=cortesia, sites=sites,
+                           extrator=args.extrator, validacao=not args.sem_validacao)
+    servico = ServicoScraper(
+        coletor, scraper,
+        intervalo_categorias=args.intervalo_categorias * 3600,
+        intervalo_produtos=args.intervalo_produtos * 3600,
+        formato=args.formato, max_duracao=args.max_duracao, max_paginas=args.max_paginas,
+        arquivo_urls=args.entrada,
+    )
+    signal.signal(signal.SIGTERM, lambda *_: servico.parar())
+    try:
+        servico.executar(host=args.host, porta=None if args.porta == 0 else args.porta)
+    finally:
+        if perfil:
+            perfil.finalizar()
+    return 0
+
+
+def comando_api(args) -> int:
+    """Serve consultas somente leitura sobre o CSV de produtos"""
+    import signal
+    from config.consulta import ServidorConsulta
+
+    if not os.path.exists(args.entrada):
+        print(f"❌ Arquivo de dados não encontrado: {args.entrada}")
+        return 1
+
+    servidor = ServidorConsulta(args.entrada, intervalo_recarga=args.intervalo_recarga)
+    signal.signal(signal.SIGTERM, lambda *_: servidor.parar())
+    servidor.iniciar(host=args.host, porta=args.porta)
+    try:
+        servidor.aguardar()
+    finally:
+        servidor.parar()
+    return 0
+
+
+def comando_benchmark_rede(args) -> int:
+    """Compara HTTP/1.1 e HTTP/2 num servidor local"""
+    try:
+        from config.benchmark_rede import benchmark
+        benchmark(requisicoes=args.requisicoes, concorrencia=args.concorrencia,
+                  latencia=args.latencia / 1000, tamanho_pagina=args.tamanho_pagina * 1024,
+                  conexoes_http2=args.conexoes)
+    except ImportError as e:
+        print(f"❌ {e}")
+        return 1
+    return 0
+
+
+def comando_estatisticas(args) -> int:
+    """Mostra um resumo dos dados já coletados"""
+    from config.estatisticas import ResumoDados, ARQUIVO_RESUMO
+
+    resumo = ResumoDados.carregar()
+    if not resumo.existe():
+        print(f"⚠️  Resumo não encontrado ({ARQUIVO_RESUMO})")
+        return 1
+
+    if args.json:
+        import json
+        print(json.dumps(resumo.para_dict(), indent=2, ensure_ascii=False))
+        return 0
+
+    print(f"🔗 URLs coletadas: {resumo.urls['total']}")
+    print(f"📊 Produtos extraídos: {resumo.produtos['total']}")
+    categorias = sorted(resumo.produtos['por_categoria'].items(), key=lambda item: item[1], reverse=True)
+    for categoria, quantidade in categorias[:5]:
+        print(f"   • {categoria}: {quantidade} produtos")
+    print(f"💾 Tamanho dos arquivos de saída registrados: {resumo.tamanho_total()} bytes")
+    if resumo.tamanho_pasta is not None:
+        print(f"💾 Tamanho da pasta dados/ na última gravação: {resumo.tamanho_pasta} bytes")
+    if resumo.atualizado_em:
+        print(f"🕒 Atualizado em: {resumo.atualizado_em}")
+
+    return 0
+
+
+def comando_analisar(args) -> int:
+    """Gera as tabelas de análise nutricional (ou roda o benchmark)"""
+    from config import analise
+
+    if args.benchmark:
+        analise.benchmark(args.benchmark)
+        return 0
+
+    faltando = [caminho for caminho in args.entrada if not os.path.exists(caminho)]
+    if faltando:
+        print(f"❌ Arquivo de dados não encontrado: {', '.join(faltando)}")
+        return 1
+
+    dados = analise.carregar_colunas(args.entrada)
+    print(f"📊 {len(dados)} produtos carregados")
+    analise.exportar_tabelas(analise.analisar(dados), args.saida)
+    return 0
+
+
+def comando_validar(args) -> int:
+    """Gera o relatório de qualidade de um CSV já gravado (ou roda o benchmark)"""
+    from config import qualidade
+
+    if args.benchmark:
+        qualidade.benchmark(args.benchmark)
+        return 0
+
+    if not os.path.exists(args.entrada):
+        print(f"❌ Arquivo de dados não encontrado: {args.entrada}")
+        return 1
+
+    relatorio = qualidade.validar(qualidade.carregar_csv(args.entrada))
+    relatorio.imprimir()
+    print(f"🧪 Relatório de qualidade salvo em: {relatorio.gravar(args.entrada)}")
+    return 0
+
+
+def comando_similares(args) -> int:
+    """Lista os produtos nutricionalmente mais parecidos com um produto"""
+    from config.similaridade import IndiceSimilaridade
+
+    if not os.path.exists(args.entrada):
+        print(f"❌ Arquivo de dados não encontrado: {args.entrada}")
+        return 1
+
+    indice = IndiceSimilaridade.carregar(args.entrada)
+    try:
+        vizinhos = indice.vizinhos(args.produto, k=args.k, categoria=args.categoria, menor_que=args.menor)
+    except ValueError as e:
+        print(f"❌ {e}")
+        return 1
+    if not vizinhos:
+        print(f"⚠️  Nenhum produto parecido encontrado para: {args.produto}")
+        return 1
+
+    if args.json:
+        import json
+        print(json.dumps(vizinhos, indent=2, ensure_ascii=False))
+        return 0
+
+    for i, vizinho in enumerate(vizinhos, 1):
+        detalhe = f" - {args.menor}: {vizinho[args.menor]:g}" if args.menor else ""
+        print(f"{i:2d}. {vizinho['NOME_PRODUTO']} ({vizinho['CATEGORIA']}) "
+              f"distância {vizinho['DISTANCIA']:.3f}{detalhe}")
+        print(f"    {vizinho['URL']}")
+    return 0
+
+
+def criar_parser() -> argparse.ArgumentParser:
+    """Monta o parser de argumentos com os subcomandos"""
+    from config.estatisticas import NUTRIENTES
+
+    parser = argparse.ArgumentParser(
+        prog='scraper_sadia',
+        description='Scraper Sadia - execução não interativa'
+    )
+    subparsers = parser.add_subparsers(dest='comando', required=True)
+
+    def opcoes_rede(sub, delay_padrao):
+        sub.add_argument('--site', action='append', metavar='NOME',
+                         help='perfil do site (marca) a processar; repita para vários (padrão: sadia)')
+        sub.add_argument('-w', '--workers', type=int, default=1,
+                         help='requisições em paralelo (padrão: 1)')
+        sub.add_argument('--delay', type=float,
+                         help='segundos entre requisições por worker (padrão: o Crawl-delay do '
+                              f'robots.txt ou {delay_padrao:g})')
+        sub.add_argument('--ignorar-robots', action='store_true',
+                         help='não consulta o robots.txt (nem filtra URLs nem aplica o Crawl-delay)')
+        sub.add_argument('--timeout-conexao', type=float, default=5.0, metavar='SEGUNDOS',
+                         help='timeout para abrir a conexão (padrão: 5)')
+        sub.add_argument('--timeout-leitura', type=float, default=25.0, metavar='SEGUNDOS',
+                         help='timeout para receber a resposta (padrão: 25)')
+        sub.add_argument('--hedge', action='store_true',
+                         help='repete a requisição quando ela passa do p95 do host e usa a primeira resposta')
+        sub.add_argument('--http2', action='store_true',
+                         help='usa HTTP/2 multiplexado (requer httpx[http2])')
+        sub.add_argument('--conexoes', type=int, default=1, metavar='N',
+                         help='conexões HTTP/2 abertas com o site (padrão: 1)')
+        sub.add_argument('--streams', type=int, metavar='N',
+                         help='requisições HTTP/2 simultâneas (padrão: o maior entre 10 e --workers)')
+
+    def opcoes_rastreamento(sub):
+        sub.add_argument('--rastrear', action='store_true',
+                         help='percorre o site inteiro a partir de /produtos/ seguindo os links internos, '
+                              'em vez de só as páginas das categorias')
+        sub.add_argument('--max-paginas-rastreio', type=int, default=5000, metavar='N',
+                         help='páginas visitadas por rodada do rastreamento (padrão: 5000)')
+        sub.add_argument('--profundidade', type=int, default=8, metavar='N',
+                         help='cliques a partir de /produtos/ que o rastreamento segue (padrão: 8)')
+        sub.add_argument('--continuar-rastreio', action='store_true',
+                         help='retoma a rodada interrompida (fila e páginas vistas em dados/rastreamento/)')
+
+    def opcoes_extracao(sub):
+        sub.add_argument('-f', '--formato', choices=['csv', 'json', 'parquet'], default='csv',
+                         help='formato do arquivo de saída (padrão: csv)')
+        sub.add_argument('-e', '--entrada', default=ARQUIVO_URLS,
+                         help=f'JSON com as URLs a processar (padrão: {ARQUIVO_URLS})')
+        sub.add_argument('--extrator', choices=['arvore', 'continuo'], default='arvore',
+                         help='arvore: BeautifulSoup completo; continuo: um passe pelo HTML sem montar a árvore '
+                              '(menos CPU e memória, mesmos registros)')
+        sub.add_argument('--sem-validacao', action='store_true',
+                         help='não gera o relatório de qualidade (<saida>_qualidade.json/.csv)')
+        sub.add_argument('--sem-mudancas', action='store_true',
+                         help='não gera o feed de mudanças em dados/mudancas/')
+        sub.add_argument('--max-duracao', '--max-duration', dest='max_duracao', type=float, metavar='SEGUNDOS',
+                         help='para de buscar páginas após este tempo (as mais desatualizadas vêm primeiro)')
+        sub.add_argument('--max-paginas', '--max-pages', dest='max_paginas', type=int, metavar='N',
+                         help='busca no máximo N páginas de produto nesta execução')
+        sub.add_argument('--limite-falhas', type=float, default=0.8, metavar='FRACAO',
+                         help='taxa de falhas de um seletor que abre o disjuntor (padrão: 0.8)')
+        sub.add_argument('--ao-falhar', choices=['abortar', 'pausar'], default='abortar',
+                         help='ação do disjuntor: abortar, ou pausar uma vez antes de abortar')
+        sub.add_argument('--profile', action='store_true',
+                         help='roda sob cProfile e grava um perfil por etapa em dados/perfil/')
+        sub.add_argument('--profile-amostragem', type=float, default=1.0, metavar='FRACAO',
+                         help='fração das páginas medidas pelo profiler (padrão: 1.0)')
+        sub.add_argument('--profile-memoria', action='store_true',
+                         help='inclui os pontos de maior alocação (tracemalloc) no resumo')
+
+    sub = subparsers.add_parser('coletar', aliases=['collect'], help='coleta URLs de produtos')
+    opcoes_rede(sub, 3.0)
+    opcoes_rastreamento(sub)
+    sub.set_defaults(funcao=comando_coletar)
+
+    sub = subparsers.add_parser('extrair', aliases=['scrape'], help='extrai dados nutricionais')
+    opcoes_rede(sub, 2.0)
+    opcoes_extracao(sub)
+    sub.set_defaults(funcao=comando_extrair)
+
+    sub = subparsers.add_parser('completo', aliases=['full'], help='coleta URLs + extrai dados (só as etapas desatualizadas)')
+    opcoes_rede(sub, 2.0)
+    opcoes_extracao(sub)
+    opcoes_rastreamento(sub)
+    sub.add_argument('--forcar', action='append', metavar='ETAPA',
+                     choices=['coleta', 'download', 'extracao', 'validacao', 'gravacao', 'estatisticas', 'todas'],
+                     help='roda a etapa mesmo se estiver em dia (repita a opção; "todas" roda o grafo inteiro)')
+    sub.set_defaults(funcao=comando_completo)
+
+    sub = subparsers.add_parser('servico', aliases=['daemon'], help='modo serviço com atualização agendada')
+    opcoes_rede(sub, 2.0)
+    opcoes_extracao(sub)
+    opcoes_rastreamento(sub)
+    sub.add_argument('--intervalo-categorias', type=float, default=24.0, metavar='HORAS',
+                     help='intervalo entre coletas de URLs (padrão: 24)')
+    sub.add_argument('--intervalo-produtos', type=float, default=6.0, metavar='HORAS',
+                     help='intervalo entre extrações de produtos (padrão: 6)')
+    sub.add_argument('--host', default='127.0.0.1', help='endereço do endpoint de status (padrão: 127.0.0.1)')
+    sub.add_argument('--porta', type=int, default=8765,
+                     help='porta do endpoint de status; 0 desativa (padrão: 8765)')
+    sub.set_defaults(funcao=comando_servico)
+
+    sub = subparsers.add_parser('api', aliases=['serve'], help='API local de consulta aos produtos')
+    sub.add_argument('-e', '--entrada', default=ARQUIVO_DADOS,
+                     help=f'CSV de produtos (padrão: {ARQUIVO_DADOS})')
+    sub.add_argument('--host', default='127.0.0.1', help='endereço da API (padrão: 127.0.0.1)')
+    sub.add_argument('--porta', type=int, default=8766, help='porta da API (padrão: 8766)')
+    sub.add_argument('--intervalo-recarga', type=float, default=2.0, metavar='SEGUNDOS',
+                     help='frequência da verificação de nova versão do CSV; 0 desativa (padrão: 2)')
+    sub.set_defaults(funcao=comando_api)
+
+    sub = subparsers.add_parser('benchmark-rede', aliases=['net-benchmark'],
+                                help='HTTP/1.1 x HTTP/2 num servidor local')
+    sub.add_argument('--requisicoes', type=int, default=500, help='total de requisições (padrão: 500)')
+    sub.add_argument('--concorrencia', type=int, default=32, help='requisições em paralelo (padrão: 32)')
+    sub.add_argument('--latencia', type=float, default=50.0, metavar='MS',
+                     help='tempo de resposta simulado do servidor (padrão: 50 ms)')
+    sub.add_argument('--tamanho-pagina', type=int, default=60, metavar='KB',
+                     help='tamanho de cada página (padrão: 60 KB)')
+    sub.add_argument('--conexoes', type=int, default=1, help='conexões HTTP/2 (padrão: 1)')
+    sub.set_defaults(funcao=comando_benchmark_rede)
+
+    sub = subparsers.add_parser('estatisticas', aliases=['stats'], help='resumo dos dados coletados')
+    sub.add_argument('--json', action='store_true', help='imprime o resumo completo em JSON')
+    sub.set_defaults(funcao=comando_estatisticas)
+
+    sub = subparsers.add_parser('analisar', aliases=['analyze'], help='análise nutricional vetorizada')
+    sub.add_argument('-e', '--entrada', nargs='+', default=[ARQUIVO_DADOS],
+                     help=f'um ou mais CSVs (snapshots) a analisar (padrão: {ARQUIVO_DADOS})')
+    sub.add_argument('-o', '--saida', default='dados/analise',
+                     help='pasta das tabelas geradas (padrão: dados/analise)')
+    sub.add_argument('--benchmark', type=int, metavar='LINHAS',
+                     help='mede o tempo das análises sobre LINHAS linhas sintéticas')
+    sub.set_defaults(funcao=comando_analisar)
+
+    sub = subparsers.add_parser('validar', aliases=['validate'], help='relatório de qualidade dos dados')
+    sub.add_argument('-e', '--entrada', default=ARQUIVO_DADOS,
+                     help=f'CSV de produtos (padrão: {ARQUIVO_DADOS})')
+    sub.add_argument('--benchmark', type=int, metavar='LINHAS',
+                     help='mede o tempo da validação sobre LINHAS linhas sintéticas')
+    sub.set_defaults(funcao=comando_validar)
+
+    sub = subparsers.add_parser('similares', aliases=['similar'], help='produtos nutricionalmente parecidos')
+    sub.add_argument('produto', help='URL ou parte do nome do produto')
+    sub.add_argument('-k', type=inteiro_positivo, default=5, help='quantidade de vizinhos (padrão: 5)')
+    sub.add_argument('-c', '--categoria', help='restringe a busca a uma categoria')
+    sub.add_argument('--menor', metavar='NUTRIENTE', choices=NUTRIENTES,
+                     help="só produtos com valor menor neste nutriente (ex.: 'SODIO (mg)')")
+    sub.add_argument('-e', '--entrada', default=ARQUIVO_DADOS,
+                     help=f'CSV de produtos (padrão: {ARQUIVO_DADOS})')
+    sub.add_argument('--json', action='store_true', help='imprime o resultado em JSON')
+    sub.set_defaults(funcao=comando_similares)
+
+    return parser
+
+
+def main(argv=None) -> int:
+    """Ponto de entrada da CLI"""
+    args = criar_parser().parse_args(argv)
+    try:
+        return args.funcao(args)
+    except KeyboardInterrupt:
+        print("\n⚠️  Execução interrompida")
+        return 130
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Agendamento por desatualização e orçamento de execução
+Guarda o histórico de cada URL em dados/estado_urls.json e ordena o trabalho
+para atualizar primeiro as páginas mais antigas
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+
+ARQUIVO_ESTADO = os.path.join('dados', 'estado_urls.json')
+
+# Páginas que mudaram recentemente tendem a mudar de novo
+JANELA_MUDANCA_RECENTE = 7 * 24 * 3600
+PESO_MUDANCA_RECENTE = 1.5
+
+
+def assinatura_produto(produto, colunas):
+    """Hash curto dos valores extraídos (detecta se a página mudou)"""
+    conteudo = '\x1f'.join(str(produto[coluna]) for coluna in colunas)
+    return hashlib.blake2b(conteudo.encode('utf-8'), digest_size=8).hexdigest()
+
+
+class EstadoURLs:
+    """Última extração com sucesso, última mudança e falhas consecutivas por URL"""
+
+    def __init__(self, caminho=ARQUIVO_ESTADO):
+        self.caminho = caminho
+        self.urls = {}
+        self._trava = threading.Lock()
+
+    @classmethod
+    def carregar(cls, caminho=ARQUIVO_ESTADO):
+        """Carrega o estado salvo (ou um estado vazio)"""
+        estado = cls(caminho)
+        if os.path.exists(caminho):
+            try:
+                with open(caminho, 'r', encoding='utf-8') as f:
+                    estado.urls = json.load(f)
+            except (OSError, ValueError) as e:
+                print(f"⚠️ Estado das URLs inválido, recriando: {e}")
+        return estado
+
+    def _entrada(self, url):
+        return self.urls.setdefault(url, {
+            'ultimo_sucesso': None, 'ultima_mudanca': None, 'falhas': 0, 'assinatura': None
+        })
+
+    def registrar_sucesso(self, url, assinatura, agora=None):
+        """Marca a URL como atualizada agora (e como mudada, se a assinatura mudou)"""
+        agora = agora or time.time()
+        with self._trava:
+            entrada = self._entrada(url)
+            if entrada['assinatura'] != assinatura:
+                entrada['ultima_mudanca'] = agora
+                entrada['assinatura'] = assinatura
+            entrada['ultimo_sucesso'] = agora
+            entrada['falhas'] = 0
+
+    def registrar_falha(self, url):
+        """Conta mais uma falha consecutiva para a URL"""
+        with self._trava:
+            self._entrada(url)['falhas'] += 1
+
+    def prioridade(self, url, agora=None):
+        """Quanto maior, mais urgente: idade da última extração, com bônus e penalidades"""
+        entrada = self.urls.get(url)
+        if not entrada or not entrada['ultimo_sucesso']:
+            # Nunca extraída: vai antes de todas, mas falhas repetidas ainda contam
+            return float('inf') if not entrada or not entrada['falhas'] else 1e12 / (1 + entrada['falhas'])
+
+        agora = agora or time.time()
+        idade = max(agora - entrada['ultimo_sucesso'], 0.0)
+        if entrada['ultima_mudanca'] and agora - entrada['ultima_mudanca'] < JANELA_MUDANCA_RECENTE:
+            idade *= PESO_MUDANCA_RECENTE
+        return idade / (1 + entrada['falhas'])
+
+    def ordenar(self, urls, agora=None):
+        """Ordena as URLs da mais desatualizada para a mais recente"""
+        agora = agora or time.time()
+        return sorted(urls, key=lambda url: self.prioridade(url, agora), reverse=True)
+
+    def salvar(self):
+        """Grava o estado de forma atômica"""
+        os.makedirs(os.path.dirname(self.caminho) or '.', exist_ok=True)
+        temporario = self.caminho + '.tmp'
+        with self._trava:
+            with open(temporario, 'w', encoding='utf-8') as f:
+                json.dump(self.urls, f, indent=2, ensure_ascii=False, sort_keys=True)
+        os.replace(temporario, self.caminho)
+        return self.caminho
+
+
+class Orcamento:
+    """Limite de tempo e/ou de páginas para uma execução"""
+
+    def __init__(self, max_duracao=None, max_paginas=None):
+        self.max_duracao = max_duracao
+        self.max_paginas = max_paginas
+        self.inicio = time.monotonic()
+        self.paginas = 0
+        self._trava = threading.Lock()
+
+    def reservar(self):
+        """Reserva uma página; retorna False se o orçamento já acabou"""
+        with self._trava:
+            if self.esgotado():
+                return False
+            self.paginas += 1
+            return True
+
+    def esgotado(self):
+        """Indica se algum dos limites foi atingido"""
+        if self.max_paginas is not None and self.paginas >= self.max_paginas:
+            return True
+        if self.max_duracao is not None and time.monotonic() - self.inicio >= self.max_duracao:
+            return True
+        return False
+
+    def descricao(self):
+        """Texto curto com os limites configurados"""
+        limites = []
+        if self.max_duracao is not None:
+            limites.append(f"{self.max_duracao:g}s")
+        if self.max_paginas is not None:
+            limites.append(f"{self.max_paginas} páginas")
+        return ' / '.join(limites) or 'sem limite'
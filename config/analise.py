@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+"""
+Análise nutricional vetorizada dos produtos coletados
+Carrega as colunas de nutrientes em arrays NumPy e gera tabelas de resumo
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+
+# Permite rodar tanto como script (python config/x.py) quanto como módulo (config.x)
+if not __package__:
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.estatisticas import NUTRIENTES
+
+ARQUIVO_DADOS = os.path.join('dados', 'produtos_sadia.csv')
+PASTA_ANALISE = os.path.join('dados', 'analise')
+
+# Nutrientes analisados: 'PORCAO (g)' é só a base dos valores da tabela (100 g), não um nutriente
+COLUNAS_NUTRIENTES = [coluna for coluna in NUTRIENTES if coluna != 'PORCAO (g)']
+PERCENTIS = (5, 25, 50, 75, 95)
+
+
+class DadosColunares:
+    """Produtos em formato colunar: nomes, categorias e matriz (n_produtos x n_nutrientes)"""
+
+    __slots__ = ('nomes', 'urls', 'categorias', 'matriz', 'colunas')
+
+    def __init__(self, nomes, urls, categorias, matriz, colunas=COLUNAS_NUTRIENTES):
+        self.nomes = nomes
+        self.urls = urls
+        self.categorias = categorias
+        self.matriz = matriz
+        self.colunas = list(colunas)
+
+    def __len__(self):
+        return self.matriz.shape[0]
+
+    def coluna(self, nome):
+        """Retorna a coluna de um nutriente como array 1D"""
+        return self.matriz[:, self.colunas.index(nome)]
+
+
+def carregar_colunas(caminhos=ARQUIVO_DADOS, colunas_nutrientes=COLUNAS_NUTRIENTES):
+    """Carrega um ou mais CSVs (snapshots) em formato colunar"""
+    import pandas as pd
+
+    if isinstance(caminhos, (str, os.PathLike)):
+        caminhos = [caminhos]
+
+    colunas = ['NOME_PRODUTO', 'URL', 'CATEGORIA'] + list(colunas_nutrientes)
+    frames = [pd.read_csv(caminho, usecols=colunas, encoding='utf-8-sig') for caminho in caminhos]
+    df = frames[0] if len(frames) == 1 else pd.concat(frames, ignore_index=True)
+
+    return DadosColunares(
+        nomes=df['NOME_PRODUTO'].to_numpy(dtype=object),
+        urls=df['URL'].to_numpy(dtype=object),
+        categorias=df['CATEGORIA'].fillna('Categoria não encontrada').to_numpy(dtype=object),
+        matriz=df[list(colunas_nutrientes)].to_numpy(dtype=np.float64, na_value=np.nan),
+        colunas=colunas_nutrientes,
+    )
+
+
+def agregados_por_categoria(dados):
+    """
+    Contagem, média, desvio, mínimo e máximo de cada nutriente por categoria
+
+    Células vazias (NaN) ficam fora das contas do nutriente: 'validos' traz
+    quantos valores entraram em cada estatística, e uma categoria sem nenhum
+    valor do nutriente fica com NaN.
+    """
+    import pandas as pd
+
+    matriz = dados.matriz
+    n_colunas = matriz.shape[1]
+    if len(dados) == 0:
+        vazia = np.zeros((0, n_colunas))
+        return {
+            'categorias': np.zeros(0, dtype=object), 'contagem': np.zeros(0, dtype=np.int64),
+            'validos': vazia, 'media': vazia, 'desvio': vazia, 'min': vazia, 'max': vazia,
+        }
+
+    # factorize usa hash (O(n)) em vez de ordenar as strings como np.unique
+    inverso, categorias = pd.factorize(dados.categorias, sort=True)
+    categorias = np.asarray(categorias, dtype=object)
+    n_categorias = len(categorias)
+    contagem = np.bincount(inverso, minlength=n_categorias)
+
+    # bincount com pesos soma cada coluna por grupo em uma única passada (NaN vira 0 e não é contado)
+    presentes = ~np.isnan(matriz)
+    zerada = np.where(presentes, matriz, 0.0)
+    validos = np.column_stack([
+        np.bincount(inverso, weights=presentes[:, j], minlength=n_categorias) for j in range(n_colunas)
+    ])
+    soma = np.column_stack([
+        np.bincount(inverso, weights=zerada[:, j], minlength=n_categorias) for j in range(n_colunas)
+    ])
+    soma_quadrados = np.column_stack([
+        np.bincount(inverso, weights=zerada[:, j] * zerada[:, j], minlength=n_categorias)
+        for j in range(n_colunas)
+    ])
+
+    com_dados = validos > 0
+    media = np.divide(soma, validos, out=np.full(soma.shape, np.nan), where=com_dados)
+    variancia = np.divide(soma_quadrados, validos, out=np.full(soma.shape, np.nan), where=com_dados)
+    variancia = np.maximum(variancia - media * media, 0.0)
+
+    # Ordena pelas categorias para que cada grupo seja contíguo e use reduceat
+    ordem = np.argsort(inverso, kind='stable')
+    inicios = np.concatenate(([0], np.cumsum(contagem)[:-1]))
+    ordenada = matriz[ordem]
+    presentes = presentes[ordem]
+    minimo = np.minimum.reduceat(np.where(presentes, ordenada, np.inf), inicios, axis=0)
+    maximo = np.maximum.reduceat(np.where(presentes, ordenada, -np.inf), inicios, axis=0)
+    minimo[~com_dados] = np.nan
+    maximo[~com_dados] = np.nan
+
+    return {
+        'categorias': categorias,
+        'contagem': contagem,
+        'validos': validos.astype(np.int64),
+        'media': media,
+        'desvio': np.sqrt(variancia),
+        'min': minimo,
+        'max': maximo,
+    }
+
+
+def percentis(dados, quantis=PERCENTIS):
+    """Percentis de cada nutriente sobre todos os produtos (linhas = percentis)"""
+    if len(dados) == 0:
+        return np.full((len(quantis), dados.matriz.shape[1]), np.nan)
+    return np.nanpercentile(dados.matriz, quantis, axis=0)
+
+
+def razoes_densidade(dados):
+    """Proteína por kcal e sódio por 100 kcal (NaN quando não há calorias)"""
+    calorias = dados.coluna('CALORIAS (kcal)')
+    com_calorias = calorias > 0
+
+    proteina_por_kcal = np.full(calorias.shape, np.nan)
+    sodio_por_100kcal = np.full(calorias.shape, np.nan)
+    np.divide(dados.coluna('PROTEINAS (g)'), calorias, out=proteina_por_kcal, where=com_calorias)
+    np.divide(dados.coluna('SODIO (mg)') * 100.0, calorias, out=sodio_por_100kcal, where=com_calorias)
+
+    return {
+        'PROTEINA_POR_KCAL (g/kcal)': proteina_por_kcal,
+        'SODIO_POR_100KCAL (mg)': sodio_por_100kcal,
+    }
+
+
+def ranking(valores, decrescente=True):
+    """Posição (1 = melhor) de cada valor; NaN fica sempre no fim"""
+    chave = np.where(np.isnan(valores), -np.inf if decrescente else np.inf, valores)
+    ordem = np.argsort(-chave if decrescente else chave, kind='stable')
+    posicoes = np.empty(len(valores), dtype=np.int64)
+    posicoes[ordem] = np.arange(1, len(valores) + 1)
+    return posicoes
+
+
+def analisar(dados):
+    """Executa todas as análises e devolve as tabelas como DataFrames"""
+    import pandas as pd
+
+    tabelas = {}
+
+    agregados = agregados_por_categoria(dados)
+    por_categoria = {'CATEGORIA': agregados['categorias'], 'PRODUTOS': agregados['contagem']}
+    for j, coluna in enumerate(dados.colunas):
+        for estatistica in ('media', 'desvio', 'min', 'max'):
+            por_categoria[f"{coluna} {estatistica}"] = agregados[estatistica][:, j]
+    tabelas['por_categoria'] = pd.DataFrame(por_categoria)
+
+    tabelas['percentis'] = pd.DataFrame(
+        percentis(dados), columns=dados.colunas,
+        index=pd.Index([f"p{q}" for q in PERCENTIS], name='PERCENTIL')
+    ).reset_index()
+
+    razoes = razoes_densidade(dados)
+    proteina = razoes['PROTEINA_POR_KCAL (g/kcal)']
+    sodio = razoes['SODIO_POR_100KCAL (mg)']
+    densidade = pd.DataFrame({
+        'NOME_PRODUTO': dados.nomes,
+        'URL': dados.urls,
+        'CATEGORIA': dados.categorias,
+        **razoes,
+        'RANK_PROTEINA': ranking(proteina, decrescente=True),
+        'RANK_SODIO': ranking(sodio, decrescente=False),
+    })
+    tabelas['densidade'] = densidade.sort_values('RANK_PROTEINA', kind='stable')
+
+    return tabelas
+
+
+def exportar_tabelas(tabelas, pasta=PASTA_ANALISE):
+    """Grava cada tabela como CSV na pasta de análise"""
+    os.makedirs(pasta, exist_ok=True)
+    caminhos = []
+    for nome, tabela in tabelas.items():
+        caminho = os.path.join(pasta, f"{nome}.csv")
+        tabela.to_csv(caminho, index=False, encoding='utf-8-sig')
+        caminhos.append(caminho)
+        print(f"💾 Tabela salva em: {caminho}")
+    return caminhos
+
+
+def dados_sinteticos(n_linhas, n_categorias=12, semente=0):
+    """Gera um conjunto sintético para benchmark"""
+    gerador = np.random.default_rng(semente)
+    categorias = np.array([f"Categoria {i}" for i in range(n_categorias)], dtype=object)
+    matriz = gerador.gamma(2.0, 20.0, size=(n_linhas, len(COLUNAS_NUTRIENTES)))
+    nomes = np.arange(n_linhas).astype(str).astype(object)
+    return DadosColunares(nomes, nomes, categorias[gerador.integers(0, n_categorias, n_linhas)], matriz)
+
+
+def benchmark(n_linhas=1_000_000):
+    """Mede o tempo de cada etapa da análise sobre dados sintéticos"""
+    print(f"⏱️  Benchmark com {n_linhas:,} linhas".replace(',', '.'))
+    dados = dados_sinteticos(n_linhas)
+    import pandas  # noqa: F401 - importa antes de medir para não contar o tempo de import
+
+    etapas = [
+        ('agregados_por_categoria', lambda: agregados_por_categoria(dados)),
+        ('percentis', lambda: percentis(dados)),
+        ('razoes_densidade', lambda: razoes_densidade(dados)),
+        ('ranking', lambda: ranking(dados.coluna('PROTEINAS (g)'))),
+    ]
+    tempos = {}
+    for nome, funcao in etapas:
+        inicio = time.perf_counter()
+        funcao()
+        tempos[nome] = time.perf_counter() - inicio
+        print(f"   • {nome}: {tempos[nome] * 1000:.1f} ms")
+    return tempos
+
+
+def main():
+    """Função principal"""
+    print("📈 Análise Nutricional - Sadia")
+    print("=" * 30)
+
+    if not os.path.exists(ARQUIVO_DADOS):
+        print(f"❌ Arquivo de dados não encontrado: {ARQUIVO_DADOS}")
+        return
+
+    dados = carregar_colunas()
+    print(f"📊 {len(dados)} produtos carregados")
+    exportar_tabelas(analisar(dados))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+"""
+Benchmark HTTP/1.1 (pool de conexões) x HTTP/2 (multiplexado) num servidor local
+O servidor responde em HTTP/1.1 com keep-alive ou em HTTP/2 sem TLS (h2c),
+com a mesma latência e o mesmo tamanho de página nos dois protocolos
+"""
+
+import asyncio
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# Permite rodar tanto como script (python config/x.py) quanto como módulo (config.x)
+if not __package__:
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.rede import ClienteHTTP, ClienteHTTP2
+
+PREFACIO_H2 = b'PRI * HTTP/2.0\r\n\r\nSM\r\n\r\n'
+
+
+class ServidorLocal:
+    """Servidor asyncio numa thread; detecta o protocolo pelo prefácio da conexão"""
+
+    def __init__(self, latencia=0.05, tamanho_pagina=60_000):
+        self.latencia = latencia
+        self.corpo = (b'<html><body>' + b'x' * tamanho_pagina + b'</body></html>')
+        self.conexoes = {'http1': 0, 'http2': 0}
+        self.porta = None
+        self._loop = None
+        self._servidor = None
+        self._thread = None
+        # Conexões em atendimento (tarefa -> writer), fechadas no encerramento
+        self._abertas = {}
+        self._pronto = threading.Event()
+
+    def iniciar(self):
+        """Sobe o servidor numa porta livre; retorna a porta"""
+        self._thread = threading.Thread(target=self._executar, daemon=True)
+        self._thread.start()
+        self._pronto.wait()
+        return self.porta
+
+    def _executar(self):
+        self._loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self._loop)
+        self._servidor = self._loop.run_until_complete(
+            asyncio.start_server(self._conexao, '127.0.0.1', 0)
+        )
+        self.porta = self._servidor.sockets[0].getsockname()[1]
+        self._pronto.set()
+        try:
+            self._loop.run_forever()
+        finally:
+            self._loop.close()
+
+    async def _encerrar(self):
+        # Para de aceitar conexões e fecha as que seguem abertas (keep-alive): cada uma termina pelo EOF
+        self._servidor.close()
+        for writer in list(self._abertas.values()):
+            writer.close()
+        await asyncio.gather(*self._abertas, return_exceptions=True)
+        await self._servidor.wait_closed()
+
+    def parar(self):
+        """Encerra o servidor, fecha as conexões abertas e espera a thread do loop"""
+        if not self._loop or self._loop.is_closed():
+            return
+        asyncio.run_coroutine_threadsafe(self._encerrar(), self._loop).result(timeout=10)
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+
+    async def _conexao(self, reader, writer):
+        tarefa = asyncio.current_task()
+        self._abertas[tarefa] = writer
+        try:
+            inicio = await reader.readexactly(len(PREFACIO_H2))
+        except asyncio.IncompleteReadError:
+            del self._abertas[tarefa]
+            writer.close()
+            return
+        try:
+            if inicio == PREFACIO_H2:
+                self.conexoes['http2'] += 1
+                await self._http2(reader, writer, inicio)
+            else:
+                self.conexoes['http1'] += 1
+                await self._http1(reader, writer, inicio)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            del self._abertas[tarefa]
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    async def _http1(self, reader, writer, inicio):
+        # Uma requisição por vez em cada conexão (keep-alive, sem pipelining)
+        buffer = inicio
+        while True:
+            while b'\r\n\r\n' not in buffer:
+                dados = await reader.read(65536)
+                if not dados:
+                    return
+                buffer += dados
+            _, buffer = buffer.split(b'\r\n\r\n', 1)
+            await asyncio.sleep(self.latencia)
+            writer.write(
+                b'HTTP/1.1 200 OK\r\nContent-Type: text/html; charset=utf-8\r\n'
+                b'Content-Length: ' + str(len(self.corpo)).encode() + b'\r\n\r\n' + self.corpo
+            )
+            await writer.drain()
+
+    async def _http2(self, reader, writer, inicio):
+        import h2.config
+        import h2.connection
+        import h2.events
+
+        conexao = h2.connection.H2Connection(config=h2.config.H2Configuration(client_side=False))
+        conexao.initiate_connection()
+        janela = asyncio.Event()
+
+        async def responder(stream_id):
+            await asyncio.sleep(self.latencia)
+            conexao.send_headers(stream_id, [
+                (':status', '200'), ('content-type', 'text/html; charset=utf-8'),
+                ('content-length', str(len(self.corpo))),
+            ])
+            enviado = 0
+            while enviado < len(self.corpo):
+                # Respeita o controle de fluxo do stream e da conexão
+                tamanho = min(conexao.local_flow_control_window(stream_id), conexao.max_outbound_frame_size,
+                              len(self.corpo) - enviado)
+                if tamanho <= 0:
+                    janela.clear()
+                    await janela.wait()
+                    continue
+                conexao.send_data(stream_id, self.corpo[enviado:enviado + tamanho])
+                enviado += tamanho
+                writer.write(conexao.data_to_send())
+                await writer.drain()
+            conexao.end_stream(stream_id)
+            writer.write(conexao.data_to_send())
+            await writer.drain()
+
+        tarefas = set()
+        dados = inicio
+        try:
+            while dados:
+                for evento in conexao.receive_data(dados):
+                    if isinstance(evento, h2.events.RequestReceived):
+                        tarefa = asyncio.create_task(responder(evento.stream_id))
+                        tarefas.add(tarefa)
+                        tarefa.add_done_callback(tarefas.discard)
+                    elif isinstance(evento, h2.events.WindowUpdated):
+                        janela.set()
+                    elif isinstance(evento, h2.events.ConnectionTerminated):
+                        return
+                writer.write(conexao.data_to_send())
+                await writer.drain()
+                dados = await reader.read(65536)
+        finally:
+            # Conexão fechada: as respostas ainda em andamento não têm para onde ir
+            for tarefa in tarefas:
+                tarefa.cancel()
+            await asyncio.gather(*tarefas, return_exceptions=True)
+
+
+def medir(cliente, urls, concorrencia):
+    """Dispara as URLs com `concorrencia` threads; devolve tempo total e latências"""
+    latencias = []
+
+    def buscar(url):
+        inicio = time.perf_counter()
+        cliente.obter(url)
+        latencias.append(time.perf_counter() - inicio)
+
+    inicio = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concorrencia) as executor:
+        list(executor.map(buscar, urls))
+    return time.perf_counter() - inicio, sorted(latencias)
+
+
+def benchmark(requisicoes=500, concorrencia=32, latencia=0.05, tamanho_pagina=60_000, conexoes_http2=1):
+    """Compara HTTP/1.1 com pool de `concorrencia` conexões e HTTP/2 em `conexoes_http2` conexões"""
+    servidor = ServidorLocal(latencia=latencia, tamanho_pagina=tamanho_pagina)
+    porta = servidor.iniciar()
+    urls = [f'http://127.0.0.1:{porta}/produtos/teste/produto-{i}/' for i in range(requisicoes)]
+    print(f"🧪 {requisicoes} requisições, {concorrencia} em paralelo, "
+          f"latência do servidor {latencia * 1000:.0f} ms, página de {tamanho_pagina / 1024:.0f} KB")
+
+    clientes = {
+        'HTTP/1.1': ClienteHTTP(tamanho_pool=concorrencia),
+        'HTTP/2': ClienteHTTP2(conexoes=conexoes_http2, max_streams=concorrencia, somente_http2=True),
+    }
+    resultados = {}
+    try:
+        for nome, cliente in clientes.items():
+            medir(cliente, urls[:concorrencia], concorrencia)  # aquece as conexões
+            duracao, latencias = medir(cliente, urls, concorrencia)
+            resultados[nome] = {
+                'segundos': duracao,
+                'req_s': requisicoes / duracao,
+                'p50_ms': latencias[len(latencias) // 2] * 1000,
+                'p95_ms': latencias[max(0, int(len(latencias) * 0.95) - 1)] * 1000,
+                'conexoes': servidor.conexoes['http2' if isinstance(cliente, ClienteHTTP2) else 'http1'],
+            }
+            cliente.fechar()
+    finally:
+        servidor.parar()
+
+    for nome, r in resultados.items():
+        print(f"   {nome:8s} {r['segundos']:6.2f} s  {r['req_s']:7.1f} req/s  "
+              f"p50 {r['p50_ms']:6.1f} ms  p95 {r['p95_ms']:6.1f} ms  conexões TCP: {r['conexoes']}")
+    return resultados
+
+
+if __name__ == "__main__":
+    benchmark()
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Canonicalização de URLs de produtos
+Normaliza esquema/host/barra final/query e guarda as URLs canônicas aprendidas
+das próprias páginas (og:url e rel=canonical) em dados/urls_canonicas.json
+"""
+
+import json
+import os
+import threading
+from urllib.parse import parse_qsl, urlencode, urljoin, urlsplit, urlunsplit
+
+ARQUIVO_CANONICAS = os.path.join('dados', 'urls_canonicas.json')
+
+# Hosts equivalentes ao host canônico do site (padrão quando nenhum mapa é passado;
+# os perfis de site trazem o próprio mapa em PlanosSites.hosts_equivalentes)
+HOSTS_EQUIVALENTES = {
+    'sadia.com.br': 'www.sadia.com.br',
+}
+
+# Parâmetros de rastreamento que não mudam o conteúdo da página
+PARAMETROS_IGNORADOS = ('utm_', 'gclid', 'fbclid', 'mc_', '_ga')
+
+
+def canonicalizar_url(url, base=None, hosts_equivalentes=None):
+    """
+    Normaliza uma URL: https, host em minúsculas, sem fragmento, query ordenada e barra final
+
+    `hosts_equivalentes` mapeia hosts alternativos para o host canônico
+    (HOSTS_EQUIVALENTES quando omitido).
+    """
+    if hosts_equivalentes is None:
+        hosts_equivalentes = HOSTS_EQUIVALENTES
+    if base:
+        url = urljoin(base, url)
+
+    partes = urlsplit(url.strip())
+    host = (partes.hostname or '').lower()
+    host = hosts_equivalentes.get(host, host)
+    if partes.port and partes.port not in (80, 443):
+        host = f"{host}:{partes.port}"
+
+    caminho = partes.path or '/'
+    while '//' in caminho:
+        caminho = caminho.replace('//', '/')
+    if not caminho.endswith('/'):
+        caminho += '/'
+
+    parametros = sorted(
+        (chave, valor) for chave, valor in parse_qsl(partes.query, keep_blank_values=True)
+        if not chave.lower().startswith(PARAMETROS_IGNORADOS)
+    )
+
+    return urlunsplit(('https', host, caminho, urlencode(parametros), ''))
+
+
+def url_canonica_da_pagina(soup):
+    """Lê a URL canônica declarada pela página (rel=canonical ou og:url)"""
+    link = soup.find('link', rel='canonical')
+    if link and link.get('href'):
+        return link['href']
+    meta = soup.find('meta', property='og:url')
+    if meta and meta.get('content'):
+        return meta['content']
+    return None
+
+
+class MapaCanonico:
+    """URLs normalizadas -> URL canônica aprendida, persistido entre execuções"""
+
+    def __init__(self, caminho=ARQUIVO_CANONICAS, hosts_equivalentes=None):
+        self.caminho = caminho
+        self.hosts_equivalentes = hosts_equivalentes
+        self.mapa = {}
+        self.alterado = False
+        self._trava = threading.Lock()
+
+    @classmethod
+    def carregar(cls, caminho=ARQUIVO_CANONICAS, hosts_equivalentes=None):
+        """Carrega o mapa salvo (ou um mapa vazio)"""
+        mapa = cls(caminho, hosts_equivalentes)
+        if os.path.exists(caminho):
+            try:
+                with open(caminho, 'r', encoding='utf-8') as f:
+                    mapa.mapa = json.load(f)
+            except (OSError, ValueError) as e:
+                print(f"⚠️ Mapa de URLs canônicas inválido, recriando: {e}")
+        return mapa
+
+    def resolver(self, url, base=None):
+        """URL canônica conhecida para a URL (ou apenas a forma normalizada)"""
+        normalizada = canonicalizar_url(url, base, self.hosts_equivalentes)
+        return self.mapa.get(normalizada, normalizada)
+
+    def aprender(self, url, url_canonica):
+        """Registra a URL canônica declarada pela página; retorna a forma final"""
+        normalizada = canonicalizar_url(url, hosts_equivalentes=self.hosts_equivalentes)
+        if not url_canonica:
+            return self.mapa.get(normalizada, normalizada)
+
+        canonica = canonicalizar_url(url_canonica, base=normalizada, hosts_equivalentes=self.hosts_equivalentes)
+        with self._trava:
+            if normalizada != canonica and self.mapa.get(normalizada) != canonica:
+                self.mapa[normalizada] = canonica
+                self.alterado = True
+        return canonica
+
+    def salvar(self):
+        """Grava o mapa de forma atômica (apenas se houve mudança)"""
+        if not self.alterado:
+            return None
+        os.makedirs(os.path.dirname(self.caminho) or '.', exist_ok=True)
+        temporario = self.caminho + '.tmp'
+        with open(temporario, 'w', encoding='utf-8') as f:
+            json.dump(self.mapa, f, indent=2, ensure_ascii=False, sort_keys=True)
+        os.replace(temporario, self.caminho)
+        self.alterado = False
+        return self.caminho
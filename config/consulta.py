@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+"""
+API local de consulta (somente leitura) sobre o dataset de produtos
+O CSV é carregado uma vez em índices em memória (hash por URL, invertidos por
+categoria e por palavra do nome, arrays ordenados por nutriente) e recarregado
+de forma atômica quando o scraper grava uma nova versão
+"""
+
+import csv
+import json
+import os
+import re
+import sys
+import threading
+import time
+import unicodedata
+from collections import defaultdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import numpy as np
+
+# Permite rodar tanto como script (python config/x.py) quanto como módulo (config.x)
+if not __package__:
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.canonico import canonicalizar_url
+from config.registro import ATRIBUTOS, COLUNAS, COLUNAS_NUMERICAS
+from config.similaridade import hash_arquivo
+
+ARQUIVO_DADOS = os.path.join('dados', 'produtos_sadia.csv')
+HOST_CONSULTA = '127.0.0.1'
+PORTA_CONSULTA = 8766
+LIMITE_PADRAO = 50
+
+# Nome curto de cada coluna numérica (ex.: sodio -> 'SODIO (mg)')
+APELIDOS = {ATRIBUTOS[coluna]: coluna for coluna in COLUNAS_NUMERICAS}
+
+PADRAO_FILTRO = re.compile(r'^\s*(.+?)\s*(<=|>=|<|>|=)\s*(-?\d+(?:[.,]\d+)?)\s*$')
+
+
+def dobrar(texto):
+    """Minúsculas e sem acentos (para comparar nomes e categorias)"""
+    decomposto = unicodedata.normalize('NFKD', texto or '')
+    return ''.join(c for c in decomposto if not unicodedata.combining(c)).lower()
+
+
+def palavras(texto):
+    """Palavras do texto já dobradas"""
+    return re.findall(r'\w+', dobrar(texto))
+
+
+def interpretar_filtro(expressao):
+    """'SODIO (mg)<400' ou 'sodio<400' -> ('SODIO (mg)', '<', 400.0)"""
+    encontrado = PADRAO_FILTRO.match(expressao)
+    if not encontrado:
+        raise ValueError(f"Filtro inválido: {expressao!r} (use, por exemplo, 'sodio<400')")
+    nome, operador, valor = encontrado.groups()
+    chave = dobrar(nome)
+    coluna = APELIDOS.get(chave.replace(' ', '_')) or next(
+        (coluna for coluna in COLUNAS_NUMERICAS if dobrar(coluna) == chave), None
+    )
+    if coluna is None:
+        raise ValueError(f"Coluna desconhecida no filtro: {nome!r}")
+    return coluna, operador, float(valor.replace(',', '.'))
+
+
+class IndiceProdutos:
+    """Uma versão imutável do dataset com os índices de consulta"""
+
+    def __init__(self, registros, versao=None):
+        self.registros = registros
+        self.versao = versao
+        self.carregado_em = time.strftime('%Y-%m-%dT%H:%M:%S')
+
+        self.por_url = {}
+        self.por_categoria = defaultdict(list)
+        self.por_palavra = defaultdict(set)
+        for i, registro in enumerate(registros):
+            self.por_url[registro['URL']] = i
+            self.por_categoria[dobrar(registro['CATEGORIA'])].append(i)
+            for palavra in palavras(registro['NOME_PRODUTO']):
+                self.por_palavra[palavra].add(i)
+
+        # Por nutriente: valores em ordem crescente e a posição do registro de cada um
+        self.ordenados = {}
+        for coluna in COLUNAS_NUMERICAS:
+            valores = np.fromiter((registro[coluna] for registro in registros), dtype=np.float64,
+                                  count=len(registros))
+            ordem = np.argsort(valores, kind='stable')
+            self.ordenados[coluna] = (valores[ordem], ordem.astype(np.int32))
+
+    @classmethod
+    def construir(cls, caminho=ARQUIVO_DADOS):
+        """Lê o CSV do scraper e monta os índices"""
+        versao = hash_arquivo(caminho)
+        registros = []
+        with open(caminho, 'r', encoding='utf-8-sig', newline='') as f:
+            for linha in csv.DictReader(f):
+                registro = {coluna: linha.get(coluna) or '' for coluna in COLUNAS}
+                for coluna in COLUNAS_NUMERICAS:
+                    try:
+                        registro[coluna] = float(registro[coluna] or 0)
+                    except ValueError:
+                        registro[coluna] = 0.0
+                registros.append(registro)
+        return cls(registros, versao)
+
+    def __len__(self):
+        return len(self.registros)
+
+    def produto(self, url):
+        """Registro da URL (aceita a URL em qualquer forma canônica equivalente)"""
+        posicao = self.por_url.get(url)
+        if posicao is None:
+            posicao = self.por_url.get(canonicalizar_url(url))
+        return None if posicao is None else self.registros[posicao]
+
+    def intervalo(self, coluna, operador, valor):
+        """Posições que satisfazem `coluna operador valor` (busca binária no array ordenado)"""
+        valores, posicoes = self.ordenados[coluna]
+        inicio, fim = 0, len(valores)
+        if operador == '<':
+            fim = np.searchsorted(valores, valor, 'left')
+        elif operador == '<=':
+            fim = np.searchsorted(valores, valor, 'right')
+        elif operador == '>':
+            inicio = np.searchsorted(valores, valor, 'right')
+        elif operador == '>=':
+            inicio = np.searchsorted(valores, valor, 'left')
+        else:
+            inicio = np.searchsorted(valores, valor, 'left')
+            fim = np.searchsorted(valores, valor, 'right')
+        return posicoes[inicio:fim]
+
+    def buscar(self, categoria=None, termo=None, filtros=(), limite=LIMITE_PADRAO):
+        """Produtos da categoria, com todas as palavras do termo e dentro dos filtros; (total, registros)"""
+        candidatos = []
+        if categoria:
+            candidatos.append(self.por_categoria.get(dobrar(categoria), ()))
+        for palavra in palavras(termo or ''):
+            candidatos.append(self.por_palavra.get(palavra, ()))
+        for filtro in filtros:
+            candidatos.append(self.intervalo(*filtro))
+
+        if not candidatos:
+            posicoes = range(len(self.registros))
+        else:
+            # Começa pelo conjunto menor para as interseções saírem baratas
+            candidatos.sort(key=len)
+            selecionadas = set(candidatos[0].tolist() if isinstance(candidatos[0], np.ndarray) else candidatos[0])
+            for outro in candidatos[1:]:
+                if not selecionadas:
+                    break
+                selecionadas.intersection_update(outro.tolist() if isinstance(outro, np.ndarray) else outro)
+            posicoes = sorted(selecionadas)
+
+        total = len(posicoes)
+        return total, [self.registros[i] for i in posicoes[:limite]]
+
+    def categorias(self):
+        """Quantidade de produtos por categoria (nome como aparece no dataset)"""
+        contagem = defaultdict(int)
+        for registro in self.registros:
+            contagem[registro['CATEGORIA']] += 1
+        return dict(sorted(contagem.items()))
+
+
+class ServidorConsulta:
+    """Servidor HTTP local; troca o índice inteiro quando o CSV muda"""
+
+    def __init__(self, caminho=ARQUIVO_DADOS, intervalo_recarga=2.0):
+        self.caminho = caminho
+        self.intervalo_recarga = intervalo_recarga
+        self.indice = IndiceProdutos.construir(caminho)
+        self.recargas = 0
+        self._assinatura = self._assinatura_arquivo()
+        self._parar = threading.Event()
+        self._servidor = None
+
+    def _assinatura_arquivo(self):
+        try:
+            estado = os.stat(self.caminho)
+        except OSError:
+            return None
+        return estado.st_mtime_ns, estado.st_size
+
+    def recarregar_se_mudou(self):
+        """Reconstrói o índice se o arquivo mudou; as consultas em andamento seguem na versão antiga"""
+        assinatura = self._assinatura_arquivo()
+        if assinatura is None or assinatura == self._assinatura:
+            return False
+        self._assinatura = assinatura
+        try:
+            novo = IndiceProdutos.construir(self.caminho)
+        except (OSError, ValueError, csv.Error) as e:
+            print(f"⚠️ Não foi possível recarregar {self.caminho}: {e}")
+            return False
+        if novo.versao == self.indice.versao:
+            return False
+
+        # Uma única atribuição: cada consulta vê a versão antiga ou a nova, nunca uma mistura
+        self.indice = novo
+        self.recargas += 1
+        print(f"🔄 Dataset recarregado: {len(novo)} produtos (versão {novo.versao[:12]})")
+        return True
+
+    def _vigiar(self):
+        while not self._parar.wait(self.intervalo_recarga):
+            self.recarregar_se_mudou()
+
+    def responder(self, caminho, parametros):
+        """(status, corpo) de uma requisição GET"""
+        indice = self.indice
+        inicio = time.perf_counter()
+
+        if caminho == '/produto':
+            url = parametros.get('url', [''])[0]
+            registro = indice.produto(url) if url else None
+            if registro is None:
+                return 404, {'erro': 'produto não encontrado', 'url': url}
+            corpo = {'produto': registro}
+
+        elif caminho == '/produtos':
+            try:
+                filtros = [interpretar_filtro(filtro) for filtro in parametros.get('filtro', [])]
+                limite = int(parametros.get('limite', [LIMITE_PADRAO])[0])
+            except ValueError as e:
+                return 400, {'erro': str(e)}
+            total, registros = indice.buscar(
+                categoria=parametros.get('categoria', [None])[0],
+                termo=parametros.get('q', [None])[0],
+                filtros=filtros, limite=max(0, limite),
+            )
+            corpo = {'total': total, 'produtos': registros}
+
+        elif caminho == '/categorias':
+            corpo = {'categorias': indice.categorias()}
+
+        elif caminho in ('/', '/status'):
+            corpo = {'produtos': len(indice), 'carregado_em': indice.carregado_em, 'recargas': self.recargas}
+
+        else:
+            return 404, {'erro': f'rota desconhecida: {caminho}'}
+
+        corpo['versao'] = indice.versao
+        corpo['tempo_ms'] = round((time.perf_counter() - inicio) * 1000, 3)
+        return 200, corpo
+
+    def iniciar(self, host=HOST_CONSULTA, porta=PORTA_CONSULTA):
+        """Sobe o servidor e a recarga automática em threads separadas; retorna a porta"""
+        servidor = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                partes = urlsplit(self.path)
+                status, corpo = servidor.responder(partes.path.rstrip('/') or '/', parse_qs(partes.query))
+                dados = json.dumps(corpo, ensure_ascii=False).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json; charset=utf-8')
+                self.send_header('Content-Length', str(len(dados)))
+                self.end_headers()
+                self.wfile.write(dados)
+
+            def log_message(self, formato, *args):
+                pass
+
+        self._servidor = ThreadingHTTPServer((host, porta), Handler)
+        self._servidor.daemon_threads = True
+        threading.Thread(target=self._servidor.serve_forever, daemon=True).start()
+        if self.intervalo_recarga:
+            threading.Thread(target=self._vigiar, daemon=True).start()
+        host, porta = self._servidor.server_address[:2]
+        print(f"🔎 API de consulta em http://{host}:{porta}/ ({len(self.indice)} produtos)")
+        return porta
+
+    def parar(self):
+        """Desliga o servidor e a recarga automática"""
+        self._parar.set()
+        if self._servidor:
+            self._servidor.shutdown()
+            self._servidor.server_close()
+            self._servidor = None
+
+    def aguardar(self):
+        """Bloqueia até parar() ser chamado"""
+        self._parar.wait()
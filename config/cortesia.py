@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+Cortesia com o site: robots.txt e Crawl-delay
+Busca e guarda o robots.txt de cada host (com validade), remove as URLs
+proibidas antes de entrarem na fila e transforma o Crawl-delay / Request-rate
+num ritmo global de requisições no cliente HTTP
+"""
+
+import json
+import os
+import threading
+import time
+from urllib.parse import urlsplit, urlunsplit
+from urllib.robotparser import RobotFileParser
+
+ARQUIVO_ROBOTS = os.path.join('dados', 'robots.json')
+
+# O robots.txt é revalidado depois deste tempo (RFC 9309 recomenda no máximo 24 h)
+VALIDADE_ROBOTS = 24 * 3600
+
+# robots.txt inacessível (erro de rede ou 5xx) sem cópia guardada: tudo proibido até a próxima tentativa
+NOVA_TENTATIVA_ROBOTS = 10 * 60
+PROIBE_TUDO = 'User-agent: *\nDisallow: /\n'
+
+# Grupo de regras seguido (as regras para todos os robôs)
+AGENTE_ROBOTS = '*'
+
+
+def crawl_delay(conteudo, agente=AGENTE_ROBOTS):
+    """
+    Crawl-delay do grupo do agente (ou do grupo '*'), aceitando frações de segundo
+
+    O urllib.robotparser só reconhece valores inteiros.
+    """
+    atrasos = {}
+    agentes, lendo_agentes = [], False
+    for linha in conteudo.splitlines():
+        linha = linha.split('#', 1)[0].strip()
+        if ':' not in linha:
+            continue
+        campo, valor = (parte.strip() for parte in linha.split(':', 1))
+        campo = campo.lower()
+        if campo == 'user-agent':
+            agentes = agentes + [valor.lower()] if lendo_agentes else [valor.lower()]
+            lendo_agentes = True
+            continue
+        lendo_agentes = False
+        if campo == 'crawl-delay':
+            try:
+                segundos = float(valor)
+            except ValueError:
+                continue
+            for nome in agentes:
+                atrasos.setdefault(nome, segundos)
+    return atrasos.get(agente.lower(), atrasos.get('*'))
+
+
+class Ritmo:
+    """Espaça o início das requisições de todas as threads em `intervalo` segundos"""
+
+    def __init__(self, intervalo):
+        self.intervalo = intervalo
+        self._proximo = 0.0
+        self._trava = threading.Lock()
+
+    def aguardar(self):
+        """Bloqueia até a vez desta requisição"""
+        with self._trava:
+            agora = time.monotonic()
+            inicio = max(agora, self._proximo)
+            self._proximo = inicio + self.intervalo
+        if inicio > agora:
+            time.sleep(inicio - agora)
+
+    def tentar(self):
+        """Reserva a vez se ela já chegou, sem bloquear; retorna False se seria preciso esperar"""
+        with self._trava:
+            agora = time.monotonic()
+            if agora < self._proximo:
+                return False
+            self._proximo = agora + self.intervalo
+            return True
+
+
+class PoliticaRobots:
+    """robots.txt por host, em memória e em dados/robots.json, revalidado após `validade` segundos"""
+
+    def __init__(self, cliente, agente=AGENTE_ROBOTS, validade=VALIDADE_ROBOTS, caminho=ARQUIVO_ROBOTS):
+        self.cliente = cliente
+        self.agente = agente
+        self.validade = validade
+        self.caminho = caminho
+        self.cache = {}
+        self.regras = {}
+        self._trava = threading.Lock()
+        self._travas_host = {}
+        self._trava_arquivo = threading.Lock()
+
+        if os.path.exists(caminho):
+            try:
+                with open(caminho, 'r', encoding='utf-8') as f:
+                    self.cache = json.load(f)
+            except (OSError, ValueError) as e:
+                print(f"⚠️ Cache do robots.txt inválido, recriando: {e}")
+
+    def _baixar(self, host, esquema, anterior):
+        """
+        Busca o robots.txt; 4xx vale como 'sem restrições', falhas mantêm a cópia anterior
+
+        Sem cópia anterior, um robots.txt inacessível proíbe tudo (RFC 9309) e é
+        tentado de novo depois de NOVA_TENTATIVA_ROBOTS segundos.
+        """
+        url = urlunsplit((esquema, host, '/robots.txt', '', ''))
+        try:
+            return {'obtido_em': time.time(), 'status': 200, 'conteudo': self.cliente.obter(url)}
+        except Exception as e:
+            status = getattr(getattr(e, 'response', None), 'status_code', None)
+            if status and 400 <= status < 500:
+                return {'obtido_em': time.time(), 'status': status, 'conteudo': ''}
+            if anterior and anterior['status'] is not None:
+                print(f"⚠️ robots.txt de {host} indisponível ({e}); usando a cópia de {time.ctime(anterior['obtido_em'])}")
+                return {**anterior, 'obtido_em': time.time(), 'validade': NOVA_TENTATIVA_ROBOTS}
+            print(f"⚠️ robots.txt de {host} indisponível ({e}); nenhuma página será buscada "
+                  f"(nova tentativa em {NOVA_TENTATIVA_ROBOTS // 60} min)")
+            return {'obtido_em': time.time(), 'status': None, 'conteudo': PROIBE_TUDO,
+                    'validade': NOVA_TENTATIVA_ROBOTS}
+
+    def _vencida(self, entrada):
+        # Entradas de falha trazem a própria validade (curta), as demais usam a do robots.txt
+        return time.time() - entrada['obtido_em'] >= entrada.get('validade', self.validade)
+
+    def _em_memoria(self, host):
+        # Regras prontas e dentro da validade (chamar com self._trava)
+        entrada = self.cache.get(host)
+        if host in self.regras and entrada and not self._vencida(entrada):
+            return self.regras[host]
+        return None
+
+    def _regras(self, url):
+        partes = urlsplit(url)
+        host = partes.netloc
+        with self._trava:
+            regras = self._em_memoria(host)
+            if regras:
+                return regras
+            trava_host = self._travas_host.setdefault(host, threading.Lock())
+
+        # Só as threads do mesmo host esperam pelo download; a trava global
+        # protege apenas os dicionários
+        with trava_host:
+            with self._trava:
+                regras = self._em_memoria(host)
+                if regras:
+                    return regras
+                entrada = self.cache.get(host)
+
+            if not entrada or self._vencida(entrada):
+                entrada = self._baixar(host, partes.scheme or 'https', entrada)
+                with self._trava:
+                    self.cache[host] = entrada
+                self._salvar()
+
+            regras = RobotFileParser()
+            regras.parse(entrada['conteudo'].splitlines())
+            with self._trava:
+                self.regras[host] = regras
+            return regras
+
+    def _salvar(self):
+        # A cópia é tirada já com a trava do arquivo, então a última gravação traz o estado mais novo
+        with self._trava_arquivo:
+            with self._trava:
+                cache = dict(self.cache)
+            os.makedirs(os.path.dirname(self.caminho) or '.', exist_ok=True)
+            temporario = self.caminho + '.tmp'
+            with open(temporario, 'w', encoding='utf-8') as f:
+                json.dump(cache, f, indent=2, ensure_ascii=False)
+            os.replace(temporario, self.caminho)
+
+    def permitido(self, url):
+        """Indica se o robots.txt permite buscar a URL"""
+        return self._regras(url).can_fetch(self.agente, url)
+
+    def filtrar(self, urls):
+        """Mantém só as URLs permitidas (na mesma ordem)"""
+        permitidas = [url for url in urls if self.permitido(url)]
+        if len(permitidas) < len(urls):
+            print(f"🤖 {len(urls) - len(permitidas)} URLs bloqueadas pelo robots.txt")
+        return permitidas
+
+    def intervalo_minimo(self, url):
+        """Segundos entre requisições exigidos pelo site (Crawl-delay ou Request-rate), ou None"""
+        regras = self._regras(url)
+        intervalos = []
+        with self._trava:
+            conteudo = self.cache[urlsplit(url).netloc]['conteudo']
+        atraso = crawl_delay(conteudo, self.agente)
+        if atraso:
+            intervalos.append(atraso)
+        taxa = regras.request_rate(self.agente)
+        if taxa and taxa.requests:
+            intervalos.append(taxa.seconds / taxa.requests)
+        return max(intervalos) if intervalos else None
+
+    def aplicar(self, url):
+        """
+        Configura o ritmo global do cliente para o host da URL
+
+        Retorna o intervalo aplicado (None se o site não define um).
+        """
+        intervalo = self.intervalo_minimo(url)
+        host = urlsplit(url).netloc
+        if intervalo:
+            atual = self.cliente.ritmos.get(host)
+            if not atual or atual.intervalo != intervalo:
+                self.cliente.ritmos[host] = Ritmo(intervalo)
+                print(f"🤖 Crawl-delay do robots.txt: uma requisição a cada {intervalo:g} s em {host}")
+        else:
+            self.cliente.ritmos.pop(host, None)
+        return intervalo
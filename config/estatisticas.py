@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Resumo pré-calculado dos dados coletados (dados/resumo_dados.json)
+Mantido pelos gravadores para que a tela de estatísticas não releia os arquivos
+"""
+
+import json
+import os
+from collections import Counter
+from datetime import datetime
+
+ARQUIVO_RESUMO = os.path.join('dados', 'resumo_dados.json')
+
+# Colunas numéricas acompanhadas no resumo
+NUTRIENTES = [
+    'PORCAO (g)', 'CALORIAS (kcal)', 'CARBOIDRATOS (g)', 'PROTEINAS (g)',
+    'GORDURAS_TOTAIS (g)', 'GORDURAS_SATURADAS (g)',
+    'FIBRAS (g)', 'ACUCARES (g)', 'SODIO (mg)'
+]
+
+
+class ResumoDados:
+    """
+    Contagens e min/média/max por nutriente das linhas gravadas
+
+    A saída é regravada por inteiro a cada execução, então a seção de
+    produtos é refeita a partir das colunas em memória (registrar_colunas):
+    min e max não podem ser desfeitos só com as linhas que mudaram.
+    """
+
+    def __init__(self, caminho=ARQUIVO_RESUMO):
+        self.caminho = caminho
+        self.urls = {'total': 0, 'por_categoria': {}}
+        self.produtos = {}
+        self.arquivos = {}
+        self.tamanho_pasta = None
+        self.atualizado_em = None
+        self._reiniciar_produtos()
+
+    @classmethod
+    def carregar(cls, caminho=ARQUIVO_RESUMO):
+        """Carrega o resumo salvo (ou um resumo vazio se não existir)"""
+        resumo = cls(caminho)
+        if not os.path.exists(caminho):
+            return resumo
+        try:
+            with open(caminho, 'r', encoding='utf-8') as f:
+                conteudo = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"⚠️ Resumo inválido, recriando: {e}")
+            return resumo
+
+        resumo.urls = conteudo.get('urls', resumo.urls)
+        resumo.arquivos = conteudo.get('arquivos', {})
+        resumo.tamanho_pasta = conteudo.get('tamanho_pasta')
+        resumo.atualizado_em = conteudo.get('atualizado_em')
+        produtos = conteudo.get('produtos')
+        if produtos:
+            resumo.produtos = {
+                'total': produtos.get('total', 0),
+                'por_categoria': produtos.get('por_categoria', {}),
+                'nutrientes': {
+                    nome: {'min': v['min'], 'max': v['max'], 'soma': v['soma']}
+                    for nome, v in produtos.get('nutrientes', {}).items()
+                },
+                'gerado_em': produtos.get('gerado_em'),
+            }
+        return resumo
+
+    def existe(self):
+        """Indica se já há um resumo gravado em disco"""
+        return os.path.exists(self.caminho)
+
+    def _reiniciar_produtos(self):
+        self.produtos = {'total': 0, 'por_categoria': {}, 'nutrientes': {}, 'gerado_em': None}
+
+    def registrar_urls(self, urls, caminho_arquivo):
+        """Atualiza a seção de URLs a partir do conjunto gravado"""
+        por_categoria = {}
+        for url in urls:
+            if '/produtos/' in url:
+                categoria = url.split('/produtos/')[1].split('/')[0]
+                por_categoria[categoria] = por_categoria.get(categoria, 0) + 1
+        self.urls = {'total': len(urls), 'por_categoria': por_categoria}
+        self.registrar_arquivo(caminho_arquivo)
+
+    def registrar_colunas(self, colunas):
+        """Refaz a seção de produtos a partir dos buffers colunares (uma passada em C por coluna)"""
+        self._reiniciar_produtos()
+        categorias = colunas['CATEGORIA']
+        self.produtos['total'] = len(categorias)
+        self.produtos['por_categoria'] = dict(Counter(
+            categoria or 'Categoria não encontrada' for categoria in categorias
+        ))
+        for nome in NUTRIENTES:
+            valores = colunas.get(nome)
+            if valores:
+                self.produtos['nutrientes'][nome] = {'min': min(valores), 'max': max(valores), 'soma': sum(valores)}
+
+    def finalizar_produtos(self, caminho_arquivo):
+        """Fecha a seção de produtos registrando o arquivo gravado"""
+        self.produtos['gerado_em'] = datetime.now().isoformat(timespec='seconds')
+        self.registrar_arquivo(caminho_arquivo)
+
+    def registrar_arquivo(self, caminho_arquivo):
+        """Guarda o tamanho atual de um arquivo gerado"""
+        if caminho_arquivo and os.path.exists(caminho_arquivo):
+            self.arquivos[os.path.basename(caminho_arquivo)] = os.path.getsize(caminho_arquivo)
+
+    def media(self, nome):
+        """Média de um nutriente (0.0 se não houver produtos)"""
+        acumulado = self.produtos['nutrientes'].get(nome)
+        if not acumulado or not self.produtos['total']:
+            return 0.0
+        return acumulado['soma'] / self.produtos['total']
+
+    def tamanho_total(self):
+        """Soma dos tamanhos dos arquivos de saída registrados (não a pasta dados/ inteira)"""
+        return sum(self.arquivos.values())
+
+    def registrar_pasta(self):
+        """
+        Guarda o tamanho da pasta do resumo (dados/) com páginas, caches e relatórios
+
+        Percorre só os metadados, uma vez por gravação, para a tela de
+        estatísticas não precisar varrer a pasta.
+        """
+        total = 0
+        for raiz, _, arquivos in os.walk(os.path.dirname(self.caminho) or '.'):
+            for arquivo in arquivos:
+                try:
+                    total += os.path.getsize(os.path.join(raiz, arquivo))
+                except OSError:
+                    pass
+        self.tamanho_pasta = total
+
+    def para_dict(self):
+        """Representação serializável do resumo"""
+        nutrientes = {
+            nome: {
+                'min': v['min'],
+                'media': round(self.media(nome), 4),
+                'max': v['max'],
+                'soma': v['soma'],
+            }
+            for nome, v in self.produtos['nutrientes'].items()
+        }
+        return {
+            'atualizado_em': self.atualizado_em,
+            'urls': self.urls,
+            'produtos': {**self.produtos, 'nutrientes': nutrientes},
+            'arquivos': self.arquivos,
+            'tamanho_pasta': self.tamanho_pasta,
+        }
+
+    def salvar(self):
+        """Grava o resumo de forma atômica"""
+        self.atualizado_em = datetime.now().isoformat(timespec='seconds')
+
+        os.makedirs(os.path.dirname(self.caminho) or '.', exist_ok=True)
+        self.registrar_pasta()
+        temporario = self.caminho + '.tmp'
+        with open(temporario, 'w', encoding='utf-8') as f:
+            json.dump(self.para_dict(), f, indent=2, ensure_ascii=False)
+        os.replace(temporario, self.caminho)
+        return self.caminho
@@ -0,0 +1,296 @@
+#!/usr/bin/env python3
+"""
+Grafo de etapas com memoização por hash das entradas
+Coleta, download, extração, validação, gravação e estatísticas viram nós com
+entradas e saídas declaradas; cada nó é pulado quando o hash do conteúdo das
+entradas, a versão do código e os parâmetros batem com a última execução
+registrada em dados/etapas.json (e as saídas continuam como ela deixou)
+"""
+
+import csv
+import hashlib
+import importlib.util
+import json
+import os
+import sys
+import time
+
+# Permite rodar tanto como script (python config/x.py) quanto como módulo (config.x)
+if not __package__:
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.padroes import ARQUIVO_URLS, INTERVALO_CATEGORIAS, INTERVALO_PRODUTOS
+from config.registro import COLUNAS, ColunasProdutos
+
+ARQUIVO_EXECUCOES = os.path.join('dados', 'etapas.json')
+
+# Produtos extraídos antes da validação e da gravação no formato final
+ARQUIVO_EXTRAIDOS = os.path.join('dados', 'etapas', 'produtos_extraidos.csv')
+
+# Resultado de uma etapa que rodou só em parte (ex.: orçamento esgotado): segue o grafo,
+# mas não é registrada, então roda de novo na próxima execução
+PARCIAL = 'parcial'
+
+
+def hash_arquivo(caminho):
+    """Hash do conteúdo do arquivo (None se ele não existe)"""
+    if not os.path.exists(caminho):
+        return None
+    resumo = hashlib.blake2b(digest_size=16)
+    with open(caminho, 'rb') as f:
+        for bloco in iter(lambda: f.read(1 << 20), b''):
+            resumo.update(bloco)
+    return resumo.hexdigest()
+
+
+def versao_codigo(modulos):
+    """Hash do código-fonte dos módulos de que a etapa depende"""
+    resumo = hashlib.blake2b(digest_size=16)
+    for modulo in sorted(modulos):
+        origem = importlib.util.find_spec(modulo).origin
+        resumo.update(modulo.encode('utf-8'))
+        with open(origem, 'rb') as f:
+            resumo.update(f.read())
+    return resumo.hexdigest()
+
+
+def hash_parametros(parametros):
+    conteudo = json.dumps(parametros or {}, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.blake2b(conteudo.encode('utf-8'), digest_size=16).hexdigest()
+
+
+class Etapa:
+    """Nó do grafo: função sem argumentos, arquivos lidos e gravados, módulos e parâmetros"""
+
+    def __init__(self, nome, executar, entradas=(), saidas=(), modulos=(), parametros=None, validade=None):
+        self.nome = nome
+        self.executar = executar
+        self.entradas = list(entradas)
+        self.saidas = list(saidas)
+        self.modulos = list(modulos)
+        self.parametros = parametros or {}
+        # Etapas que dependem do site (coleta, download) vencem depois de `validade` segundos
+        self.validade = validade
+
+    def assinatura(self):
+        """Hashes atuais das entradas, do código e dos parâmetros"""
+        return {
+            'entradas': {caminho: hash_arquivo(caminho) for caminho in self.entradas},
+            'codigo': versao_codigo(self.modulos),
+            'parametros': hash_parametros(self.parametros),
+        }
+
+
+class GrafoEtapas:
+    """Executa as etapas em ordem de dependência, pulando as que estão em dia"""
+
+    def __init__(self, caminho=ARQUIVO_EXECUCOES, forcar=()):
+        self.caminho = caminho
+        self.forcar = set(forcar)
+        self.etapas = {}
+        self.execucoes = {}
+        self.resultados = {}
+
+        if os.path.exists(caminho):
+            try:
+                with open(caminho, 'r', encoding='utf-8') as f:
+                    self.execucoes = json.load(f)
+            except (OSError, ValueError) as e:
+                print(f"⚠️ Registro das etapas inválido, recriando: {e}")
+
+    def adicionar(self, etapa):
+        if etapa.nome in self.etapas:
+            raise ValueError(f"Etapa repetida: {etapa.nome}")
+        self.etapas[etapa.nome] = etapa
+        return etapa
+
+    def ordem(self):
+        """Etapas em ordem topológica (quem grava um arquivo vem antes de quem o lê)"""
+        produtores = {saida: etapa.nome for etapa in self.etapas.values() for saida in etapa.saidas}
+        dependencias = {
+            nome: {produtores[entrada] for entrada in etapa.entradas if entrada in produtores} - {nome}
+            for nome, etapa in self.etapas.items()
+        }
+        ordem = []
+        while dependencias:
+            # Entre as prontas, vale a ordem em que foram adicionadas
+            prontas = [nome for nome, antes in dependencias.items() if not antes]
+            if not prontas:
+                raise ValueError(f"Ciclo entre as etapas: {', '.join(dependencias)}")
+            for nome in prontas:
+                ordem.append(nome)
+                del dependencias[nome]
+            for antes in dependencias.values():
+                antes.difference_update(prontas)
+        return ordem
+
+    def motivo(self, etapa, assinatura):
+        """Por que a etapa precisa rodar (None se ela pode ser pulada)"""
+        if etapa.nome in self.forcar or 'todas' in self.forcar:
+            return 'forçada'
+        anterior = self.execucoes.get(etapa.nome)
+        if not anterior:
+            return 'nunca executada'
+        if anterior['codigo'] != assinatura['codigo']:
+            return 'código mudou'
+        if anterior['parametros'] != assinatura['parametros']:
+            return 'parâmetros mudaram'
+        mudaram = [caminho for caminho, valor in assinatura['entradas'].items()
+                   if anterior['entradas'].get(caminho) != valor]
+        if mudaram:
+            return f"entrada mudou: {', '.join(mudaram)}"
+        alteradas = [caminho for caminho, valor in anterior['saidas'].items() if hash_arquivo(caminho) != valor]
+        if alteradas:
+            return f"saída ausente ou alterada: {', '.join(alteradas)}"
+        if etapa.validade is not None and time.time() - anterior['executada_em'] >= etapa.validade:
+            return 'vencida'
+        return None
+
+    def _salvar(self):
+        os.makedirs(os.path.dirname(self.caminho) or '.', exist_ok=True)
+        temporario = self.caminho + '.tmp'
+        with open(temporario, 'w', encoding='utf-8') as f:
+            json.dump(self.execucoes, f, indent=2, ensure_ascii=False)
+        os.replace(temporario, self.caminho)
+
+    def executar(self):
+        """
+        Roda o grafo; retorna False se alguma etapa falhou (as seguintes não rodam)
+
+        self.resultados guarda 'pulada', 'executada', 'parcial' ou 'falhou' por etapa.
+        """
+        for nome in self.ordem():
+            etapa = self.etapas[nome]
+            assinatura = etapa.assinatura()
+            motivo = self.motivo(etapa, assinatura)
+            if motivo is None:
+                print(f"\n⏭️  Etapa '{nome}' em dia (entradas e código sem mudança), pulando")
+                self.resultados[nome] = 'pulada'
+                continue
+
+            print(f"\n▶️  Etapa '{nome}' ({motivo})")
+            inicio = time.monotonic()
+            resultado = etapa.executar()
+            if resultado is False:
+                print(f"❌ Etapa '{nome}' falhou; as etapas seguintes não foram executadas")
+                self.resultados[nome] = 'falhou'
+                return False
+            if resultado == PARCIAL:
+                self.resultados[nome] = 'parcial'
+                continue
+
+            self.execucoes[nome] = {
+                **assinatura,
+                'saidas': {caminho: hash_arquivo(caminho) for caminho in etapa.saidas},
+                'executada_em': time.time(),
+                'segundos': round(time.monotonic() - inicio, 3),
+            }
+            self._salvar()
+            self.resultados[nome] = 'executada'
+        return True
+
+    def resumo(self):
+        return ', '.join(f"{nome}: {resultado}" for nome, resultado in self.resultados.items())
+
+
+def gravar_extraidos(dados, caminho=ARQUIVO_EXTRAIDOS):
+    """Grava os produtos extraídos (CSV intermediário, sempre na mesma ordem)"""
+    os.makedirs(os.path.dirname(caminho), exist_ok=True)
+    temporario = caminho + '.tmp'
+    with open(temporario, 'w', encoding='utf-8-sig', newline='') as f:
+        escritor = csv.writer(f)
+        escritor.writerow(COLUNAS)
+        escritor.writerows(dados.linhas())
+    os.replace(temporario, caminho)
+    return caminho
+
+
+def carregar_extraidos(caminho=ARQUIVO_EXTRAIDOS):
+    """Lê o CSV intermediário de volta para os buffers colunares"""
+    with open(caminho, 'r', encoding='utf-8-sig', newline='') as f:
+        return ColunasProdutos.de_registros(csv.DictReader(f))
+
+
+def pipeline_completo(coletor, scraper, formato='csv', max_duracao=None, max_paginas=None, forcar=(),
+                      arquivo_urls=ARQUIVO_URLS):
+    """Monta o grafo coleta → download → extração → validação → gravação → estatísticas"""
+    from config.paginas import ArmazemPaginas
+    from config.scraper import carregar_urls
+
+    grafo = GrafoEtapas(forcar=forcar)
+    paginas = ArmazemPaginas.carregar()
+    caminho_saida = os.path.join('dados', f"produtos_sadia.{formato}")
+    base_qualidade = os.path.splitext(caminho_saida)[0] + '_qualidade'
+    sites = [plano.nome for plano in scraper.sites]
+
+    def coletar():
+        coletor.urls_produtos.clear()
+        coletor.processar_todas_categorias()
+        if not coletor.urls_produtos:
+            print("❌ Nenhuma URL de produto encontrada")
+            return False
+        coletor.salvar_json(os.path.basename(arquivo_urls))
+        return True
+
+    def baixar():
+        pendentes = scraper.baixar_paginas(carregar_urls(arquivo_urls), paginas, max_duracao, max_paginas)
+        if not len(paginas):
+            return False
+        return PARCIAL if pendentes else True
+
+    def extrair():
+        dados = scraper.extrair_paginas(paginas)
+        if not dados:
+            print("❌ Nenhum produto foi extraído")
+            return False
+        gravar_extraidos(dados)
+        return True
+
+    def validar():
+        from config.qualidade import validar as validar_colunas
+
+        relatorio = validar_colunas(carregar_extraidos().colunas)
+        relatorio.imprimir()
+        return scraper.salvar_relatorio_qualidade(relatorio, caminho_saida) is not None
+
+    def gravar():
+        print(f"📊 Dados salvos em: {scraper.salvar_dados(carregar_extraidos(), formato)}")
+        return True
+
+    def estatisticas():
+        from config import analise
+
+        analise.exportar_tabelas(analise.analisar(analise.carregar_colunas([ARQUIVO_EXTRAIDOS])))
+        return True
+
+    grafo.adicionar(Etapa(
+        'coleta', coletar, saidas=[arquivo_urls],
+        modulos=['config.url_collector', 'config.sites', 'config.fronteira'],
+        parametros={'sites': sites, 'rastreamento': coletor.rastreamento},
+        validade=INTERVALO_CATEGORIAS,
+    ))
+    grafo.adicionar(Etapa(
+        'download', baixar, entradas=[arquivo_urls], saidas=[paginas.caminho_manifesto],
+        modulos=['config.rede', 'config.paginas'], validade=INTERVALO_PRODUTOS,
+    ))
+    grafo.adicionar(Etapa(
+        'extracao', extrair, entradas=[paginas.caminho_manifesto], saidas=[ARQUIVO_EXTRAIDOS],
+        modulos=['config.scraper', 'config.sites', 'config.leitura', 'config.tabela', 'config.registro',
+                 'config.canonico', 'config.ingredientes'],
+        parametros={'sites': sites, 'extrator': scraper.extrator},
+    ))
+    if scraper.validacao:
+        grafo.adicionar(Etapa(
+            'validacao', validar, entradas=[ARQUIVO_EXTRAIDOS],
+            saidas=[base_qualidade + '.json', base_qualidade + '.csv'], modulos=['config.qualidade'],
+        ))
+    grafo.adicionar(Etapa(
+        'gravacao', gravar, entradas=[ARQUIVO_EXTRAIDOS], saidas=[caminho_saida],
+        modulos=['config.scraper', 'config.registro', 'config.mudancas'], parametros={'formato': formato},
+    ))
+    grafo.adicionar(Etapa(
+        'estatisticas', estatisticas, entradas=[ARQUIVO_EXTRAIDOS],
+        saidas=[os.path.join('dados', 'analise', f"{nome}.csv") for nome in ('por_categoria', 'percentis', 'densidade')],
+        modulos=['config.analise'],
+    ))
+    return grafo
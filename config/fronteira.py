@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+Fronteira do rastreamento do site inteiro
+Fila em largura (BFS) e produtos confirmados num SQLite em disco, e um filtro
+de Bloom persistente para as páginas já vistas: a memória fica limitada mesmo
+com milhões de URLs (várias marcas ou o histórico de coletas)
+"""
+
+import hashlib
+import math
+import os
+import sqlite3
+import struct
+import time
+
+PASTA_RASTREAMENTO = os.path.join('dados', 'rastreamento')
+
+# Páginas distintas esperadas numa rodada e a chance aceita de pular uma página nunca vista
+CAPACIDADE_PADRAO = 1_000_000
+TAXA_ERRO_PADRAO = 1e-4
+
+# Cabeçalho do arquivo do filtro: bits, funções de hash e itens inseridos
+CABECALHO_BLOOM = struct.Struct('<QQQ')
+
+
+class FiltroBloom:
+    """Conjunto aproximado de tamanho fixo: sem falso negativo, falso positivo com a taxa escolhida"""
+
+    def __init__(self, capacidade=CAPACIDADE_PADRAO, taxa_erro=TAXA_ERRO_PADRAO, bits=None, hashes=None):
+        self.capacidade = capacidade
+        self.bits = bits or max(8, math.ceil(-capacidade * math.log(taxa_erro) / math.log(2) ** 2))
+        self.hashes = hashes or max(1, round(self.bits / capacidade * math.log(2)))
+        self.mapa = bytearray((self.bits + 7) // 8)
+        self.itens = 0
+
+    @classmethod
+    def carregar(cls, caminho, capacidade=CAPACIDADE_PADRAO, taxa_erro=TAXA_ERRO_PADRAO):
+        """Lê o filtro salvo (ou cria um vazio)"""
+        if not os.path.exists(caminho):
+            return cls(capacidade, taxa_erro)
+        with open(caminho, 'rb') as f:
+            bits, hashes, itens = CABECALHO_BLOOM.unpack(f.read(CABECALHO_BLOOM.size))
+            filtro = cls(capacidade, taxa_erro, bits=bits, hashes=hashes)
+            filtro.mapa = bytearray(f.read())
+        filtro.itens = itens
+        return filtro
+
+    def _posicoes(self, item):
+        # Hash duplo (Kirsch-Mitzenmacher): k posições a partir de dois hashes de 64 bits
+        resumo = hashlib.blake2b(item.encode('utf-8'), digest_size=16).digest()
+        h1 = int.from_bytes(resumo[:8], 'little')
+        h2 = int.from_bytes(resumo[8:], 'little') | 1
+        return [(h1 + i * h2) % self.bits for i in range(self.hashes)]
+
+    def __contains__(self, item):
+        mapa = self.mapa
+        return all(mapa[p >> 3] & (1 << (p & 7)) for p in self._posicoes(item))
+
+    def adicionar(self, item):
+        """Insere o item; retorna False se ele (provavelmente) já estava no filtro"""
+        novo = False
+        for p in self._posicoes(item):
+            mascara = 1 << (p & 7)
+            if not self.mapa[p >> 3] & mascara:
+                self.mapa[p >> 3] |= mascara
+                novo = True
+        if novo:
+            self.itens += 1
+        return novo
+
+    def __len__(self):
+        return self.itens
+
+    def taxa_erro_atual(self):
+        """Chance de falso positivo com a quantidade atual de itens"""
+        return (1 - math.exp(-self.hashes * self.itens / self.bits)) ** self.hashes
+
+    def salvar(self, caminho):
+        os.makedirs(os.path.dirname(caminho) or '.', exist_ok=True)
+        temporario = caminho + '.tmp'
+        with open(temporario, 'wb') as f:
+            f.write(CABECALHO_BLOOM.pack(self.bits, self.hashes, self.itens))
+            f.write(self.mapa)
+        os.replace(temporario, caminho)
+
+
+class FronteiraRastreamento:
+    """
+    Estado do rastreamento em dados/rastreamento/
+
+    A fila e o filtro de páginas vistas valem para uma rodada (continuar=True
+    retoma uma rodada interrompida); os produtos confirmados são um conjunto
+    exato que acumula todas as rodadas, com a primeira e a última vez de cada um.
+    Uma página só sai da fila quando o resultado dela é registrado (concluir):
+    as que estavam em andamento numa interrupção voltam para a fila ao retomar.
+    """
+
+    def __init__(self, pasta=PASTA_RASTREAMENTO, capacidade=CAPACIDADE_PADRAO, taxa_erro=TAXA_ERRO_PADRAO,
+                 continuar=False):
+        os.makedirs(pasta, exist_ok=True)
+        self.caminho_filtro = os.path.join(pasta, 'vistas.bloom')
+        self.conexao = sqlite3.connect(os.path.join(pasta, 'fronteira.sqlite'))
+        self.conexao.executescript("""
+            CREATE TABLE IF NOT EXISTS fila (
+                id INTEGER PRIMARY KEY AUTOINCREMENT, url TEXT NOT NULL, profundidade INTEGER NOT NULL,
+                em_andamento INTEGER NOT NULL DEFAULT 0
+            );
+            CREATE TABLE IF NOT EXISTS produtos (
+                url TEXT PRIMARY KEY, primeira_vez REAL NOT NULL, ultima_vez REAL NOT NULL
+            ) WITHOUT ROWID;
+            CREATE TABLE IF NOT EXISTS rodada (chave TEXT PRIMARY KEY, valor REAL NOT NULL);
+        """)
+
+        inicio = self.conexao.execute("SELECT valor FROM rodada WHERE chave = 'inicio'").fetchone()
+        # Só uma rodada que parou com páginas na fila pode ser retomada
+        if continuar and inicio and len(self):
+            self.inicio = inicio[0]
+            self.conexao.execute("UPDATE fila SET em_andamento = 0")
+            self.vistas = FiltroBloom.carregar(self.caminho_filtro, capacidade, taxa_erro)
+            print(f"📂 Retomando o rastreamento: {len(self)} páginas na fila, {len(self.vistas)} já vistas")
+        else:
+            self.inicio = time.time()
+            self.conexao.execute("DELETE FROM fila")
+            self.conexao.execute("INSERT OR REPLACE INTO rodada VALUES ('inicio', ?)", (self.inicio,))
+            self.conexao.commit()
+            self.vistas = FiltroBloom(capacidade, taxa_erro)
+
+    def __len__(self):
+        """Páginas na fila (inclusive as em andamento)"""
+        return self.conexao.execute("SELECT COUNT(*) FROM fila").fetchone()[0]
+
+    def adicionar(self, url, profundidade):
+        """Põe a página na fila se ela ainda não foi vista nesta rodada"""
+        if not self.vistas.adicionar(url):
+            return False
+        self.conexao.execute("INSERT INTO fila (url, profundidade) VALUES (?, ?)", (url, profundidade))
+        return True
+
+    def proximas(self, quantidade):
+        """Marca como em andamento as próximas páginas, na ordem em que entraram: [(id, url, profundidade)]"""
+        linhas = self.conexao.execute(
+            "SELECT id, url, profundidade FROM fila WHERE em_andamento = 0 ORDER BY id LIMIT ?", (quantidade,)
+        ).fetchall()
+        self.conexao.executemany("UPDATE fila SET em_andamento = 1 WHERE id = ?", [(linha[0],) for linha in linhas])
+        return linhas
+
+    def concluir(self, identificador):
+        """Tira da fila a página cujo resultado já foi registrado"""
+        self.conexao.execute("DELETE FROM fila WHERE id = ?", (identificador,))
+
+    def confirmar_produto(self, url):
+        """Registra o produto (exato); retorna True se ele ainda não tinha aparecido nesta rodada"""
+        agora = time.time()
+        anterior = self.conexao.execute("SELECT ultima_vez FROM produtos WHERE url = ?", (url,)).fetchone()
+        if anterior is None:
+            self.conexao.execute("INSERT INTO produtos VALUES (?, ?, ?)", (url, agora, agora))
+        else:
+            self.conexao.execute("UPDATE produtos SET ultima_vez = ? WHERE url = ?", (agora, url))
+        # Produto também conta como visto: não entra na fila de páginas
+        self.vistas.adicionar(url)
+        return anterior is None or anterior[0] < self.inicio
+
+    def produto_confirmado(self, url):
+        return self.conexao.execute("SELECT 1 FROM produtos WHERE url = ?", (url,)).fetchone() is not None
+
+    def produtos_da_rodada(self):
+        """URLs dos produtos encontrados nesta rodada, em ordem"""
+        for (url,) in self.conexao.execute(
+            "SELECT url FROM produtos WHERE ultima_vez >= ? ORDER BY url", (self.inicio,)
+        ):
+            yield url
+
+    def total_produtos(self):
+        """Produtos confirmados em todas as rodadas"""
+        return self.conexao.execute("SELECT COUNT(*) FROM produtos").fetchone()[0]
+
+    def salvar(self):
+        """Grava a fila e os produtos e, depois, o filtro (uma queda entre os dois só repete páginas)"""
+        self.conexao.commit()
+        self.vistas.salvar(self.caminho_filtro)
+
+    def fechar(self):
+        self.salvar()
+        self.conexao.close()
@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+Ingredientes, alergênicos e aditivos
+Um autômato de Aho-Corasick com todos os termos do dicionário (sem acentos)
+percorre o texto de ingredientes uma única vez: o custo cresce com o tamanho
+do texto, não com a quantidade de termos
+"""
+
+import unicodedata
+from collections import deque
+
+# Alergênicos de declaração obrigatória (RDC 26/2015) e os termos que os indicam
+ALERGENICOS = {
+    'trigo': ['trigo', 'farinha de trigo', 'gérmen de trigo', 'semolina'],
+    'centeio': ['centeio'],
+    'cevada': ['cevada', 'malte', 'extrato de malte'],
+    'aveia': ['aveia'],
+    'glúten': ['glúten'],
+    'crustáceos': ['crustáceo', 'crustáceos', 'camarão', 'camarões', 'lagosta', 'caranguejo', 'siri'],
+    'ovos': ['ovo', 'ovos', 'ovo em pó', 'clara de ovo', 'gema de ovo', 'albumina'],
+    'peixes': ['peixe', 'peixes', 'bacalhau', 'atum', 'salmão', 'merluza', 'sardinha', 'tilápia', 'pescada',
+               'polaca do alasca', 'surimi'],
+    'amendoim': ['amendoim', 'amendoins'],
+    'soja': ['soja', 'proteína de soja', 'proteína texturizada de soja', 'lecitina de soja', 'óleo de soja'],
+    'leite': ['leite', 'leites', 'leite em pó', 'soro de leite', 'lactose', 'caseína', 'caseinato',
+              'caseinato de sódio', 'manteiga', 'queijo', 'requeijão', 'creme de leite', 'lácteos', 'lácteo'],
+    'amêndoa': ['amêndoa', 'amêndoas'],
+    'avelã': ['avelã', 'avelãs'],
+    'castanha-de-caju': ['castanha-de-caju', 'castanha de caju', 'castanhas-de-caju', 'castanhas de caju'],
+    'castanha-do-brasil': ['castanha-do-brasil', 'castanha do brasil', 'castanha-do-pará', 'castanha do pará'],
+    'macadâmia': ['macadâmia', 'macadâmias'],
+    'nozes': ['noz', 'nozes'],
+    'pecã': ['pecã', 'pecãs', 'noz pecã'],
+    'pistache': ['pistache', 'pistaches'],
+    'pinoli': ['pinoli', 'pinolis', 'pinhão'],
+    'castanhas': ['castanha', 'castanhas'],
+    'látex natural': ['látex natural', 'látex'],
+}
+
+# Aditivos comuns em embutidos e congelados (nome e número INS)
+ADITIVOS = {
+    'glutamato monossódico (INS 621)': ['glutamato monossódico', 'ins 621'],
+    'inosinato dissódico (INS 631)': ['inosinato dissódico', 'ins 631'],
+    'guanilato dissódico (INS 627)': ['guanilato dissódico', 'ins 627'],
+    'nitrito de sódio (INS 250)': ['nitrito de sódio', 'ins 250'],
+    'nitrato de sódio (INS 251)': ['nitrato de sódio', 'ins 251'],
+    'eritorbato de sódio (INS 316)': ['eritorbato de sódio', 'isoascorbato de sódio', 'ins 316'],
+    'ascorbato de sódio (INS 301)': ['ascorbato de sódio', 'ins 301'],
+    'tripolifosfato de sódio (INS 451i)': ['tripolifosfato de sódio', 'ins 451i', 'ins 451'],
+    'pirofosfato dissódico (INS 450i)': ['pirofosfato dissódico', 'pirofosfato ácido de sódio', 'ins 450i'],
+    'lactato de sódio (INS 325)': ['lactato de sódio', 'ins 325'],
+    'diacetato de sódio (INS 262ii)': ['diacetato de sódio', 'ins 262ii'],
+    'citrato de sódio (INS 331)': ['citrato de sódio', 'ins 331', 'ins 331iii'],
+    'sorbato de potássio (INS 202)': ['sorbato de potássio', 'ins 202'],
+    'carragena (INS 407)': ['carragena', 'carragenina', 'ins 407'],
+    'goma xantana (INS 415)': ['goma xantana', 'ins 415'],
+    'goma guar (INS 412)': ['goma guar', 'ins 412'],
+    'carmim de cochonilha (INS 120)': ['carmim', 'carmim de cochonilha', 'cochonilha', 'ins 120'],
+    'urucum (INS 160b)': ['urucum', 'annatto', 'ins 160b'],
+    'caramelo (INS 150)': ['corante caramelo', 'caramelo iv', 'ins 150', 'ins 150a', 'ins 150c', 'ins 150d'],
+    'páprica (INS 160c)': ['extrato de páprica', 'ins 160c'],
+    'aroma de fumaça': ['aroma de fumaça', 'aroma natural de fumaça', 'fumaça líquida'],
+}
+
+# Início das declarações que seguem a lista de ingredientes
+MARCADORES = {
+    'ingredientes': 'rotulo', 'ingrediente': 'rotulo',
+    'alérgicos': 'declaracao', 'alergênicos': 'declaracao',
+    'contém': 'contem', 'contem': 'contem',
+    'pode conter': 'pode_conter',
+    'não contém': 'nao_contem',
+}
+
+# Fim de frase (encerra a declaração em andamento)
+FIM_FRASE = '.'
+
+
+def _tabela_dobra():
+    # Só caracteres latinos com acento; cada um vira um caractere, então as posições não mudam
+    tabela = {}
+    for codigo in range(0xC0, 0x250):
+        caractere = chr(codigo)
+        base = unicodedata.normalize('NFD', caractere)[0].lower()
+        if len(base) == 1 and base != caractere:
+            tabela[codigo] = base
+    tabela[0xA0] = ' '
+    return tabela
+
+
+TABELA_DOBRA = _tabela_dobra()
+
+
+def dobrar(texto):
+    """Minúsculas e sem acentos, com o mesmo tamanho do texto original"""
+    return texto.translate(TABELA_DOBRA).lower()
+
+
+class Automato:
+    """Aho-Corasick: acha todos os termos do dicionário numa única passada pelo texto"""
+
+    def __init__(self, termos):
+        # termo (já dobrado) -> valor devolvido quando ele aparece
+        self.transicoes = [{}]
+        self.falhas = [0]
+        self.saidas = [[]]
+        for termo, valor in termos.items():
+            no = 0
+            for caractere in termo:
+                proximo = self.transicoes[no].get(caractere)
+                if proximo is None:
+                    proximo = len(self.transicoes)
+                    self.transicoes[no][caractere] = proximo
+                    self.transicoes.append({})
+                    self.falhas.append(0)
+                    self.saidas.append([])
+                no = proximo
+            self.saidas[no].append((len(termo), valor))
+
+        # Links de falha em largura: o maior sufixo do caminho que também é prefixo de algum termo
+        fila = deque(self.transicoes[0].values())
+        while fila:
+            no = fila.popleft()
+            for caractere, filho in self.transicoes[no].items():
+                fila.append(filho)
+                falha = self.falhas[no]
+                while falha and caractere not in self.transicoes[falha]:
+                    falha = self.falhas[falha]
+                destino = self.transicoes[falha].get(caractere, 0)
+                self.falhas[filho] = destino if destino != filho else 0
+                self.saidas[filho] = self.saidas[filho] + self.saidas[self.falhas[filho]]
+
+    def __len__(self):
+        return len(self.transicoes)
+
+    def procurar(self, texto):
+        """Gera (início, fim, valor) de cada ocorrência, inclusive as sobrepostas"""
+        transicoes, falhas, saidas = self.transicoes, self.falhas, self.saidas
+        no = 0
+        for i, caractere in enumerate(texto):
+            while no and caractere not in transicoes[no]:
+                no = falhas[no]
+            no = transicoes[no].get(caractere, 0)
+            for tamanho, valor in saidas[no]:
+                yield i + 1 - tamanho, i + 1, valor
+
+
+def palavra_inteira(texto, inicio, fim):
+    """A ocorrência não está colada em letras ou dígitos ('sal' não casa dentro de 'salsa')"""
+    return ((inicio == 0 or not texto[inicio - 1].isalnum() or not texto[inicio].isalnum())
+            and (fim == len(texto) or not texto[fim].isalnum() or not texto[fim - 1].isalnum()))
+
+
+def ocorrencias(automato, texto):
+    """Ocorrências de palavras inteiras, sem sobreposição: a mais à esquerda e, nela, a mais longa"""
+    candidatas = sorted((
+        (inicio, -fim, valor) for inicio, fim, valor in automato.procurar(texto)
+        if palavra_inteira(texto, inicio, fim)
+    ), key=lambda ocorrencia: ocorrencia[:2])
+    ultimo_fim = 0
+    for inicio, fim, valor in candidatas:
+        fim = -fim
+        if inicio >= ultimo_fim:
+            ultimo_fim = fim
+            yield inicio, fim, valor
+
+
+def compilar_dicionario(alergenicos=ALERGENICOS, aditivos=ADITIVOS, marcadores=MARCADORES):
+    """Monta o autômato com todos os termos dobrados"""
+    termos = {}
+    for tipo, dicionario in (('alergenico', alergenicos), ('aditivo', aditivos)):
+        for nome, sinonimos in dicionario.items():
+            for sinonimo in sinonimos:
+                termos[dobrar(sinonimo)] = (tipo, nome)
+    for marcador, tipo in marcadores.items():
+        termos[dobrar(marcador)] = (tipo, None)
+    termos[FIM_FRASE] = ('fim', None)
+    return Automato(termos)
+
+
+AUTOMATO = compilar_dicionario()
+
+
+def analisar_ingredientes(texto, automato=AUTOMATO):
+    """
+    Lista de ingredientes, alergênicos (contém), alergênicos (pode conter) e aditivos
+
+    Alergênicos citados na lista de ingredientes também contam como 'contém';
+    os que vêm depois de 'não contém' são ignorados.
+    """
+    texto = ' '.join((texto or '').split())
+    dobrado = dobrar(texto)
+    contem, pode_conter, aditivos = {}, {}, {}
+    inicio_lista = 0
+    inicio_declaracoes = len(texto)
+    estado = 'ingredientes'
+    for inicio, fim, (tipo, nome) in ocorrencias(automato, dobrado):
+        if tipo == 'fim':
+            # Ponto decimal ('2.5') não encerra a frase
+            if fim < len(dobrado) and dobrado[fim].isdigit():
+                continue
+            estado = 'ingredientes'
+        elif tipo == 'rotulo':
+            if inicio < inicio_declaracoes:
+                inicio_lista = fim
+        elif tipo in ('declaracao', 'contem', 'pode_conter', 'nao_contem'):
+            inicio_declaracoes = min(inicio_declaracoes, inicio)
+            estado = tipo
+        elif tipo == 'aditivo':
+            aditivos.setdefault(nome)
+        elif estado == 'pode_conter':
+            pode_conter.setdefault(nome)
+        elif estado != 'nao_contem':
+            contem.setdefault(nome)
+
+    lista = texto[inicio_lista:inicio_declaracoes].strip(' :.;')
+    return {
+        'INGREDIENTES': lista,
+        'ALERGENICOS': ', '.join(contem),
+        'PODE_CONTER': ', '.join(nome for nome in pode_conter if nome not in contem),
+        'ADITIVOS': ', '.join(aditivos),
+    }
+
+
+def preencher_ingredientes(produto, texto):
+    """Preenche as colunas de ingredientes do produto a partir do texto da página"""
+    for coluna, valor in analisar_ingredientes(texto).items():
+        produto[coluna] = valor
+    return produto
@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+"""
+Leitura contínua da página de produto (sem árvore)
+Um único passe pelos eventos do html.parser guarda só o que a extração usa:
+os elementos dos campos do perfil, as linhas da tabela nutricional e as tags
+<meta>/<link> da URL canônica; o resto da página é descartado na hora
+"""
+
+from html.parser import HTMLParser
+
+from bs4.builder import HTMLTreeBuilder
+
+# Tags sem fechamento e atributos com vários valores, como o BeautifulSoup trata
+TAGS_VAZIAS = HTMLTreeBuilder.DEFAULT_EMPTY_ELEMENT_TAGS
+ATRIBUTOS_MULTIPLOS = HTMLTreeBuilder.DEFAULT_CDATA_LIST_ATTRIBUTES
+
+# Texto que não entra no get_text()
+TAGS_SEM_TEXTO = {'script', 'style'}
+
+# Tamanho dos trechos entregues ao parser (a leitura para quando tudo foi encontrado)
+TAMANHO_TRECHO = 16384
+
+
+class No:
+    """Elemento capturado, com a parte da interface de Tag que os conversores usam"""
+
+    __slots__ = ('name', 'attrs', 'filhos')
+
+    def __init__(self, name, attrs):
+        self.name = name
+        self.attrs = attrs
+        self.filhos = []
+
+    def get(self, chave, padrao=None):
+        return self.attrs.get(chave, padrao)
+
+    def __getitem__(self, chave):
+        return self.attrs[chave]
+
+    def _textos(self):
+        for filho in self.filhos:
+            if isinstance(filho, str):
+                yield filho
+            else:
+                yield from filho._textos()
+
+    def get_text(self, separator='', strip=False):
+        textos = self._textos()
+        if strip:
+            textos = (texto.strip() for texto in textos)
+            textos = (texto for texto in textos if texto)
+        return separator.join(textos)
+
+    def find_all(self, nomes):
+        nomes = {nomes} if isinstance(nomes, str) else set(nomes)
+        encontrados = []
+        for filho in self.filhos:
+            if isinstance(filho, No):
+                if filho.name in nomes:
+                    encontrados.append(filho)
+                encontrados.extend(filho.find_all(nomes))
+        return encontrados
+
+    def find(self, nome):
+        encontrados = self.find_all(nome)
+        return encontrados[0] if encontrados else None
+
+
+class PaginaLida:
+    """Resultado da leitura contínua: elementos por seletor, linhas da tabela e <meta>/<link>"""
+
+    def __init__(self, elementos, linhas, cabecalho):
+        self.elementos = elementos
+        self.linhas = linhas
+        self.cabecalho = cabecalho
+
+    def selecionado(self, nome_seletor):
+        """Elemento capturado para o seletor do perfil, ou None"""
+        return self.elementos.get(nome_seletor)
+
+    def find(self, nome, **atributos):
+        """Primeira <meta>/<link> com os atributos (como soup.find)"""
+        return procurar(self.cabecalho, nome, atributos)
+
+
+def procurar(nos, nome, atributos):
+    """Primeiro nó com o nome e os atributos (valores múltiplos, como rel, casam por item)"""
+    for no in nos:
+        if no.name != nome:
+            continue
+        if all(valor in no.attrs.get(chave, ()) if isinstance(no.attrs.get(chave), list)
+               else no.attrs.get(chave) == valor for chave, valor in atributos.items()):
+            return no
+    return None
+
+
+def casa(passos, nome, classes, ancestrais):
+    """O elemento (nome, classes) dentro de `ancestrais` casa com a cadeia de descendentes?"""
+    tag, exigidas = passos[-1]
+    if (tag is not True and tag != nome) or not classes.issuperset(exigidas):
+        return False
+    restantes = len(passos) - 2
+    for nome_ancestral, classes_ancestral, *_ in reversed(ancestrais):
+        if restantes < 0:
+            break
+        tag, exigidas = passos[restantes]
+        if (tag is True or tag == nome_ancestral) and classes_ancestral.issuperset(exigidas):
+            restantes -= 1
+    return restantes < 0
+
+
+class LeitorProduto(HTMLParser):
+    """Parser por eventos que monta só os trechos pedidos pelo plano do site"""
+
+    def __init__(self, plano):
+        super().__init__(convert_charrefs=True)
+        self.alvos = {campo.nome_seletor: campo.seletor.passos for campo in plano.campos.values()}
+        self.passos_tabela = plano.tabela.passos
+
+        self.pilha = []  # (nome, classes, nó capturado, linha aberta, célula aberta)
+        self.buffer = []
+        self.elementos = {}
+        self.capturas_abertas = 0
+        self.cabecalho = []
+
+        self.linhas = None
+        self.tabela_aberta = None
+        self.linhas_abertas = []
+        self.celulas_abertas = []
+
+    @property
+    def completo(self):
+        """Tudo o que a extração usa já foi lido (o resto da página pode ser ignorado)"""
+        return (
+            len(self.elementos) == len(self.alvos) and not self.capturas_abertas
+            and self.linhas is not None and self.tabela_aberta is None
+            and procurar(self.cabecalho, 'link', {'rel': 'canonical'}) is not None
+            and procurar(self.cabecalho, 'meta', {'property': 'og:url'}) is not None
+        )
+
+    def _descarregar(self):
+        # O texto entre dois eventos é uma string só, como no BeautifulSoup
+        if not self.buffer:
+            return
+        texto = ''.join(self.buffer)
+        self.buffer.clear()
+        if self.pilha and self.pilha[-1][0] in TAGS_SEM_TEXTO:
+            return
+        if self.pilha and self.pilha[-1][2] is not None:
+            self.pilha[-1][2].filhos.append(texto)
+        for celula in self.celulas_abertas:
+            celula.append(texto)
+
+    def handle_starttag(self, tag, attrs):
+        self._descarregar()
+        atributos = {}
+        multiplos = ATRIBUTOS_MULTIPLOS['*'] | ATRIBUTOS_MULTIPLOS.get(tag, set())
+        for chave, valor in attrs:
+            valor = valor or ''
+            atributos[chave] = valor.split() if chave in multiplos else valor
+        classes = set(atributos.get('class', ()))
+
+        no = None
+        pai = self.pilha[-1][2] if self.pilha else None
+        if pai is not None:
+            no = No(tag, atributos)
+            pai.filhos.append(no)
+        for nome_seletor, passos in self.alvos.items():
+            if nome_seletor not in self.elementos and casa(passos, tag, classes, self.pilha):
+                if no is None:
+                    no = No(tag, atributos)
+                    self.capturas_abertas += 1
+                self.elementos[nome_seletor] = no
+
+        if self.linhas is None and casa(self.passos_tabela, tag, classes, self.pilha):
+            self.linhas = []
+            self.tabela_aberta = len(self.pilha)
+
+        linha = celula = None
+        if self.tabela_aberta is not None:
+            if tag == 'tr':
+                linha = []
+                self.linhas.append(linha)
+                self.linhas_abertas.append(linha)
+            elif tag in ('td', 'th'):
+                # Como find_all(['td', 'th']) de cada <tr> aberta (inclui tabelas aninhadas)
+                celula = []
+                for aberta in self.linhas_abertas:
+                    aberta.append(celula)
+                self.celulas_abertas.append(celula)
+
+        if tag in ('meta', 'link') and (atributos.get('property') or atributos.get('rel')):
+            self.cabecalho.append(no or No(tag, atributos))
+
+        if tag in TAGS_VAZIAS:
+            if linha is not None:
+                self.linhas_abertas.pop()
+            if celula is not None:
+                self.celulas_abertas.pop()
+            if no is not None and pai is None:
+                self.capturas_abertas -= 1
+            return
+        self.pilha.append((tag, classes, no, linha, celula))
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs)
+        if tag not in TAGS_VAZIAS:
+            self.handle_endtag(tag)
+
+    def handle_endtag(self, tag):
+        self._descarregar()
+        # Fecha até a última tag aberta com o mesmo nome; fechamentos sem abertura são ignorados
+        for i in range(len(self.pilha) - 1, -1, -1):
+            if self.pilha[i][0] == tag:
+                break
+        else:
+            return
+        while len(self.pilha) > i:
+            self._fechar()
+
+    def _fechar(self):
+        _, _, no, linha, celula = self.pilha.pop()
+        if linha is not None:
+            self.linhas_abertas.pop()
+        if celula is not None:
+            self.celulas_abertas.pop()
+        if no is not None and (not self.pilha or self.pilha[-1][2] is None):
+            self.capturas_abertas -= 1
+        if self.tabela_aberta is not None and len(self.pilha) == self.tabela_aberta:
+            self.tabela_aberta = None
+
+    def handle_comment(self, data):
+        self._descarregar()
+
+    def handle_decl(self, decl):
+        self._descarregar()
+
+    def handle_pi(self, data):
+        self._descarregar()
+
+    def unknown_decl(self, data):
+        self._descarregar()
+
+    def handle_data(self, data):
+        self.buffer.append(data)
+
+    def resultado(self):
+        linhas = None
+        if self.linhas is not None:
+            linhas = [
+                [' '.join(texto for texto in (parte.strip() for parte in celula) if texto) for celula in linha]
+                for linha in self.linhas
+            ]
+        return PaginaLida(self.elementos, linhas, self.cabecalho)
+
+
+def ler_pagina(html, plano):
+    """Lê a página num único passe e para assim que o plano tem tudo o que precisa"""
+    leitor = LeitorProduto(plano)
+    for inicio in range(0, len(html), TAMANHO_TRECHO):
+        leitor.feed(html[inicio:inicio + TAMANHO_TRECHO])
+        if leitor.completo:
+            break
+    else:
+        leitor.close()
+    leitor._descarregar()
+    return leitor.resultado()
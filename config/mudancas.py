@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Feed de mudanças entre execuções (produtos adicionados, removidos e modificados)
+Compara a saída anterior (CSV, JSON ou Parquet) com a nova por URL e grava um
+JSONL compacto
+"""
+
+import csv
+import hashlib
+import json
+import os
+import sys
+from datetime import datetime
+
+# Permite rodar tanto como script (python config/x.py) quanto como módulo (config.x)
+if not __package__:
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.registro import COLUNAS, COLUNAS_NUMERICAS, ColunasProdutos
+
+PASTA_MUDANCAS = os.path.join('dados', 'mudancas')
+
+# Campos comparados (a URL é a chave)
+CAMPOS_COMPARADOS = [coluna for coluna in COLUNAS if coluna != 'URL']
+
+
+def chave_url(url):
+    """Chave compacta (hash de 16 bytes) para uma URL"""
+    return hashlib.blake2b(url.encode('utf-8'), digest_size=16).digest()
+
+
+def _normalizar(coluna, valor):
+    """Converte o valor lido do CSV para o mesmo tipo usado nos registros"""
+    if coluna in COLUNAS_NUMERICAS:
+        try:
+            return float(valor)
+        except (TypeError, ValueError):
+            return 0.0
+    return valor if valor is not None else ''
+
+
+def ler_saida_anterior(caminho):
+    """
+    Colunas e linhas (dicts) da saída anterior, pelo formato da extensão
+
+    O CSV é lido linha a linha; JSON e Parquet são carregados inteiros.
+    """
+    extensao = os.path.splitext(caminho)[1].lower()
+    if extensao == '.json':
+        with open(caminho, 'r', encoding='utf-8') as f:
+            linhas = json.load(f)
+        if not isinstance(linhas, list):
+            raise ValueError(f"{caminho} não é uma lista de produtos")
+        return (list(linhas[0]) if linhas else []), iter(linhas)
+    if extensao == '.parquet':
+        import pandas as pd
+
+        df = pd.read_parquet(caminho)
+        return list(df.columns), (linha for _, linha in df.iterrows())
+
+    f = open(caminho, 'r', encoding='utf-8-sig', newline='')
+    leitor = csv.DictReader(f)
+
+    def linhas():
+        with f:
+            yield from leitor
+
+    return leitor.fieldnames or [], linhas()
+
+
+def calcular_mudancas(caminho_anterior, novos):
+    """
+    Gera os eventos de mudança entre a saída anterior e os novos produtos
+
+    Indexa os novos produtos por hash da URL e percorre a saída anterior
+    uma única vez (o CSV linha a linha, sem carregá-lo inteiro na memória).
+    """
+    novos = ColunasProdutos.de_registros(novos)
+    indice = {}
+    for posicao, url in enumerate(novos.colunas['URL']):
+        indice[chave_url(url)] = posicao
+    vistos = bytearray(len(novos))
+
+    if caminho_anterior and os.path.exists(caminho_anterior):
+        colunas, linhas = ler_saida_anterior(caminho_anterior)
+        if 'URL' not in colunas:
+            raise ValueError(f"{caminho_anterior} não tem a coluna URL")
+        # Colunas novas que a saída anterior ainda não tinha não contam como mudança
+        campos = [coluna for coluna in CAMPOS_COMPARADOS if coluna in colunas]
+        for linha in linhas:
+            url = linha['URL']
+            posicao = indice.get(chave_url(url))
+            if posicao is None:
+                yield {'tipo': 'removido', 'URL': url, 'NOME_PRODUTO': linha.get('NOME_PRODUTO', '')}
+                continue
+
+            vistos[posicao] = 1
+            alteracoes = {}
+            for coluna in campos:
+                antes = _normalizar(coluna, linha.get(coluna))
+                depois = novos.colunas[coluna][posicao]
+                if antes != depois:
+                    alteracoes[coluna] = {'antes': antes, 'depois': depois}
+            if alteracoes:
+                yield {'tipo': 'modificado', 'URL': url, 'campos': alteracoes}
+
+    for posicao, visto in enumerate(vistos):
+        if not visto:
+            yield {
+                'tipo': 'adicionado',
+                **{coluna: novos.colunas[coluna][posicao] for coluna in COLUNAS},
+            }
+
+
+def gravar_feed(eventos, pasta=PASTA_MUDANCAS):
+    """Grava os eventos em dados/mudancas/mudancas_<timestamp>.jsonl e devolve (caminho, contagem)"""
+    os.makedirs(pasta, exist_ok=True)
+    momento = datetime.now()
+    base = os.path.join(pasta, f"mudancas_{momento.strftime('%Y%m%d_%H%M%S')}")
+    caminho, sequencia = f"{base}.jsonl", 1
+    while os.path.exists(caminho):
+        sequencia += 1
+        caminho = f"{base}_{sequencia}.jsonl"
+    contagem = {'adicionado': 0, 'removido': 0, 'modificado': 0}
+
+    temporario = caminho + '.tmp'
+    try:
+        with open(temporario, 'w', encoding='utf-8') as f:
+            for evento in eventos:
+                evento['em'] = momento.isoformat(timespec='seconds')
+                f.write(json.dumps(evento, ensure_ascii=False) + '\n')
+                contagem[evento['tipo']] += 1
+    except BaseException:
+        # Saída anterior ilegível no meio da leitura: nenhum feed pela metade fica para trás
+        os.remove(temporario)
+        raise
+    os.replace(temporario, caminho)
+
+    return caminho, contagem
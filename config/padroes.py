@@ -0,0 +1,13 @@
+#!/usr/bin/env python3
+"""
+Caminhos e intervalos padrão da coleta
+Compartilhados pelo modo serviço e pelo grafo de etapas
+"""
+
+import os
+
+ARQUIVO_URLS = os.path.join('dados', 'urls_produtos.json')
+
+# Intervalos entre atualizações (segundos): categorias mudam pouco, produtos mais
+INTERVALO_CATEGORIAS = 24 * 3600
+INTERVALO_PRODUTOS = 6 * 3600
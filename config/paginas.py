@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Armazém das páginas de produto baixadas
+Guarda o HTML em dados/paginas/ (gzip, endereçado pelo hash do conteúdo) e um
+manifesto URL -> hash, para que a extração rode sem rede e só quando alguma
+página mudou de fato
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+
+PASTA_PAGINAS = os.path.join('dados', 'paginas')
+
+
+def hash_conteudo(html):
+    """Hash do HTML (o mesmo conteúdo é guardado uma vez só)"""
+    return hashlib.blake2b(html.encode('utf-8'), digest_size=16).hexdigest()
+
+
+class ArmazemPaginas:
+    """HTML por hash de conteúdo, manifesto URL -> hash e a data em que cada página foi obtida"""
+
+    def __init__(self, pasta=PASTA_PAGINAS):
+        self.pasta = pasta
+        self.caminho_manifesto = os.path.join(pasta, 'manifesto.json')
+        # As datas ficam fora do manifesto: baixar de novo uma página igual não muda o manifesto
+        self.caminho_datas = os.path.join(pasta, 'obtidas.json')
+        self.paginas = {}
+        self.obtidas = {}
+        self._trava = threading.Lock()
+
+    @classmethod
+    def carregar(cls, pasta=PASTA_PAGINAS):
+        """Carrega o manifesto salvo (ou um armazém vazio)"""
+        armazem = cls(pasta)
+        try:
+            if os.path.exists(armazem.caminho_manifesto):
+                with open(armazem.caminho_manifesto, 'r', encoding='utf-8') as f:
+                    armazem.paginas = json.load(f)
+            if os.path.exists(armazem.caminho_datas):
+                with open(armazem.caminho_datas, 'r', encoding='utf-8') as f:
+                    armazem.obtidas = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"⚠️ Manifesto das páginas inválido, recriando: {e}")
+            armazem.paginas, armazem.obtidas = {}, {}
+        return armazem
+
+    def __len__(self):
+        return len(self.paginas)
+
+    def __iter__(self):
+        """URLs guardadas, em ordem (a mesma a cada execução)"""
+        return iter(sorted(self.paginas))
+
+    def _caminho(self, chave):
+        return os.path.join(self.pasta, chave[:2], f"{chave}.html.gz")
+
+    def guardar(self, url, html):
+        """Guarda o HTML da URL e retorna o hash do conteúdo"""
+        chave = hash_conteudo(html)
+        caminho = self._caminho(chave)
+        if not os.path.exists(caminho):
+            os.makedirs(os.path.dirname(caminho), exist_ok=True)
+            temporario = f"{caminho}.{threading.get_ident()}.tmp"
+            with gzip.open(temporario, 'wt', encoding='utf-8') as f:
+                f.write(html)
+            os.replace(temporario, caminho)
+        with self._trava:
+            self.paginas[url] = chave
+            self.obtidas[url] = time.time()
+        return chave
+
+    def ler(self, url):
+        """HTML guardado da URL (None se não houver)"""
+        chave = self.paginas.get(url)
+        if chave is None:
+            return None
+        try:
+            with gzip.open(self._caminho(chave), 'rt', encoding='utf-8') as f:
+                return f.read()
+        except OSError as e:
+            print(f"⚠️ Página guardada ilegível ({url}): {e}")
+            return None
+
+    def manter(self, urls):
+        """Mantém só as URLs da lista atual e apaga os arquivos que ficaram sem referência"""
+        urls = set(urls)
+        with self._trava:
+            self.paginas = {url: chave for url, chave in self.paginas.items() if url in urls}
+            self.obtidas = {url: data for url, data in self.obtidas.items() if url in self.paginas}
+        usadas = set(self.paginas.values())
+        for raiz, _, arquivos in os.walk(self.pasta):
+            for arquivo in arquivos:
+                if arquivo.endswith('.html.gz') and arquivo[:-len('.html.gz')] not in usadas:
+                    os.remove(os.path.join(raiz, arquivo))
+
+    def _gravar(self, caminho, conteudo):
+        temporario = caminho + '.tmp'
+        with open(temporario, 'w', encoding='utf-8') as f:
+            json.dump(conteudo, f, indent=2, ensure_ascii=False, sort_keys=True)
+        os.replace(temporario, caminho)
+
+    def salvar(self):
+        """Grava o manifesto e as datas (troca atômica)"""
+        os.makedirs(self.pasta, exist_ok=True)
+        with self._trava:
+            self._gravar(self.caminho_manifesto, self.paginas)
+            self._gravar(self.caminho_datas, self.obtidas)
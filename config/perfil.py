@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Modo de profiling do pipeline de extração
+cProfile por etapa (download, parse, extração, gravação) e, opcionalmente,
+tracemalloc para os pontos de maior alocação
+"""
+
+import cProfile
+import io
+import os
+import pstats
+import random
+import threading
+import tracemalloc
+from contextlib import contextmanager
+
+PASTA_PERFIL = os.path.join('dados', 'perfil')
+
+
+class PerfilPipeline:
+    """Coleta perfis por etapa em modo serial ou com workers (um profiler por thread)"""
+
+    def __init__(self, pasta=PASTA_PERFIL, amostragem=1.0, memoria=False, top=20, semente=None):
+        self.pasta = pasta
+        self.amostragem = amostragem
+        self.memoria = memoria
+        self.top = top
+        self.paginas_amostradas = 0
+        self._aleatorio = random.Random(semente)
+        self._locais = threading.local()
+        self._perfis = []  # (etapa, cProfile.Profile) de todas as threads
+        self._trava = threading.Lock()
+
+        if self.memoria and not tracemalloc.is_tracing():
+            tracemalloc.start(10)
+
+    def amostrar(self):
+        """Decide se a página atual entra no profiling (fração = amostragem)"""
+        if self.amostragem >= 1.0 or self._aleatorio.random() < self.amostragem:
+            with self._trava:
+                self.paginas_amostradas += 1
+            return True
+        return False
+
+    def _perfil_da_thread(self, etapa):
+        perfis = getattr(self._locais, 'perfis', None)
+        if perfis is None:
+            perfis = self._locais.perfis = {}
+        if etapa not in perfis:
+            perfis[etapa] = cProfile.Profile()
+            with self._trava:
+                self._perfis.append((etapa, perfis[etapa]))
+        return perfis[etapa]
+
+    @contextmanager
+    def etapa(self, nome, ativo=True):
+        """Executa o bloco sob o profiler da etapa (se a página foi amostrada)"""
+        if not ativo:
+            yield
+            return
+
+        perfil = self._perfil_da_thread(nome)
+        try:
+            perfil.enable()
+        except ValueError:
+            # Python 3.12+: só um profiler ativo por vez; esta execução da etapa fica de fora
+            yield
+            return
+        try:
+            yield
+        finally:
+            perfil.disable()
+
+    def estatisticas(self, etapa):
+        """pstats.Stats agregando todas as threads de uma etapa (None se vazia)"""
+        with self._trava:
+            perfis = [perfil for nome, perfil in self._perfis if nome == etapa]
+        estatisticas = None
+        for perfil in perfis:
+            try:
+                if estatisticas is None:
+                    estatisticas = pstats.Stats(perfil)
+                else:
+                    estatisticas.add(perfil)
+            except TypeError:
+                # Profiler criado mas nunca habilitado
+                continue
+        return estatisticas
+
+    def finalizar(self):
+        """Grava <etapa>.prof e resumo.txt (top-N por tempo acumulado) na pasta de perfil"""
+        os.makedirs(self.pasta, exist_ok=True)
+        with self._trava:
+            etapas = list(dict.fromkeys(nome for nome, _ in self._perfis))
+
+        resumo = io.StringIO()
+        resumo.write(f"Páginas amostradas: {self.paginas_amostradas} (amostragem: {self.amostragem:g})\n")
+
+        for etapa in etapas:
+            estatisticas = self.estatisticas(etapa)
+            if estatisticas is None:
+                continue
+            estatisticas.dump_stats(os.path.join(self.pasta, f"{etapa}.prof"))
+
+            resumo.write(f"\n===== {etapa} =====\n")
+            estatisticas.stream = resumo
+            estatisticas.sort_stats('cumulative').print_stats(self.top)
+
+        if self.memoria and tracemalloc.is_tracing():
+            atual, pico = tracemalloc.get_traced_memory()
+            snapshot = tracemalloc.take_snapshot().filter_traces([
+                tracemalloc.Filter(False, tracemalloc.__file__),
+                tracemalloc.Filter(False, cProfile.__file__),
+                tracemalloc.Filter(False, pstats.__file__),
+                tracemalloc.Filter(False, '<frozen importlib._bootstrap>'),
+            ])
+            resumo.write(f"\n===== memória (atual {atual / 1024:.0f} KB, pico {pico / 1024:.0f} KB) =====\n")
+            for estatistica in snapshot.statistics('lineno')[:self.top]:
+                resumo.write(f"{estatistica}\n")
+            tracemalloc.stop()
+
+        caminho = os.path.join(self.pasta, 'resumo.txt')
+        with open(caminho, 'w', encoding='utf-8') as f:
+            f.write(resumo.getvalue())
+        print(f"🔬 Perfil salvo em: {self.pasta}/ (resumo: {caminho})")
+        return caminho
@@ -0,0 +1,296 @@
+#!/usr/bin/env python3
+"""
+Validação de qualidade dos dados (vetorizada)
+Roda sobre as colunas já montadas, antes da gravação: linhas zeradas, energia
+incoerente com os macronutrientes, macros acima da porção, partes maiores que
+o total, outliers por categoria, nomes duplicados e campos não encontrados.
+O relatório é gravado ao lado do arquivo de saída
+"""
+
+import json
+import os
+import sys
+import time
+from array import array
+
+import numpy as np
+
+# Permite rodar tanto como script (python config/x.py) quanto como módulo (config.x)
+if not __package__:
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+ARQUIVO_DADOS = os.path.join('dados', 'produtos_sadia.csv')
+
+# Nutrientes principais (por porção de referência)
+NUTRIENTES = [
+    'CALORIAS (kcal)', 'CARBOIDRATOS (g)', 'PROTEINAS (g)', 'GORDURAS_TOTAIS (g)',
+    'GORDURAS_SATURADAS (g)', 'FIBRAS (g)', 'ACUCARES (g)', 'SODIO (mg)',
+]
+
+# Fatores de conversão em kcal por grama (RDC 429/2020)
+FATORES_ENERGIA = {
+    'CARBOIDRATOS (g)': 4.0, 'PROTEINAS (g)': 4.0, 'GORDURAS_TOTAIS (g)': 9.0, 'FIBRAS (g)': 2.0,
+}
+TOLERANCIA_ENERGIA = 0.2       # fração da energia declarada
+TOLERANCIA_ENERGIA_KCAL = 20.0  # mínimo absoluto (arredondamentos de rótulo)
+
+# (parte, total): a parte nunca pode passar do total
+PARTES = [
+    ('GORDURAS_SATURADAS (g)', 'GORDURAS_TOTAIS (g)'),
+    ('GORDURAS_TRANS (g)', 'GORDURAS_TOTAIS (g)'),
+    ('ACUCARES (g)', 'CARBOIDRATOS (g)'),
+    ('ACUCARES_ADICIONADOS (g)', 'ACUCARES (g)'),
+]
+FOLGA_GRAMAS = 0.5
+
+# Outlier: |z| acima do limite dentro da categoria (só categorias com produtos suficientes)
+LIMITE_Z = 4.0
+MINIMO_CATEGORIA = 10
+
+NOMES_AUSENTES = ['Nome não encontrado', 'Erro ao extrair nome', '']
+CATEGORIAS_AUSENTES = ['Categoria não encontrada', 'Erro ao extrair categoria', '']
+
+VERIFICACOES = (
+    'nutrientes_zerados', 'valores_negativos', 'energia_inconsistente', 'macros_acima_da_porcao',
+    'parte_maior_que_total', 'outlier_categoria', 'nome_duplicado', 'campos_ausentes',
+)
+
+
+def numerica(valores, n):
+    """Coluna como array float64 (array('d') vira uma visão, sem cópia); ausente vira zeros"""
+    if valores is None:
+        return np.zeros(n)
+    if isinstance(valores, array):
+        return np.frombuffer(valores, dtype=np.float64) if len(valores) else np.zeros(0)
+    return np.nan_to_num(np.asarray(valores, dtype=np.float64))
+
+
+def texto(valores, n):
+    """Coluna de texto como array de objetos"""
+    if valores is None:
+        return np.full(n, '', dtype=object)
+    return np.asarray(valores, dtype=object)
+
+
+class RelatorioQualidade:
+    """Máscaras booleanas por verificação (uma posição por produto) e o resumo para o relatório"""
+
+    def __init__(self, nomes, urls, categorias, mascaras, outliers, segundos):
+        self.nomes = nomes
+        self.urls = urls
+        self.categorias = categorias
+        self.mascaras = mascaras
+        self.outliers = outliers  # coluna -> máscara dos outliers daquele nutriente
+        self.segundos = segundos
+
+    def __len__(self):
+        return len(self.urls)
+
+    @property
+    def sinalizados(self):
+        """Máscara dos produtos com pelo menos um problema"""
+        total = np.zeros(len(self), dtype=bool)
+        for mascara in self.mascaras.values():
+            total |= mascara
+        return total
+
+    def contagem(self):
+        return {nome: int(mascara.sum()) for nome, mascara in self.mascaras.items()}
+
+    def resumo(self, exemplos=10):
+        """Dicionário do relatório: contagens, limites usados e alguns exemplos de cada problema"""
+        sinalizados = self.sinalizados
+        return {
+            'gerado_em': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'produtos': len(self),
+            'sinalizados': int(sinalizados.sum()),
+            'tempo_ms': round(self.segundos * 1000, 3),
+            'verificacoes': self.contagem(),
+            'outliers_por_nutriente': {coluna: int(mascara.sum()) for coluna, mascara in self.outliers.items()},
+            'limites': {
+                'tolerancia_energia': TOLERANCIA_ENERGIA, 'tolerancia_energia_kcal': TOLERANCIA_ENERGIA_KCAL,
+                'folga_gramas': FOLGA_GRAMAS, 'limite_z': LIMITE_Z, 'minimo_categoria': MINIMO_CATEGORIA,
+            },
+            'exemplos': {
+                nome: self.urls[np.flatnonzero(mascara)[:exemplos]].tolist()
+                for nome, mascara in self.mascaras.items() if mascara.any()
+            },
+        }
+
+    def problemas(self, posicoes):
+        """Texto dos problemas de cada posição ('energia_inconsistente; outlier_categoria:SODIO (mg)')"""
+        textos = []
+        for i in posicoes:
+            itens = [nome for nome, mascara in self.mascaras.items() if mascara[i] and nome != 'outlier_categoria']
+            itens += [f'outlier_categoria:{coluna}' for coluna, mascara in self.outliers.items() if mascara[i]]
+            textos.append('; '.join(itens))
+        return textos
+
+    def gravar(self, caminho_saida):
+        """Grava <saida>_qualidade.json (resumo) e <saida>_qualidade.csv (produtos sinalizados)"""
+        import csv
+
+        base = os.path.splitext(caminho_saida)[0] + '_qualidade'
+        os.makedirs(os.path.dirname(base) or '.', exist_ok=True)
+
+        temporario = base + '.json.tmp'
+        with open(temporario, 'w', encoding='utf-8') as f:
+            json.dump(self.resumo(), f, indent=2, ensure_ascii=False)
+        os.replace(temporario, base + '.json')
+
+        posicoes = np.flatnonzero(self.sinalizados)
+        temporario = base + '.csv.tmp'
+        with open(temporario, 'w', encoding='utf-8-sig', newline='') as f:
+            escritor = csv.writer(f)
+            escritor.writerow(['URL', 'NOME_PRODUTO', 'CATEGORIA', 'PROBLEMAS'])
+            escritor.writerows(zip(self.urls[posicoes], self.nomes[posicoes], self.categorias[posicoes],
+                                   self.problemas(posicoes)))
+        os.replace(temporario, base + '.csv')
+        return base + '.json'
+
+    def imprimir(self):
+        sinalizados = int(self.sinalizados.sum())
+        print(f"🧪 Qualidade: {sinalizados} de {len(self)} produtos sinalizados ({self.segundos * 1000:.1f} ms)")
+        for nome, quantidade in self.contagem().items():
+            if quantidade:
+                print(f"   • {nome}: {quantidade}")
+
+
+def estatisticas_categoria(inverso, n_categorias, valores, validos):
+    """Média e desvio de cada categoria (só linhas válidas), numa passada com bincount"""
+    pesos = validos.astype(np.float64)
+    contagem = np.bincount(inverso, weights=pesos, minlength=n_categorias)
+    soma = np.bincount(inverso, weights=valores * pesos, minlength=n_categorias)
+    soma_quadrados = np.bincount(inverso, weights=valores * valores * pesos, minlength=n_categorias)
+    com_dados = np.maximum(contagem, 1.0)
+    media = soma / com_dados
+    desvio = np.sqrt(np.maximum(soma_quadrados / com_dados - media * media, 0.0))
+    return contagem, media, desvio
+
+
+def validar(colunas):
+    """
+    Roda todas as verificações sobre as colunas (ColunasProdutos.colunas, DataFrame ou dict)
+
+    Nada é removido: o relatório aponta as linhas suspeitas.
+    """
+    import pandas as pd
+
+    inicio = time.perf_counter()
+    urls = texto(colunas['URL'], 0)
+    n = len(urls)
+    obter = (lambda coluna: colunas[coluna] if coluna in colunas else None)
+    valores = {coluna: numerica(obter(coluna), n) for coluna in
+               set(NUTRIENTES) | {parte for par in PARTES for parte in par} | {'PORCAO (g)'}}
+    nomes = texto(obter('NOME_PRODUTO'), n)
+    categorias = texto(obter('CATEGORIA'), n)
+    matriz = np.column_stack([valores[coluna] for coluna in NUTRIENTES]) if n else np.zeros((0, len(NUTRIENTES)))
+
+    mascaras = {}
+    zerados = ~matriz.any(axis=1)
+    mascaras['nutrientes_zerados'] = zerados
+    mascaras['valores_negativos'] = (matriz < 0).any(axis=1)
+
+    # Energia declarada x estimada pelos macronutrientes
+    calorias = valores['CALORIAS (kcal)']
+    estimada = sum(valores[coluna] * fator for coluna, fator in FATORES_ENERGIA.items())
+    tolerancia = np.maximum(TOLERANCIA_ENERGIA_KCAL, TOLERANCIA_ENERGIA * np.maximum(calorias, estimada))
+    mascaras['energia_inconsistente'] = ~zerados & (np.abs(calorias - estimada) > tolerancia)
+
+    # Gramas de macronutrientes (e sódio) acima da própria porção de referência
+    gramas = sum(valores[coluna] for coluna in FATORES_ENERGIA) + valores['SODIO (mg)'] / 1000.0
+    porcao = valores['PORCAO (g)']
+    mascaras['macros_acima_da_porcao'] = (porcao > 0) & (gramas > porcao + FOLGA_GRAMAS)
+
+    parte_maior = np.zeros(n, dtype=bool)
+    for parte, total in PARTES:
+        parte_maior |= valores[parte] > valores[total] + FOLGA_GRAMAS
+    mascaras['parte_maior_que_total'] = parte_maior
+
+    # Outliers por categoria (linhas zeradas ficam fora da média e do desvio)
+    inverso, unicas = pd.factorize(categorias)
+    outliers = {}
+    validos = ~zerados
+    for j, coluna in enumerate(NUTRIENTES):
+        contagem, media, desvio = estatisticas_categoria(inverso, len(unicas), matriz[:, j], validos)
+        desvio_linha = desvio[inverso]
+        suficiente = (contagem[inverso] >= MINIMO_CATEGORIA) & (desvio_linha > 0) & validos
+        distancia = np.abs(matriz[:, j] - media[inverso])
+        outliers[coluna] = suficiente & (distancia > LIMITE_Z * np.where(suficiente, desvio_linha, 1.0))
+    outlier = np.zeros(n, dtype=bool)
+    for mascara in outliers.values():
+        outlier |= mascara
+    mascaras['outlier_categoria'] = outlier
+
+    # Mesmo nome em URLs diferentes
+    ausente_nome = np.isin(nomes, NOMES_AUSENTES)
+    codigos, _ = pd.factorize(nomes)
+    repeticoes = np.bincount(codigos, minlength=1)[codigos] if n else np.zeros(0, dtype=np.int64)
+    mascaras['nome_duplicado'] = (repeticoes > 1) & ~ausente_nome
+    mascaras['campos_ausentes'] = ausente_nome | np.isin(categorias, CATEGORIAS_AUSENTES)
+
+    return RelatorioQualidade(nomes, urls, categorias, mascaras, outliers, time.perf_counter() - inicio)
+
+
+def carregar_csv(caminho=ARQUIVO_DADOS):
+    """Lê do CSV só as colunas usadas pela validação"""
+    import pandas as pd
+
+    usadas = {'NOME_PRODUTO', 'URL', 'CATEGORIA', 'PORCAO (g)', *NUTRIENTES, *(c for par in PARTES for c in par)}
+    df = pd.read_csv(caminho, usecols=lambda coluna: coluna in usadas, encoding='utf-8-sig',
+                     dtype={'NOME_PRODUTO': object, 'URL': object, 'CATEGORIA': object})
+    return {coluna: df[coluna].fillna('').to_numpy(dtype=object) if df[coluna].dtype == object
+            else df[coluna].to_numpy(dtype=np.float64) for coluna in df.columns}
+
+
+def dados_sinteticos(n_linhas, n_categorias=12, semente=0):
+    """Colunas sintéticas coerentes, com alguns defeitos plantados"""
+    gerador = np.random.default_rng(semente)
+    carboidratos = gerador.uniform(0, 40, n_linhas)
+    proteinas = gerador.uniform(0, 25, n_linhas)
+    gorduras = gerador.uniform(0, 20, n_linhas)
+    fibras = gerador.uniform(0, 3, n_linhas)
+    colunas = {
+        'URL': np.array([f'https://exemplo/produtos/c/p{i}/' for i in range(n_linhas)], dtype=object),
+        'NOME_PRODUTO': np.arange(n_linhas).astype(str).astype(object),
+        'CATEGORIA': np.array([f'Categoria {i}' for i in range(n_categorias)], dtype=object)[
+            gerador.integers(0, n_categorias, n_linhas)],
+        'PORCAO (g)': np.full(n_linhas, 100.0),
+        'CARBOIDRATOS (g)': carboidratos, 'PROTEINAS (g)': proteinas, 'GORDURAS_TOTAIS (g)': gorduras,
+        'FIBRAS (g)': fibras, 'GORDURAS_SATURADAS (g)': gorduras * 0.4, 'ACUCARES (g)': carboidratos * 0.3,
+        'SODIO (mg)': gerador.gamma(2.0, 300.0, n_linhas),
+    }
+    colunas['CALORIAS (kcal)'] = 4 * carboidratos + 4 * proteinas + 9 * gorduras + 2 * fibras
+    defeitos = gerador.choice(n_linhas, size=max(1, n_linhas // 1000), replace=False)
+    for coluna in NUTRIENTES:
+        colunas[coluna][defeitos] = 0.0
+    return colunas
+
+
+def benchmark(n_linhas=1_000_000):
+    """Mede a validação sobre dados sintéticos"""
+    print(f"⏱️  Benchmark da validação com {n_linhas:,} linhas".replace(',', '.'))
+    colunas = dados_sinteticos(n_linhas)
+    import pandas  # noqa: F401 - importa antes de medir para não contar o tempo de import
+
+    relatorio = validar(colunas)
+    relatorio.imprimir()
+    return relatorio.segundos
+
+
+def main():
+    """Função principal"""
+    print("🧪 Validação de Qualidade - Sadia")
+    print("=" * 30)
+
+    if not os.path.exists(ARQUIVO_DADOS):
+        print(f"❌ Arquivo de dados não encontrado: {ARQUIVO_DADOS}")
+        return
+
+    relatorio = validar(carregar_csv())
+    relatorio.imprimir()
+    print(f"💾 Relatório salvo em: {relatorio.gravar(ARQUIVO_DADOS)}")
+
+
+if __name__ == "__main__":
+    main()
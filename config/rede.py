@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+Camada de requisições compartilhada pelo coletor e pelo scraper
+Sessão com pool de conexões, timeouts separados de conexão/leitura,
+requisições "hedged" (uma segunda tentativa quando a primeira demora além do p95)
+e transporte HTTP/2 opcional (httpx) com várias requisições numa só conexão
+"""
+
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+CABECALHOS_PADRAO = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+}
+
+TIMEOUT_CONEXAO = 5.0
+TIMEOUT_LEITURA = 25.0
+
+
+class EstatisticasLatencia:
+    """Latências recentes por host, usadas para calcular o limiar do hedge"""
+
+    def __init__(self, janela=200, minimo_amostras=20):
+        self.janela = janela
+        self.minimo_amostras = minimo_amostras
+        self.hosts = {}
+        self._trava = threading.Lock()
+
+    def registrar(self, host, segundos):
+        """Registra a duração de uma requisição bem-sucedida"""
+        with self._trava:
+            if host not in self.hosts:
+                self.hosts[host] = deque(maxlen=self.janela)
+            self.hosts[host].append(segundos)
+
+    def percentil(self, host, p=95):
+        """Percentil das latências do host (None se ainda há poucas amostras)"""
+        with self._trava:
+            amostras = sorted(self.hosts.get(host, ()))
+        if len(amostras) < self.minimo_amostras:
+            return None
+        posicao = min(len(amostras) - 1, int(round(p / 100 * (len(amostras) - 1))))
+        return amostras[posicao]
+
+    def resumo(self):
+        """p50/p95 e quantidade de amostras de cada host"""
+        with self._trava:
+            hosts = list(self.hosts)
+        return {
+            host: {
+                'amostras': len(self.hosts[host]),
+                'p50': self.percentil(host, 50),
+                'p95': self.percentil(host, 95),
+            }
+            for host in hosts
+        }
+
+
+class ClienteHTTP:
+    """Cliente HTTP com pool de conexões, timeouts (conexão, leitura) e hedge opcional"""
+
+    def __init__(self, headers=None, timeout_conexao=TIMEOUT_CONEXAO, timeout_leitura=TIMEOUT_LEITURA,
+                 hedge=False, max_hedges_simultaneos=2, fracao_max_hedges=0.1, tamanho_pool=10):
+        self.headers = dict(headers or CABECALHOS_PADRAO)
+        self.timeout = (timeout_conexao, timeout_leitura)
+        self.hedge = hedge
+        self.fracao_max_hedges = fracao_max_hedges
+        self.latencias = EstatisticasLatencia()
+
+        self.sessao = self._criar_sessao(tamanho_pool)
+
+        # Limite global de hedges: simultâneos e como fração do total de requisições
+        self._vagas_hedge = threading.BoundedSemaphore(max_hedges_simultaneos)
+        self._trava = threading.Lock()
+        self.requisicoes = 0
+        self.hedges = 0
+        # Ritmo global por host (Crawl-delay do robots.txt), configurado por config.cortesia
+        self.ritmos = {}
+        self._executor = ThreadPoolExecutor(max_workers=tamanho_pool * 2) if hedge else None
+
+    def _criar_sessao(self, tamanho_pool):
+        """Sessão requests (HTTP/1.1) com um pool de até `tamanho_pool` conexões"""
+        sessao = requests.Session()
+        sessao.headers.update(self.headers)
+        adaptador = HTTPAdapter(pool_connections=tamanho_pool, pool_maxsize=tamanho_pool)
+        sessao.mount('https://', adaptador)
+        sessao.mount('http://', adaptador)
+        return sessao
+
+    def _requisitar(self, url):
+        """Uma requisição GET; devolve o HTML e registra a latência do host"""
+        inicio = time.perf_counter()
+        response = self.sessao.get(url, timeout=self.timeout)
+        response.raise_for_status()
+        response.encoding = 'utf-8'
+        html = response.text
+        self.latencias.registrar(urlsplit(url).netloc, time.perf_counter() - inicio)
+        return html
+
+    def _pode_fazer_hedge(self):
+        with self._trava:
+            if self.hedges + 1 > max(1, self.requisicoes * self.fracao_max_hedges):
+                return False
+        return self._vagas_hedge.acquire(blocking=False)
+
+    def obter(self, url):
+        """Busca a URL e devolve o HTML (levanta exceção em caso de erro)"""
+        host = urlsplit(url).netloc
+        ritmo = self.ritmos.get(host)
+        if ritmo:
+            ritmo.aguardar()
+        with self._trava:
+            self.requisicoes += 1
+
+        limiar = self.latencias.percentil(host) if self.hedge else None
+        if limiar is None:
+            return self._requisitar(url)
+
+        principal = self._executor.submit(self._requisitar, url)
+        concluidas, _ = wait([principal], timeout=limiar)
+        if concluidas or not self._pode_fazer_hedge():
+            return principal.result()
+        # A segunda requisição também respeita o Crawl-delay: sem vaga no ritmo, espera só a primeira
+        if ritmo and not ritmo.tentar():
+            self._vagas_hedge.release()
+            return principal.result()
+
+        # A primeira requisição passou do p95: dispara uma segunda e usa a que terminar antes
+        with self._trava:
+            self.hedges += 1
+        reserva = self._executor.submit(self._requisitar, url)
+        reserva.add_done_callback(lambda _: self._vagas_hedge.release())
+
+        pendentes = {principal, reserva}
+        erro = None
+        while pendentes:
+            concluidas, pendentes = wait(pendentes, return_when=FIRST_COMPLETED)
+            for futuro in concluidas:
+                if futuro.exception() is None:
+                    return futuro.result()
+                erro = futuro.exception()
+        raise erro
+
+    def fechar(self):
+        """Fecha a sessão e o executor de hedges"""
+        if self._executor:
+            self._executor.shutdown(wait=False)
+        self.sessao.close()
+
+
+class ClienteHTTP2(ClienteHTTP):
+    """
+    Mesmo cliente sobre HTTP/2 (requer httpx[http2])
+
+    As requisições dos workers são multiplexadas em `conexoes` conexões; o
+    número de streams simultâneos (`max_streams`) é o limite de concorrência.
+    """
+
+    def __init__(self, headers=None, timeout_conexao=TIMEOUT_CONEXAO, timeout_leitura=TIMEOUT_LEITURA,
+                 hedge=False, max_hedges_simultaneos=2, fracao_max_hedges=0.1, tamanho_pool=10,
+                 conexoes=1, max_streams=32, somente_http2=False):
+        self.conexoes = conexoes
+        self.max_streams = max_streams
+        self.somente_http2 = somente_http2
+        self._streams = threading.BoundedSemaphore(max_streams)
+        super().__init__(headers, timeout_conexao, timeout_leitura, hedge,
+                         max_hedges_simultaneos, fracao_max_hedges, tamanho_pool)
+
+    def _criar_sessao(self, tamanho_pool):
+        """Cliente httpx com HTTP/2 e no máximo `conexoes` conexões"""
+        try:
+            import httpx
+            import h2  # noqa: F401  (httpx só negocia HTTP/2 com o pacote h2 instalado)
+        except ImportError:
+            raise ImportError("O transporte HTTP/2 requer httpx com suporte a HTTP/2: pip install 'httpx[http2]'") from None
+
+        conexao, leitura = self.timeout
+        return httpx.Client(
+            http2=True,
+            # Sem HTTP/1.1 o cliente fala HTTP/2 direto (h2c), necessário em servidores locais sem TLS
+            http1=not self.somente_http2,
+            headers=self.headers,
+            timeout=httpx.Timeout(leitura, connect=conexao),
+            limits=httpx.Limits(max_connections=self.conexoes, max_keepalive_connections=self.conexoes),
+        )
+
+    def _requisitar(self, url):
+        """Uma requisição GET num stream HTTP/2; devolve o HTML e registra a latência do host"""
+        with self._streams:
+            inicio = time.perf_counter()
+            response = self.sessao.get(url)
+            response.raise_for_status()
+            html = response.content.decode('utf-8', errors='replace')
+        self.latencias.registrar(urlsplit(url).netloc, time.perf_counter() - inicio)
+        return html
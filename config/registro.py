@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Registro compacto de produto e buffers colunares usados pelos gravadores
+"""
+
+from array import array
+
+# Colunas principais (nome, URL, categoria, porção de referência e os oito nutrientes por 100 g)
+COLUNAS_BASICAS = [
+    'NOME_PRODUTO', 'URL', 'CATEGORIA', 'PORCAO (g)',
+    'CALORIAS (kcal)', 'CARBOIDRATOS (g)', 'PROTEINAS (g)',
+    'GORDURAS_TOTAIS (g)', 'GORDURAS_SATURADAS (g)',
+    'FIBRAS (g)', 'ACUCARES (g)', 'SODIO (mg)'
+]
+
+# Nutrientes da tabela completa: prefixo das colunas e unidade
+NUTRIENTES_TABELA = [
+    ('CALORIAS', 'kcal'), ('CARBOIDRATOS', 'g'), ('ACUCARES', 'g'), ('ACUCARES_ADICIONADOS', 'g'),
+    ('PROTEINAS', 'g'), ('GORDURAS_TOTAIS', 'g'), ('GORDURAS_SATURADAS', 'g'),
+    ('GORDURAS_TRANS', 'g'), ('FIBRAS', 'g'), ('SODIO', 'mg'),
+]
+
+# Restante da tabela: nutrientes extras, porção declarada, valores por porção, %VD e o que não tem coluna própria
+COLUNAS_TABELA = (
+    ['GORDURAS_TRANS (g)', 'ACUCARES_ADICIONADOS (g)', 'PORCAO_DECLARADA (g)', 'DESCRICAO_PORCAO']
+    + [f'{prefixo}_PORCAO ({unidade})' for prefixo, unidade in NUTRIENTES_TABELA]
+    + [f'{prefixo}_VD (%)' for prefixo, _ in NUTRIENTES_TABELA]
+    + ['CABECALHO_TABELA', 'OUTROS_NUTRIENTES']
+)
+
+# Lista de ingredientes e o que foi reconhecido nela (nomes separados por vírgula)
+COLUNAS_INGREDIENTES = ['INGREDIENTES', 'ALERGENICOS', 'PODE_CONTER', 'ADITIVOS']
+
+# Ordem das colunas nos arquivos de saída
+COLUNAS = COLUNAS_BASICAS + COLUNAS_TABELA + COLUNAS_INGREDIENTES
+
+COLUNAS_TEXTO = [
+    'NOME_PRODUTO', 'URL', 'CATEGORIA', 'DESCRICAO_PORCAO', 'CABECALHO_TABELA', 'OUTROS_NUTRIENTES',
+    *COLUNAS_INGREDIENTES,
+]
+COLUNAS_NUMERICAS = [coluna for coluna in COLUNAS if coluna not in COLUNAS_TEXTO]
+
+# Nome do atributo de cada coluna
+ATRIBUTOS = {
+    'NOME_PRODUTO': 'nome_produto',
+    'URL': 'url',
+    'CATEGORIA': 'categoria',
+    'PORCAO (g)': 'porcao',
+    'CALORIAS (kcal)': 'calorias',
+    'CARBOIDRATOS (g)': 'carboidratos',
+    'PROTEINAS (g)': 'proteinas',
+    'GORDURAS_TOTAIS (g)': 'gorduras_totais',
+    'GORDURAS_SATURADAS (g)': 'gorduras_saturadas',
+    'FIBRAS (g)': 'fibras',
+    'ACUCARES (g)': 'acucares',
+    'SODIO (mg)': 'sodio',
+}
+ATRIBUTOS.update({coluna: coluna.split(' (')[0].lower() for coluna in COLUNAS_TABELA})
+ATRIBUTOS.update({coluna: coluna.lower() for coluna in COLUNAS_INGREDIENTES})
+
+
+def valor_coluna(coluna, valor):
+    """Converte o valor para o tipo da coluna (vazio vira 0.0 ou '')"""
+    if coluna in COLUNAS_NUMERICAS:
+        try:
+            return float(valor)
+        except (TypeError, ValueError):
+            return 0.0
+    return valor if valor is not None else ''
+
+
+class ProdutoSadia:
+    """Produto com atributos fixos (__slots__), acessível também pelo nome da coluna"""
+
+    __slots__ = tuple(ATRIBUTOS.values())
+
+    def __init__(self, nome_produto='', url='', categoria=''):
+        for coluna in COLUNAS_TEXTO:
+            setattr(self, ATRIBUTOS[coluna], '')
+        for coluna in COLUNAS_NUMERICAS:
+            setattr(self, ATRIBUTOS[coluna], 0.0)
+        self.nome_produto = nome_produto
+        self.url = url
+        self.categoria = categoria
+
+    def __getitem__(self, coluna):
+        try:
+            return getattr(self, ATRIBUTOS[coluna])
+        except KeyError:
+            raise KeyError(coluna) from None
+
+    def __setitem__(self, coluna, valor):
+        try:
+            setattr(self, ATRIBUTOS[coluna], valor)
+        except KeyError:
+            raise KeyError(coluna) from None
+
+    def get(self, coluna, padrao=None):
+        """Mesmo comportamento de dict.get"""
+        atributo = ATRIBUTOS.get(coluna)
+        return getattr(self, atributo) if atributo else padrao
+
+    def para_dict(self):
+        """Representação em dict (na ordem das colunas de saída)"""
+        return {coluna: getattr(self, atributo) for coluna, atributo in ATRIBUTOS.items()}
+
+    def __eq__(self, outro):
+        if not isinstance(outro, ProdutoSadia):
+            return NotImplemented
+        return all(getattr(self, a) == getattr(outro, a) for a in self.__slots__)
+
+    def __repr__(self):
+        return f"ProdutoSadia({self.nome_produto!r}, {self.url!r})"
+
+
+class ColunasProdutos:
+    """Buffers por coluna: listas para texto e array('d') para valores numéricos"""
+
+    def __init__(self):
+        # Na ordem de COLUNAS (a mesma dos __slots__ de ProdutoSadia)
+        self.colunas = {coluna: [] if coluna in COLUNAS_TEXTO else array('d') for coluna in COLUNAS}
+
+    @classmethod
+    def de_registros(cls, registros):
+        """Cria os buffers a partir de produtos (ProdutoSadia ou dicts)"""
+        if isinstance(registros, cls):
+            return registros
+        buffers = cls()
+        for registro in registros:
+            buffers.adicionar(registro)
+        return buffers
+
+    def adicionar(self, produto):
+        """Acrescenta um produto às colunas (colunas ausentes, como em CSVs antigos, ficam vazias)"""
+        for coluna, valores in self.colunas.items():
+            valores.append(valor_coluna(coluna, produto.get(coluna)))
+
+    def __len__(self):
+        return len(self.colunas['URL'])
+
+    def __iter__(self):
+        """Percorre as linhas como ProdutoSadia"""
+        for linha in zip(*self.colunas.values()):
+            produto = ProdutoSadia.__new__(ProdutoSadia)
+            for atributo, valor in zip(ProdutoSadia.__slots__, linha):
+                setattr(produto, atributo, valor)
+            yield produto
+
+    def linhas(self):
+        """Percorre as linhas como tuplas na ordem de COLUNAS"""
+        return zip(*(self.colunas[coluna] for coluna in COLUNAS))
+
+    def limpar(self):
+        """Esvazia os buffers"""
+        for valores in self.colunas.values():
+            del valores[:]
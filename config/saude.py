@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Monitor de saúde dos seletores e disjuntor (circuit breaker)
+Quando o site muda o HTML, os seletores param de encontrar elementos e a execução
+produziria apenas zeros; o disjuntor interrompe a execução cedo nesses casos
+"""
+
+import threading
+import time
+from collections import deque
+
+class CircuitoAberto(Exception):
+    """Taxa de falhas dos seletores acima do limite"""
+
+    def __init__(self, seletores, expressoes=None):
+        self.seletores = seletores
+        expressoes = expressoes or {}
+        detalhes = ', '.join(
+            f"{nome} ({expressoes.get(nome, '?')}): {taxa:.0%} de falhas" for nome, taxa in seletores.items()
+        )
+        super().__init__(f"Disjuntor aberto - provável mudança de layout: {detalhes}")
+
+
+class MonitorSaude:
+    """
+    Taxa de acerto de cada seletor numa janela deslizante das últimas páginas
+
+    `seletores` (nome -> expressão CSS) vem do perfil do site em uso
+    (PlanosSites.seletores_monitorados) e só serve para os relatórios.
+    """
+
+    def __init__(self, janela=20, limite_falhas=0.8, minimo_amostras=10, acao='abortar', pausa=300.0,
+                 seletores=None):
+        self.janela = janela
+        self.limite_falhas = limite_falhas
+        self.minimo_amostras = minimo_amostras
+        self.acao = acao
+        self.pausa = pausa
+        self.seletores = dict(seletores or {})
+        self.aberto = False
+        self.pausas_feitas = 0
+        self.amostras = {}
+        self._trava = threading.Lock()
+
+    def registrar(self, seletor, encontrado):
+        """Registra se o seletor encontrou o elemento na página atual"""
+        with self._trava:
+            if seletor not in self.amostras:
+                self.amostras[seletor] = deque(maxlen=self.janela)
+            self.amostras[seletor].append(bool(encontrado))
+
+    def taxa_falhas(self, seletor):
+        """Fração de páginas da janela em que o seletor falhou"""
+        amostras = self.amostras.get(seletor)
+        if not amostras:
+            return 0.0
+        return 1.0 - sum(amostras) / len(amostras)
+
+    def seletores_com_falha(self):
+        """Seletores com amostras suficientes e taxa de falhas acima do limite"""
+        with self._trava:
+            return {
+                seletor: self.taxa_falhas(seletor)
+                for seletor, amostras in self.amostras.items()
+                if len(amostras) >= self.minimo_amostras and self.taxa_falhas(seletor) > self.limite_falhas
+            }
+
+    def verificar(self):
+        """
+        Abre o disjuntor se algum seletor passou do limite
+
+        Com acao='pausar', a primeira abertura aguarda `pausa` segundos e
+        recomeça a janela (o site pode estar instável); a segunda aborta.
+        """
+        if self.aberto:
+            raise CircuitoAberto(self.seletores_com_falha(), self.seletores)
+
+        falhando = self.seletores_com_falha()
+        if not falhando:
+            return
+
+        with self._trava:
+            pausar = self.acao == 'pausar' and self.pausas_feitas == 0
+            if pausar:
+                self.pausas_feitas += 1
+                self.amostras.clear()
+            else:
+                self.aberto = True
+
+        if pausar:
+            print(f"⏸️  Seletores falhando ({', '.join(falhando)}), pausando {self.pausa:g} segundos...")
+            time.sleep(self.pausa)
+            return
+
+        raise CircuitoAberto(falhando, self.seletores)
+
+    def reiniciar(self):
+        """Fecha o disjuntor e esvazia as janelas (início de um novo ciclo)"""
+        with self._trava:
+            self.aberto = False
+            self.pausas_feitas = 0
+            self.amostras.clear()
+
+    def relatorio(self):
+        """Taxa de falhas atual de cada seletor"""
+        with self._trava:
+            return {
+                seletor: {'expressao': self.seletores.get(seletor), 'amostras': len(amostras),
+                          'taxa_falhas': round(self.taxa_falhas(seletor), 3)}
+                for seletor, amostras in self.amostras.items()
+            }
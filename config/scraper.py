@@ -4,144 +4,168 @@ Scraper para extrair dados nutricionais dos produtos da Sadia
 Compatível com Python 3.13+
 """
 
-import requests
-import pandas as pd
 from bs4 import BeautifulSoup
+import asyncio
+import csv
 import os
+import sys
 import time
-import re
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from urllib.parse import urlsplit
+from contextlib import nullcontext
 from dotenv import load_dotenv
 import json
 
+# Permite rodar tanto como script (python config/x.py) quanto como módulo (config.x)
+if not __package__:
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.estatisticas import ResumoDados
+from config.registro import COLUNAS, ColunasProdutos, ProdutoSadia
+from config.tabela import preencher_tabela
+from config.mudancas import calcular_mudancas, gravar_feed
+from config.canonico import MapaCanonico, url_canonica_da_pagina
+from config.agendador import EstadoURLs, Orcamento, assinatura_produto
+from config.saude import CircuitoAberto, MonitorSaude
+from config.rede import ClienteHTTP
+from config.cortesia import PoliticaRobots
+from config.sites import PlanosSites
+from config.leitura import ler_pagina
+from config.ingredientes import preencher_ingredientes
+
 # Carrega as variáveis de ambiente
 load_dotenv()
 
+# Lista usada quando dados/urls_produtos.json não existe ou está corrompido
+URLS_PADRAO = [
+    'https://www.sadia.com.br/produtos/aves/linha-dia-a-dia/frango-inteiro-sem-miudos-4/',
+    'https://www.sadia.com.br/produtos/nba/nba/empanadissimo-100-peito-de-frango-leve-picancia/',
+    'https://www.sadia.com.br/produtos/frios/frios-dia-a-dia/presunto-cozido-fatiado-180g/',
+    'https://www.sadia.com.br/produtos/frios/frios-dia-a-dia/mignoneto/',
+    'https://www.sadia.com.br/produtos/lanches/batatas-fritas/batata-palito-pre-frita-105kg/',
+    'https://www.sadia.com.br/produtos/lanches/batatas-fritas/batata-palito-pre-frita-2kg/',
+    'https://www.sadia.com.br/produtos/linguicas/linguica-defumada/linguica-fininha-25kg/'
+]
+
+FORMATOS_SAIDA = ('csv', 'json', 'parquet')
+
+# arvore: BeautifulSoup completo; continuo: um passe pelos eventos do parser, sem árvore
+EXTRATORES = ('arvore', 'continuo')
+
+def carregar_urls(json_file="dados/urls_produtos.json"):
+    """Carrega as URLs coletadas ou retorna a lista padrão"""
+    if os.path.exists(json_file):
+        try:
+            with open(json_file, 'r', encoding='utf-8') as f:
+                produtos_url = json.load(f)
+            print(f"📋 Carregadas {len(produtos_url)} URLs do arquivo JSON")
+            return produtos_url
+        except Exception as e:
+            print(f"❌ Erro ao carregar JSON: {e}")
+            print("📋 Usando lista padrão de URLs")
+            return list(URLS_PADRAO)
+    
+    print("📋 Arquivo JSON não encontrado, usando lista padrão")
+    return list(URLS_PADRAO)
+
+# Delay entre requisições de cada worker quando o robots.txt não define um Crawl-delay
+DELAY_PADRAO = 2.0
+
 class ScraperSadia:
-    def __init__(self):
+    def __init__(self, max_workers=1, delay=None, gerar_mudancas=True, monitor=None, cliente=None, perfil=None,
+                 cortesia=None, sites=None, extrator='arvore', validacao=True):
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
         }
-        self.dados_produtos = []
+        self.dados_produtos = ColunasProdutos()
+        self.max_workers = max(1, int(max_workers))
+        # delay=None: segue o Crawl-delay do robots.txt (ou DELAY_PADRAO se o site não define)
+        self.delay_automatico = delay is None
+        self.delay = DELAY_PADRAO if delay is None else delay
+        self.cortesia = cortesia
+        self.gerar_mudancas = gerar_mudancas
+        self.estado = EstadoURLs.carregar()
+        self.monitor = monitor or MonitorSaude()
+        self.cliente = cliente or ClienteHTTP(self.headers, tamanho_pool=max(10, self.max_workers))
+        self.perfil = perfil
+        # Perfis dos sites compilados uma vez; cada URL usa o plano do seu host
+        self.sites = sites if isinstance(sites, PlanosSites) else PlanosSites(sites)
+        self.canonicas = MapaCanonico.carregar(hosts_equivalentes=self.sites.hosts_equivalentes)
+        # O relatório do monitor mostra os seletores do perfil em uso
+        self.monitor.seletores = self.sites.seletores_monitorados()
+        if extrator not in EXTRATORES:
+            raise ValueError(f"Extrator inválido: {extrator} (use {', '.join(EXTRATORES)})")
+        self.extrator = extrator
+        # Relatório de qualidade gravado ao lado da saída (<saida>_qualidade.json/.csv)
+        self.validacao = validacao
+        
+        # Progresso da execução atual (lido pelo endpoint de status do modo serviço)
+        self.fila = 0
+        self.paginas_processadas = 0
+        
+        # Produtos do ciclo anterior em memória (modo serviço): evita reler o CSV
+        self.produtos_anteriores = None
+        
+        # Armazém de páginas usado pela etapa de download do grafo (config/etapas.py)
+        self.paginas = None
         
     def extrair_html(self, url):
         """Extrai o HTML de uma URL"""
         try:
             print(f"🌐 Fazendo requisição para: {url}")
-            response = requests.get(url, headers=self.headers, timeout=30)
-            response.raise_for_status()
-            response.encoding = 'utf-8'
+            html = self.cliente.obter(url)
             
-            print(f"✅ HTML extraído com sucesso! Tamanho: {len(response.text)} caracteres")
-            return response.text
+            print(f"✅ HTML extraído com sucesso! Tamanho: {len(html)} caracteres")
+            return html
             
         except Exception as e:
             print(f"❌ Erro ao extrair HTML: {e}")
             return None
     
-    def extrair_nome_produto(self, soup):
+    def extrair_nome_produto(self, soup, plano=None):
         """Extrai o nome do produto"""
         try:
-            # Procura pelo título do produto
-            titulo = soup.find('h1', class_='title-product')
-            if titulo:
-                nome = titulo.get_text(strip=True)
-                # Capitaliza a primeira letra e adiciona " - Sadia"
-                nome = nome[0].upper() + nome[1:] + " - Sadia"
-                return nome
-            return "Nome não encontrado"
+            # Título do produto com a marca do site (ex.: "... - Sadia")
+            return (plano or self.sites.padrao).campo('NOME_PRODUTO', soup, self.monitor.registrar)
         except Exception as e:
             print(f"❌ Erro ao extrair nome: {e}")
             return "Erro ao extrair nome"
     
-    def extrair_categoria(self, soup):
+    def extrair_categoria(self, soup, plano=None):
         """Extrai a categoria do produto"""
         try:
-            # Procura por breadcrumbs ou informações de categoria
-            breadcrumbs = soup.find('nav', class_='breadcrumb')
-            if breadcrumbs:
-                links = breadcrumbs.find_all('a')
-                if len(links) > 1:
-                    return links[1].get_text(strip=True)
-            
-            # Tenta encontrar na URL
-            url = soup.find('meta', property='og:url')
-            if url:
-                url_content = url.get('content', '')
-                if '/produtos/' in url_content:
-                    partes = url_content.split('/produtos/')
-                    if len(partes) > 1:
-                        categoria = partes[1].split('/')[0]
-                        return categoria.replace('-', ' ').title()
-            
-            return "Categoria não encontrada"
+            # Breadcrumb e, se não houver, a categoria no og:url
+            return (plano or self.sites.padrao).campo('CATEGORIA', soup, self.monitor.registrar)
         except Exception as e:
             print(f"❌ Erro ao extrair categoria: {e}")
             return "Erro ao extrair categoria"
     
-    def extrair_dados_nutricionais(self, soup):
-        """Extrai os dados nutricionais da tabela"""
-        dados = {
-            'PORCAO (g)': 0.0,
-            'CALORIAS (kcal)': 0.0,
-            'CARBOIDRATOS (g)': 0.0,
-            'PROTEINAS (g)': 0.0,
-            'GORDURAS_TOTAIS (g)': 0.0,
-            'GORDURAS_SATURADAS (g)': 0.0,
-            'FIBRAS (g)': 0.0,
-            'ACUCARES (g)': 0.0,
-            'SODIO (mg)': 0.0
-        }
+    def extrair_ingredientes(self, soup, plano=None):
+        """Extrai o texto de ingredientes e alergênicos ('' se o site não tem esse campo)"""
+        plano = plano or self.sites.padrao
+        if 'INGREDIENTES' not in plano.campos:
+            return ''
+        try:
+            return plano.campo('INGREDIENTES', soup, self.monitor.registrar)
+        except Exception as e:
+            print(f"❌ Erro ao extrair ingredientes: {e}")
+            return ''
+    
+    def extrair_dados_nutricionais(self, soup, plano=None):
+        """Extrai a tabela nutricional completa (as colunas principais são derivadas dela)"""
+        # O próprio registro do produto é preenchido (nutrientes começam em 0.0)
+        dados = ProdutoSadia()
+        plano = plano or self.sites.padrao
         
         try:
-            # Procura pela tabela nutricional
-            tabela_nutricional = soup.find('div', class_='box-nutritional-table')
-            if not tabela_nutricional:
+            # Uma passada pelas linhas: cabeçalho, todas as colunas e descrição da porção
+            linhas = plano.linhas_tabela(soup, self.monitor.registrar)
+            if linhas is None:
                 print("⚠️ Tabela nutricional não encontrada")
                 return dados
-            
-            # Procura pela tabela dentro da div
-            tabela = tabela_nutricional.find('table')
-            if not tabela:
-                print("⚠️ Tabela não encontrada dentro da div nutricional")
-                return dados
-            
-            # Extrai as linhas da tabela
-            linhas = tabela.find_all('tr')
-            
-            for linha in linhas:
-                celulas = linha.find_all(['td', 'th'])
-                if len(celulas) >= 2:
-                    nutriente = celulas[0].get_text(strip=True).lower()
-                    valor = celulas[1].get_text(strip=True)  # Sempre pega a segunda coluna
-                    # Corrige o valor: remove pontos (milhar), troca vírgula por ponto (decimal)
-                    valor_corrigido = valor.replace('.', '').replace(',', '.')
-                    # Pega apenas o primeiro valor se houver divisores
-                    valor_primeiro = valor_corrigido.split('=')[0].split('\\')[0].split('/')[0].strip()
-                    try:
-                        valor_final = float(valor_primeiro)
-                    except ValueError:
-                        valor_final = 0.0
-                    
-                    # Mapeia os nutrientes (busca apenas a palavra principal, ignorando parênteses)
-                    if 'valor energético' in nutriente or 'calorias' in nutriente:
-                        dados['CALORIAS (kcal)'] = valor_final
-                    elif 'carboidratos' in nutriente:
-                        dados['CARBOIDRATOS (g)'] = valor_final
-                    elif 'proteínas' in nutriente or 'proteínas (g)' in nutriente:
-                        dados['PROTEINAS (g)'] = valor_final
-                    elif 'gorduras totais' in nutriente:
-                        dados['GORDURAS_TOTAIS (g)'] = valor_final
-                    elif 'gorduras saturadas' in nutriente:
-                        dados['GORDURAS_SATURADAS (g)'] = valor_final
-                    elif 'fibra alimentar' in nutriente or 'fibra' in nutriente:
-                        dados['FIBRAS (g)'] = valor_final
-                    elif 'açúcares' in nutriente or 'açúcares totais' in nutriente:
-                        dados['ACUCARES (g)'] = valor_final
-                    elif 'sódio' in nutriente:
-                        dados['SODIO (mg)'] = valor_final
-            
-            # Define a porção como 100g (padrão)
-            dados['PORCAO (g)'] = 100
+            preencher_tabela(dados, linhas, plano.converter_numero)
             
             print("✅ Dados nutricionais extraídos com sucesso")
             return dados
@@ -150,32 +174,48 @@ class ScraperSadia:
             print(f"❌ Erro ao extrair dados nutricionais: {e}")
             return dados
     
+    def _etapa(self, nome, ativo=True):
+        """Bloco medido pelo profiler (sem custo quando o profiling está desligado)"""
+        if self.perfil is None or not ativo:
+            return nullcontext()
+        return self.perfil.etapa(nome)
+    
     def processar_produto(self, url):
         """Processa um produto individual"""
         print(f"\n🔄 Processando produto: {url}")
         
+        amostrada = self.perfil is not None and self.perfil.amostrar()
+        
         # Extrai o HTML
-        html = self.extrair_html(url)
+        with self._etapa('download', amostrada):
+            html = self.extrair_html(url)
         if not html:
             return None
+        return self.extrair_pagina(url, html, amostrada)
+    
+    def extrair_pagina(self, url, html, amostrada=False):
+        """Extrai o produto do HTML já baixado (da rede ou do armazém de páginas)"""
+        # Parse do HTML (a leitura contínua guarda só os trechos que o plano do site usa)
+        plano = self.sites.para(url)
+        continuo = self.extrator == 'continuo' and plano.leitura_continua
+        with self._etapa('parse', amostrada):
+            pagina = ler_pagina(html, plano) if continuo else BeautifulSoup(html, 'html.parser')
+        del html
         
-        # Parse do HTML
-        soup = BeautifulSoup(html, 'html.parser')
-        
-        # Extrai os dados
-        nome = self.extrair_nome_produto(soup)
-        categoria = self.extrair_categoria(soup)
-        dados_nutricionais = self.extrair_dados_nutricionais(soup)
+        # Extrai os dados direto no registro do produto, com o plano do site da URL
+        with self._etapa('extracao', amostrada):
+            produto = self.extrair_dados_nutricionais(pagina, plano)
+            produto.nome_produto = self.extrair_nome_produto(pagina, plano)
+            produto.url = self.canonicas.aprender(url, url_canonica_da_pagina(pagina))
+            produto.categoria = self.extrair_categoria(pagina, plano)
+            # Alergênicos e aditivos reconhecidos numa única passada pelo texto
+            preencher_ingredientes(produto, self.extrair_ingredientes(pagina, plano))
         
-        # Monta o dicionário do produto
-        produto = {
-            'NOME_PRODUTO': nome,
-            'URL': url,
-            'CATEGORIA': categoria,
-            **dados_nutricionais
-        }
+        # O registro só guarda texto e números; a árvore é liberada já aqui
+        if not continuo:
+            pagina.decompose()
         
-        print(f"✅ Produto processado: {nome}")
+        print(f"✅ Produto processado: {produto.nome_produto}")
         return produto
     
     def salvar_csv(self, dados, nome_arquivo=None):
@@ -183,50 +223,401 @@ class ScraperSadia:
         if not nome_arquivo:
             nome_arquivo = "produtos_sadia.csv"
         
-        # Cria o DataFrame
-        df = pd.DataFrame(dados)
+        # Pandas só é carregado quando há algo para gravar
+        import pandas as pd
         
-        # Define a ordem das colunas
-        colunas = [
-            'NOME_PRODUTO', 'URL', 'CATEGORIA', 'PORCAO (g)', 
-            'CALORIAS (kcal)', 'CARBOIDRATOS (g)', 'PROTEINAS (g)', 
-            'GORDURAS_TOTAIS (g)', 'GORDURAS_SATURADAS (g)', 
-            'FIBRAS (g)', 'ACUCARES (g)', 'SODIO (mg)'
-        ]
-        
-        # Reorganiza as colunas
-        df = df[colunas]
+        # O DataFrame é montado direto dos buffers colunares
+        dados = ColunasProdutos.de_registros(dados)
+        df = pd.DataFrame(dados.colunas, columns=COLUNAS)
         
         # Salva o arquivo
         caminho_arquivo = os.path.join('dados', nome_arquivo)
         os.makedirs('dados', exist_ok=True)
         
-        df.to_csv(caminho_arquivo, index=False, encoding='utf-8-sig')
+        # Grava num temporário e troca de uma vez: quem lê o CSV nunca vê um arquivo pela metade
+        temporario = caminho_arquivo + '.tmp'
+        df.to_csv(temporario, index=False, encoding='utf-8-sig')
+        os.replace(temporario, caminho_arquivo)
         print(f"💾 CSV salvo em: {caminho_arquivo}")
+        self.atualizar_resumo(dados, caminho_arquivo)
+        return caminho_arquivo
+    
+    def salvar_json(self, dados, nome_arquivo=None):
+        """Salva os dados em um arquivo JSON (lista de produtos)"""
+        if not nome_arquivo:
+            nome_arquivo = "produtos_sadia.json"
+        
+        caminho_arquivo = os.path.join('dados', nome_arquivo)
+        os.makedirs('dados', exist_ok=True)
+        
+        # Grava linha a linha a partir das colunas, sem montar a lista de dicts
+        dados = ColunasProdutos.de_registros(dados)
+        with open(caminho_arquivo, 'w', encoding='utf-8') as f:
+            f.write('[')
+            for i, linha in enumerate(dados.linhas()):
+                f.write(',\n  ' if i else '\n  ')
+                f.write(json.dumps(dict(zip(COLUNAS, linha)), ensure_ascii=False))
+            f.write('\n]\n' if len(dados) else ']\n')
+        
+        print(f"💾 JSON salvo em: {caminho_arquivo}")
+        self.atualizar_resumo(dados, caminho_arquivo)
+        return caminho_arquivo
+    
+    def salvar_parquet(self, dados, nome_arquivo=None):
+        """Salva os dados em um arquivo Parquet (requer pyarrow)"""
+        if not nome_arquivo:
+            nome_arquivo = "produtos_sadia.parquet"
+        
+        import pandas as pd
+        
+        dados = ColunasProdutos.de_registros(dados)
+        df = pd.DataFrame(dados.colunas, columns=COLUNAS)
+        
+        caminho_arquivo = os.path.join('dados', nome_arquivo)
+        os.makedirs('dados', exist_ok=True)
+        
+        df.to_parquet(caminho_arquivo, index=False)
+        print(f"💾 Parquet salvo em: {caminho_arquivo}")
+        self.atualizar_resumo(dados, caminho_arquivo)
         return caminho_arquivo
     
-    def processar_lista_urls(self, urls):
-        """Processa uma lista de URLs"""
-        print(f"🚀 Iniciando processamento de {len(urls)} produtos")
+    def gerar_feed_mudancas(self, dados, caminho_anterior):
+        """Grava o JSONL de produtos adicionados/removidos/modificados desde a última execução"""
+        try:
+            caminho, contagem = gravar_feed(calcular_mudancas(caminho_anterior, dados))
+        except (OSError, ValueError, KeyError, csv.Error) as e:
+            # O feed é opcional: uma saída anterior ilegível não impede a gravação dos produtos
+            print(f"⚠️ Não foi possível gerar o feed de mudanças: {e}")
+            return None
+        
+        print(f"🔁 Mudanças: {contagem['adicionado']} adicionados, "
+              f"{contagem['removido']} removidos, {contagem['modificado']} modificados")
+        print(f"💾 Feed de mudanças salvo em: {caminho}")
+        return caminho
+    
+    def atualizar_resumo(self, dados, caminho_arquivo):
+        """Atualiza o resumo pré-calculado (dados/resumo_dados.json) com as linhas gravadas"""
+        try:
+            resumo = ResumoDados.carregar()
+            resumo.registrar_colunas(ColunasProdutos.de_registros(dados).colunas)
+            resumo.finalizar_produtos(caminho_arquivo)
+            resumo.salvar()
+        except OSError as e:
+            print(f"⚠️ Não foi possível atualizar o resumo: {e}")
+    
+    def salvar_relatorio_qualidade(self, relatorio, caminho_arquivo):
+        """Grava o relatório de qualidade ao lado do arquivo de saída"""
+        try:
+            caminho = relatorio.gravar(caminho_arquivo)
+        except OSError as e:
+            print(f"⚠️ Não foi possível gravar o relatório de qualidade: {e}")
+            return None
+        print(f"🧪 Relatório de qualidade salvo em: {caminho}")
+        return caminho
+    
+    def salvar_dados(self, dados, formato='csv', nome_arquivo=None):
+        """Salva os dados no formato escolhido (csv, json ou parquet)"""
+        if formato not in FORMATOS_SAIDA:
+            raise ValueError(f"Formato de saída inválido: {formato} (use {', '.join(FORMATOS_SAIDA)})")
+        
+        # O feed precisa da versão anterior, então é gerado antes de sobrescrevê-la (em qualquer formato)
+        dados = ColunasProdutos.de_registros(dados)
+        if self.gerar_mudancas:
+            caminho_anterior = os.path.join('dados', nome_arquivo or f"produtos_sadia.{formato}")
+            self.gerar_feed_mudancas(dados, caminho_anterior)
+        
+        if formato == 'csv':
+            return self.salvar_csv(dados, nome_arquivo)
+        if formato == 'json':
+            return self.salvar_json(dados, nome_arquivo)
+        return self.salvar_parquet(dados, nome_arquivo)
+    
+    def _processar_no_orcamento(self, url, orcamento):
+        """Processa um produto se ainda houver orçamento; retorna (tentou, produto)"""
+        if self.monitor.aberto or not orcamento.reservar():
+            return False, None
+        
+        produto = self.processar_produto(url)
+        self.monitor.verificar()
+        if produto:
+            # A chave é a URL canônica final, a mesma que deduplicar_urls produz nas próximas execuções
+            self.estado.registrar_sucesso(produto.url, assinatura_produto(produto, COLUNAS[:1] + COLUNAS[2:]))
+        else:
+            self.estado.registrar_falha(url)
+        return True, produto
+    
+    def _baixar_no_orcamento(self, url, orcamento):
+        """Baixa a página para o armazém se ainda houver orçamento; retorna (tentou, hash do conteúdo)"""
+        if not orcamento.reservar():
+            return False, None
+        
+        html = self.extrair_html(url)
+        if not html:
+            self.estado.registrar_falha(url)
+            return True, None
+        return True, self.paginas.guardar(url, html)
+    
+    def _processar_com_delay(self, url, orcamento, tarefa=None):
+        """Processa um produto e aguarda o delay (usado pelos workers)"""
+        tentou, resultado = (tarefa or self._processar_no_orcamento)(url, orcamento)
+        if tentou and self.delay:
+            time.sleep(self.delay)
+        return tentou, resultado
+    
+    def manter_dados_anteriores(self, urls, caminho_anterior=os.path.join('dados', 'produtos_sadia.csv')):
+        """Copia da saída anterior os produtos que não foram atualizados nesta execução"""
+        if not urls:
+            return 0
+        
+        pendentes = set(urls) - set(self.dados_produtos.colunas['URL'])
+        mantidos = 0
+        if self.produtos_anteriores:
+            for produto in self.produtos_anteriores:
+                if produto.url in pendentes:
+                    self.dados_produtos.adicionar(produto)
+                    pendentes.discard(produto.url)
+                    mantidos += 1
+        elif os.path.exists(caminho_anterior):
+            with open(caminho_anterior, 'r', encoding='utf-8-sig', newline='') as f:
+                for linha in csv.DictReader(f):
+                    if linha.get('URL') in pendentes:
+                        self.dados_produtos.adicionar(linha)
+                        pendentes.discard(linha['URL'])
+                        mantidos += 1
+        else:
+            return 0
+        
+        print(f"📎 {mantidos} produtos mantidos da execução anterior")
+        return mantidos
+    
+    def deduplicar_urls(self, urls):
+        """Resolve cada URL para a forma canônica e remove repetições (mantém a ordem)"""
+        unicas = list(dict.fromkeys(self.canonicas.resolver(url) for url in urls))
+        if len(unicas) < len(urls):
+            print(f"🔗 {len(urls) - len(unicas)} URLs duplicadas ignoradas")
+        return unicas
+    
+    def _adicionar_produto(self, produto, urls_vistas):
+        """Guarda o produto, ignorando URLs canônicas já extraídas nesta execução"""
+        if produto.url in urls_vistas:
+            print(f"🔗 Produto repetido ignorado: {produto.url}")
+            return
+        urls_vistas.add(produto.url)
+        self.dados_produtos.adicionar(produto)
+    
+    def preparar_fila(self, urls):
+        """Deduplica, remove o que o robots.txt proíbe e ordena da mais desatualizada para a mais recente"""
+        urls = self.deduplicar_urls(urls)
+        if self.cortesia and urls:
+            # Com Crawl-delay o ritmo é global (no cliente, por host) e o delay por worker deixa de ser necessário
+            primeiras = {urlsplit(url).netloc: url for url in reversed(urls)}
+            intervalos = [self.cortesia.aplicar(url) for url in primeiras.values()]
+            if self.delay_automatico:
+                self.delay = 0.0 if all(intervalos) else DELAY_PADRAO
+            urls = self.cortesia.filtrar(urls)
+        return self.estado.ordenar(urls)
+    
+    def _resultados(self, urls, orcamento, tarefa=None):
+        """
+        Gera (url, tentou, produto) na ordem das URLs, conforme cada página termina
+
+        Com workers, no máximo 2 × max_workers páginas ficam em andamento, então
+        um consumidor lento não acumula registros prontos na memória. `tarefa`
+        troca o processamento de cada URL (padrão: baixar e extrair o produto).
+        """
+        tarefa = tarefa or self._processar_no_orcamento
+        if self.max_workers > 1:
+            # Cada worker respeita o delay entre as suas próprias requisições
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                restantes = iter(urls)
+                pendentes = deque(
+                    (url, executor.submit(self._processar_com_delay, url, orcamento, tarefa))
+                    for url in islice(restantes, self.max_workers * 2)
+                )
+                while pendentes:
+                    url, futuro = pendentes.popleft()
+                    tentou, produto = futuro.result()
+                    proxima = next(restantes, None)
+                    if proxima is not None:
+                        pendentes.append((proxima, executor.submit(self._processar_com_delay, proxima, orcamento, tarefa)))
+                    yield url, tentou, produto
+            return
         
         for i, url in enumerate(urls, 1):
+            if orcamento.esgotado():
+                return
             print(f"\n📦 Produto {i}/{len(urls)}")
             
-            produto = self.processar_produto(url)
-            if produto:
-                self.dados_produtos.append(produto)
+            tentou, produto = tarefa(url, orcamento)
+            if not tentou:
+                return
+            yield url, tentou, produto
             
             # Delay entre requisições para não sobrecarregar o servidor
-            if i < len(urls):
-                print("⏳ Aguardando 2 segundos...")
-                time.sleep(2)
+            if i < len(urls) and self.delay and not orcamento.esgotado():
+                print(f"⏳ Aguardando {self.delay:g} segundos...")
+                time.sleep(self.delay)
+    
+    def iter_produtos(self, urls, max_duracao=None, max_paginas=None):
+        """
+        Gera cada ProdutoSadia assim que é extraído, sem acumular a execução na memória
+
+        Segue a mesma ordem, orçamento e disjuntor de processar_lista_urls
+        (CircuitoAberto chega ao consumidor). O estado das URLs e as URLs
+        canônicas são salvos quando o gerador termina ou é fechado.
+        """
+        urls = self.preparar_fila(urls)
+        orcamento = Orcamento(max_duracao, max_paginas)
+        urls_vistas = set()
+        try:
+            for _, _, produto in self._resultados(urls, orcamento):
+                if not produto:
+                    continue
+                if produto.url in urls_vistas:
+                    print(f"🔗 Produto repetido ignorado: {produto.url}")
+                    continue
+                urls_vistas.add(produto.url)
+                yield produto
+        finally:
+            self.estado.salvar()
+            self.canonicas.salvar()
+    
+    async def aiter_produtos(self, urls, max_duracao=None, max_paginas=None):
+        """Versão assíncrona de iter_produtos: cada página é buscada fora do event loop"""
+        loop = asyncio.get_running_loop()
+        produtos = self.iter_produtos(urls, max_duracao, max_paginas)
+        fim = object()
+        try:
+            while True:
+                produto = await loop.run_in_executor(None, next, produtos, fim)
+                if produto is fim:
+                    return
+                yield produto
+        finally:
+            await loop.run_in_executor(None, produtos.close)
+    
+    def baixar_paginas(self, urls, paginas, max_duracao=None, max_paginas=None):
+        """
+        Só baixa as páginas para o armazém, sem extrair (etapa de download do grafo)
+
+        Páginas que falharem ou ficarem fora do orçamento mantêm a cópia anterior.
+        Retorna quantas URLs ficaram sem tentativa.
+        """
+        self.paginas = paginas
+        urls = self.preparar_fila(urls)
+        orcamento = Orcamento(max_duracao, max_paginas)
+        tentadas = set()
+        baixadas = 0
+        print(f"🚀 Baixando {len(urls)} páginas de produtos (orçamento: {orcamento.descricao()})")
+        if self.max_workers > 1:
+            print(f"⚙️  Usando {self.max_workers} workers em paralelo")
+        
+        for url, tentou, chave in self._resultados(urls, orcamento, self._baixar_no_orcamento):
+            if tentou:
+                tentadas.add(url)
+            if chave:
+                baixadas += 1
+        
+        paginas.manter(urls)
+        paginas.salvar()
+        self.estado.salvar()
+        nao_tentadas = len(urls) - len(tentadas)
+        print(f"\n✅ {baixadas} páginas baixadas, {len(paginas)} no armazém")
+        if nao_tentadas:
+            print(f"⏱️  Orçamento esgotado: {nao_tentadas} páginas ficam com a cópia anterior")
+        return nao_tentadas
+    
+    def extrair_paginas(self, paginas):
+        """
+        Extrai os produtos das páginas guardadas no armazém, sem rede
+
+        Retorna os buffers dos produtos (None se o disjuntor abrir).
+        """
+        self.dados_produtos.limpar()
+        urls_vistas = set()
+        print(f"🚀 Extraindo {len(paginas)} páginas guardadas")
+        try:
+            for url in paginas:
+                html = paginas.ler(url)
+                if html is None:
+                    continue
+                print(f"\n🔄 Extraindo página guardada: {url}")
+                amostrada = self.perfil is not None and self.perfil.amostrar()
+                produto = self.extrair_pagina(url, html, amostrada)
+                self.monitor.verificar()
+                # A página foi obtida no download, não agora: a prioridade das URLs segue essa data
+                self.estado.registrar_sucesso(produto.url, assinatura_produto(produto, COLUNAS[:1] + COLUNAS[2:]),
+                                              agora=paginas.obtidas.get(url))
+                self._adicionar_produto(produto, urls_vistas)
+        except CircuitoAberto as e:
+            print(f"\n🛑 {e}")
+            print(f"🩺 Saúde dos seletores: {self.monitor.relatorio()}")
+            self.estado.salvar()
+            return None
+        
+        self.estado.salvar()
+        self.canonicas.salvar()
+        print(f"\n✅ Extração concluída! {len(self.dados_produtos)} produtos extraídos")
+        return self.dados_produtos
+    
+    def processar_lista_urls(self, urls, formato='csv', max_duracao=None, max_paginas=None):
+        """Processa uma lista de URLs, das mais desatualizadas para as mais recentes"""
+        urls = self.preparar_fila(urls)
+        urls_vistas = set(self.dados_produtos.colunas['URL'])
+        orcamento = Orcamento(max_duracao, max_paginas)
+        tentadas = set()
+        self.fila = len(urls)
+        self.paginas_processadas = 0
+        print(f"🚀 Iniciando processamento de {len(urls)} produtos (orçamento: {orcamento.descricao()})")
+        if self.max_workers > 1:
+            print(f"⚙️  Usando {self.max_workers} workers em paralelo")
+        
+        try:
+            for url, tentou, produto in self._resultados(urls, orcamento):
+                self.fila -= 1
+                if tentou:
+                    tentadas.add(url)
+                    self.paginas_processadas += 1
+                if produto:
+                    self._adicionar_produto(produto, urls_vistas)
+        
+        except CircuitoAberto as e:
+            # Layout mudou: a saída anterior é preservada em vez de virar uma tabela de zeros
+            print(f"\n🛑 {e}")
+            print(f"🩺 Saúde dos seletores: {self.monitor.relatorio()}")
+            self.estado.salvar()
+            return None
+        finally:
+            self.fila = 0
+        
+        # Orçamento esgotado: o restante continua com os dados da execução anterior
+        nao_tentadas = [url for url in urls if url not in tentadas]
+        if nao_tentadas:
+            print(f"\n⏱️  Orçamento esgotado: {len(nao_tentadas)} produtos ficam para a próxima execução")
+            self.manter_dados_anteriores(nao_tentadas)
+        
+        self.estado.salvar()
+        
+        # Guarda as URLs canônicas aprendidas para as próximas execuções
+        self.canonicas.salvar()
         
         print(f"\n✅ Processamento concluído! {len(self.dados_produtos)} produtos extraídos")
         
         # Salva os dados
         if self.dados_produtos:
-            arquivo_salvo = self.salvar_csv(self.dados_produtos)
+            relatorio = None
+            if self.validacao:
+                # NumPy só é carregado quando a validação roda
+                from config.qualidade import validar
+
+                with self._etapa('validacao'):
+                    relatorio = validar(self.dados_produtos.colunas)
+                relatorio.imprimir()
+            with self._etapa('gravacao'):
+                arquivo_salvo = self.salvar_dados(self.dados_produtos, formato)
             print(f"📊 Dados salvos em: {arquivo_salvo}")
+            if relatorio is not None:
+                self.salvar_relatorio_qualidade(relatorio, arquivo_salvo)
             return arquivo_salvo
         else:
             print("❌ Nenhum produto foi processado com sucesso")
@@ -237,39 +628,12 @@ def main():
     print("🍗 Scraper Sadia - Extrator de Dados Nutricionais")
     print("=" * 50)
     
-    # Cria o scraper
+    # Cria o scraper (respeitando o robots.txt do site)
     scraper = ScraperSadia()
+    scraper.cortesia = PoliticaRobots(scraper.cliente)
     
-    # Tenta carregar URLs do JSON
-    json_file = "dados/urls_produtos.json"
-    if os.path.exists(json_file):
-        try:
-            with open(json_file, 'r', encoding='utf-8') as f:
-                produtos_url = json.load(f)
-            print(f"📋 Carregadas {len(produtos_url)} URLs do arquivo JSON")
-        except Exception as e:
-            print(f"❌ Erro ao carregar JSON: {e}")
-            print("📋 Usando lista padrão de URLs")
-            produtos_url = [
-                'https://www.sadia.com.br/produtos/aves/linha-dia-a-dia/frango-inteiro-sem-miudos-4/',
-                'https://www.sadia.com.br/produtos/nba/nba/empanadissimo-100-peito-de-frango-leve-picancia/',
-                'https://www.sadia.com.br/produtos/frios/frios-dia-a-dia/presunto-cozido-fatiado-180g/',
-                'https://www.sadia.com.br/produtos/frios/frios-dia-a-dia/mignoneto/',
-                'https://www.sadia.com.br/produtos/lanches/batatas-fritas/batata-palito-pre-frita-105kg/',
-                'https://www.sadia.com.br/produtos/lanches/batatas-fritas/batata-palito-pre-frita-2kg/',
-                'https://www.sadia.com.br/produtos/linguicas/linguica-defumada/linguica-fininha-25kg/'
-            ]
-    else:
-        print("📋 Arquivo JSON não encontrado, usando lista padrão")
-        produtos_url = [
-            'https://www.sadia.com.br/produtos/aves/linha-dia-a-dia/frango-inteiro-sem-miudos-4/',
-            'https://www.sadia.com.br/produtos/nba/nba/empanadissimo-100-peito-de-frango-leve-picancia/',
-            'https://www.sadia.com.br/produtos/frios/frios-dia-a-dia/presunto-cozido-fatiado-180g/',
-            'https://www.sadia.com.br/produtos/frios/frios-dia-a-dia/mignoneto/',
-            'https://www.sadia.com.br/produtos/lanches/batatas-fritas/batata-palito-pre-frita-105kg/',
-            'https://www.sadia.com.br/produtos/lanches/batatas-fritas/batata-palito-pre-frita-2kg/',
-            'https://www.sadia.com.br/produtos/linguicas/linguica-defumada/linguica-fininha-25kg/'
-        ]
+    # Carrega URLs do JSON (ou a lista padrão)
+    produtos_url = carregar_urls()
     
     # Processa os produtos
     arquivo_salvo = scraper.processar_lista_urls(produtos_url)
@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+Modo serviço (daemon)
+Mantém o coletor e o scraper residentes, atualiza categorias e produtos em
+intervalos configuráveis reaproveitando conexões, caches e os produtos do
+ciclo anterior, e expõe um endpoint local de status para o monitoramento
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Permite rodar tanto como script (python config/x.py) quanto como módulo (config.x)
+if not __package__:
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.padroes import ARQUIVO_URLS, INTERVALO_CATEGORIAS, INTERVALO_PRODUTOS
+from config.registro import ColunasProdutos
+
+HOST_STATUS = '127.0.0.1'
+PORTA_STATUS = 8765
+
+
+class ServicoScraper:
+    """Ciclos agendados de coleta de URLs e extração de produtos num único processo"""
+
+    def __init__(self, coletor, scraper, intervalo_categorias=INTERVALO_CATEGORIAS,
+                 intervalo_produtos=INTERVALO_PRODUTOS, formato='csv', max_duracao=None,
+                 max_paginas=None, arquivo_urls=ARQUIVO_URLS):
+        self.coletor = coletor
+        self.scraper = scraper
+        self.intervalo_categorias = intervalo_categorias
+        self.intervalo_produtos = intervalo_produtos
+        self.formato = formato
+        self.max_duracao = max_duracao
+        self.max_paginas = max_paginas
+        self.arquivo_urls = arquivo_urls
+
+        self.urls = []
+        self.proxima_coleta = time.monotonic()
+        self.proxima_extracao = time.monotonic()
+        self.estado = 'iniciando'
+        self.ciclos = 0
+        self.ultimo_ciclo = None
+        self.ultima_coleta = None
+        self.iniciado_em = datetime.now().isoformat(timespec='seconds')
+
+        self._parar = threading.Event()
+        self._trava = threading.Lock()
+        self._servidor = None
+
+    def carregar_urls_salvas(self):
+        """Parte das URLs já salvas; a próxima coleta fica para quando elas vencerem"""
+        if not os.path.exists(self.arquivo_urls):
+            return
+        try:
+            with open(self.arquivo_urls, 'r', encoding='utf-8') as f:
+                self.urls = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"⚠️ URLs salvas inválidas, coletando de novo: {e}")
+            return
+        idade = time.time() - os.path.getmtime(self.arquivo_urls)
+        self.proxima_coleta = time.monotonic() + max(0.0, self.intervalo_categorias - idade)
+        print(f"📂 {len(self.urls)} URLs carregadas de {self.arquivo_urls}")
+
+    def ciclo_categorias(self):
+        """Coleta de novo as URLs de produtos; mantém as anteriores se a coleta falhar"""
+        # Agendada antes de coletar: uma coleta com erro não é repetida em seguida
+        self.proxima_coleta = time.monotonic() + self.intervalo_categorias
+        self.estado = 'coletando'
+        inicio = time.monotonic()
+        self.coletor.monitor.reiniciar()
+        self.coletor.urls_produtos.clear()
+        self.coletor.processar_todas_categorias()
+
+        if self.coletor.urls_produtos:
+            self.coletor.salvar_json(os.path.basename(self.arquivo_urls))
+            self.urls = sorted(self.coletor.urls_produtos)
+        else:
+            print(f"⚠️ Coleta sem URLs: mantendo as {len(self.urls)} URLs anteriores")
+
+        with self._trava:
+            self.ultima_coleta = {
+                'fim': datetime.now().isoformat(timespec='seconds'),
+                'duracao_s': round(time.monotonic() - inicio, 3),
+                'urls': len(self.urls),
+            }
+
+    def ciclo_produtos(self):
+        """Extrai os produtos; o ciclo anterior fica em memória para o que não for atualizado"""
+        self.proxima_extracao = time.monotonic() + self.intervalo_produtos
+        if not self.urls:
+            print("⚠️ Nenhuma URL para extrair neste ciclo")
+            return
+
+        self.estado = 'extraindo'
+        inicio = time.monotonic()
+        scraper = self.scraper
+        scraper.monitor.reiniciar()
+        anteriores = scraper.dados_produtos
+        scraper.produtos_anteriores = anteriores
+        scraper.dados_produtos = ColunasProdutos()
+
+        try:
+            arquivo = scraper.processar_lista_urls(
+                self.urls, formato=self.formato, max_duracao=self.max_duracao, max_paginas=self.max_paginas
+            )
+        finally:
+            scraper.produtos_anteriores = None
+
+        if not arquivo:
+            # Nada foi gravado (disjuntor ou nenhuma página): o índice em memória continua o anterior
+            scraper.dados_produtos = anteriores
+
+        duracao = time.monotonic() - inicio
+        with self._trava:
+            self.ciclos += 1
+            self.ultimo_ciclo = {
+                'fim': datetime.now().isoformat(timespec='seconds'),
+                'duracao_s': round(duracao, 3),
+                'paginas': scraper.paginas_processadas,
+                'paginas_por_segundo': round(scraper.paginas_processadas / duracao, 3) if duracao else 0.0,
+                'produtos': len(scraper.dados_produtos),
+                'arquivo': arquivo,
+            }
+
+    def status(self):
+        """Resumo para o endpoint de status"""
+        agora = time.monotonic()
+        with self._trava:
+            return {
+                'estado': self.estado,
+                'iniciado_em': self.iniciado_em,
+                'ciclos': self.ciclos,
+                'ultimo_ciclo': self.ultimo_ciclo,
+                'ultima_coleta': self.ultima_coleta,
+                'fila': self.scraper.fila,
+                'urls': len(self.urls),
+                'produtos_em_memoria': len(self.scraper.dados_produtos),
+                'proxima_coleta_em_s': round(max(0.0, self.proxima_coleta - agora), 1),
+                'proxima_extracao_em_s': round(max(0.0, self.proxima_extracao - agora), 1),
+                'requisicoes': self.scraper.cliente.requisicoes,
+                'hedges': self.scraper.cliente.hedges,
+                'latencias': self.scraper.cliente.latencias.resumo(),
+            }
+
+    def iniciar_status(self, host=HOST_STATUS, porta=PORTA_STATUS):
+        """Sobe o endpoint GET /status numa thread separada"""
+        servico = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.rstrip('/') not in ('', '/status'):
+                    self.send_error(404)
+                    return
+                corpo = json.dumps(servico.status(), ensure_ascii=False).encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json; charset=utf-8')
+                self.send_header('Content-Length', str(len(corpo)))
+                self.end_headers()
+                self.wfile.write(corpo)
+
+            def log_message(self, formato, *args):
+                pass
+
+        self._servidor = ThreadingHTTPServer((host, porta), Handler)
+        self._servidor.daemon_threads = True
+        threading.Thread(target=self._servidor.serve_forever, daemon=True).start()
+        host, porta = self._servidor.server_address[:2]
+        print(f"🩺 Status em http://{host}:{porta}/status")
+        return porta
+
+    def executar(self, host=HOST_STATUS, porta=PORTA_STATUS):
+        """Laço principal: roda os ciclos vencidos e dorme até o próximo"""
+        if porta is not None:
+            self.iniciar_status(host, porta)
+        self.carregar_urls_salvas()
+
+        try:
+            while not self._parar.is_set():
+                if time.monotonic() >= self.proxima_coleta:
+                    self._rodar_ciclo(self.ciclo_categorias)
+                if not self._parar.is_set() and time.monotonic() >= self.proxima_extracao:
+                    self._rodar_ciclo(self.ciclo_produtos)
+
+                self.estado = 'aguardando'
+                espera = min(self.proxima_coleta, self.proxima_extracao) - time.monotonic()
+                self._parar.wait(max(1.0, espera))
+        finally:
+            self.estado = 'parado'
+            self.fechar()
+
+    def _rodar_ciclo(self, ciclo):
+        # Um ciclo com erro não derruba o serviço; o próximo é tentado no horário normal
+        try:
+            ciclo()
+        except Exception as e:
+            print(f"❌ Erro no ciclo ({ciclo.__name__}): {e}")
+
+    def parar(self):
+        """Pede o fim do laço (termina após o ciclo atual)"""
+        print("\n🛑 Encerrando o serviço após o ciclo atual...")
+        self._parar.set()
+
+    def fechar(self):
+        """Desliga o endpoint de status e fecha as conexões"""
+        if self._servidor:
+            self._servidor.shutdown()
+            self._servidor.server_close()
+            self._servidor = None
+        self.scraper.cliente.fechar()
+        if self.coletor.cliente is not self.scraper.cliente:
+            self.coletor.cliente.fechar()
@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+Índice de similaridade nutricional ("produtos parecidos")
+Matriz float32 normalizada dos nove nutrientes, cacheada em disco por versão do dataset
+"""
+
+import hashlib
+import os
+import sys
+
+import numpy as np
+
+# Permite rodar tanto como script (python config/x.py) quanto como módulo (config.x)
+if not __package__:
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.estatisticas import NUTRIENTES
+
+ARQUIVO_DADOS = os.path.join('dados', 'produtos_sadia.csv')
+PASTA_CACHE = os.path.join('dados', 'cache')
+TAMANHO_LOTE = 4096
+
+
+def hash_arquivo(caminho, tamanho_bloco=1 << 20):
+    """SHA-256 do conteúdo do arquivo (identifica a versão do dataset)"""
+    sha = hashlib.sha256()
+    with open(caminho, 'rb') as f:
+        for bloco in iter(lambda: f.read(tamanho_bloco), b''):
+            sha.update(bloco)
+    return sha.hexdigest()
+
+
+def prefixo_cache(caminho):
+    """Início do nome dos caches de um CSV (identifica o arquivo de origem pelo caminho)"""
+    origem = hashlib.sha256(os.path.abspath(caminho).encode('utf-8')).hexdigest()[:8]
+    return f"similaridade_{origem}_"
+
+
+def podar_cache(pasta_cache, prefixo, manter):
+    """
+    Remove os caches antigos do mesmo CSV, mantendo só `manter`
+
+    Caches no formato antigo (similaridade_<versao>.npz, sem a origem no nome)
+    também são removidos, já que não há como saber a que arquivo pertencem.
+    """
+    removidos = 0
+    for nome in os.listdir(pasta_cache):
+        if not (nome.startswith('similaridade_') and nome.endswith('.npz')):
+            continue
+        antigo = '_' not in nome[len('similaridade_'):-len('.npz')]
+        caminho = os.path.join(pasta_cache, nome)
+        if (nome.startswith(prefixo) or antigo) and os.path.abspath(caminho) != os.path.abspath(manter):
+            try:
+                os.remove(caminho)
+                removidos += 1
+            except OSError as e:
+                print(f"⚠️ Não foi possível remover o cache {caminho}: {e}")
+    if removidos:
+        print(f"🧹 {removidos} cache(s) de similaridade antigo(s) removido(s)")
+    return removidos
+
+
+class IndiceSimilaridade:
+    """Vizinhos mais próximos por distância euclidiana sobre nutrientes padronizados (z-score)"""
+
+    def __init__(self, nomes, urls, categorias, valores, versao=None, colunas=NUTRIENTES):
+        self.nomes = nomes
+        self.urls = urls
+        self.categorias = categorias
+        self.colunas = list(colunas)
+        self.versao = versao
+        self.valores = np.asarray(valores, dtype=np.float32)
+
+        # Colunas constantes (ex.: porção fixa em 100 g) não devem dividir por zero
+        self.media = self.valores.mean(axis=0)
+        desvio = self.valores.std(axis=0)
+        self.desvio = np.where(desvio > 0, desvio, 1.0).astype(np.float32)
+
+        self.matriz = ((self.valores - self.media) / self.desvio).astype(np.float32)
+        self.normas = np.einsum('ij,ij->i', self.matriz, self.matriz)
+        self._posicao_url = {url: i for i, url in enumerate(self.urls)}
+        self._categorias_minusculas = np.char.lower(np.asarray(self.categorias, dtype=str))
+
+    def __len__(self):
+        return self.matriz.shape[0]
+
+    @classmethod
+    def construir(cls, caminho=ARQUIVO_DADOS, versao=None):
+        """Constrói o índice a partir do CSV de produtos"""
+        from config.analise import carregar_colunas
+
+        dados = carregar_colunas(caminho, colunas_nutrientes=NUTRIENTES)
+        valores = np.nan_to_num(dados.matriz, nan=0.0)
+        return cls(
+            dados.nomes.astype(str), dados.urls.astype(str), dados.categorias.astype(str),
+            valores, versao=versao or hash_arquivo(caminho),
+        )
+
+    @classmethod
+    def carregar(cls, caminho=ARQUIVO_DADOS, pasta_cache=PASTA_CACHE):
+        """Carrega o índice do cache se o dataset não mudou; senão reconstrói e grava"""
+        versao = hash_arquivo(caminho)
+        prefixo = prefixo_cache(caminho)
+        arquivo_cache = os.path.join(pasta_cache, f"{prefixo}{versao[:16]}.npz")
+
+        if os.path.exists(arquivo_cache):
+            with np.load(arquivo_cache, allow_pickle=False) as cache:
+                if str(cache['versao']) == versao:
+                    return cls(
+                        cache['nomes'], cache['urls'], cache['categorias'], cache['valores'],
+                        versao=versao, colunas=[str(c) for c in cache['colunas']],
+                    )
+
+        indice = cls.construir(caminho, versao=versao)
+        indice.salvar(arquivo_cache)
+        podar_cache(pasta_cache, prefixo, manter=arquivo_cache)
+        return indice
+
+    def salvar(self, arquivo_cache):
+        """Grava o índice em .npz (sem pickle) de forma atômica"""
+        os.makedirs(os.path.dirname(arquivo_cache) or '.', exist_ok=True)
+        temporario = arquivo_cache + '.tmp.npz'
+        np.savez(
+            temporario,
+            versao=np.array(self.versao), colunas=np.array(self.colunas),
+            nomes=np.asarray(self.nomes, dtype=str), urls=np.asarray(self.urls, dtype=str),
+            categorias=np.asarray(self.categorias, dtype=str), valores=self.valores,
+        )
+        os.replace(temporario, arquivo_cache)
+        print(f"💾 Índice de similaridade salvo em: {arquivo_cache}")
+        return arquivo_cache
+
+    def localizar(self, consulta):
+        """Encontra a posição de um produto pela URL ou por parte do nome"""
+        if consulta in self._posicao_url:
+            return self._posicao_url[consulta]
+
+        termo = consulta.lower()
+        for i, nome in enumerate(self.nomes):
+            if termo in nome.lower():
+                return i
+        return None
+
+    def distancias(self, consultas):
+        """Distâncias euclidianas ao quadrado (n_consultas x n_produtos), em lotes"""
+        consultas = np.atleast_2d(np.asarray(consultas, dtype=np.float32))
+        normas_consultas = np.einsum('ij,ij->i', consultas, consultas)
+        resultado = np.empty((consultas.shape[0], len(self)), dtype=np.float32)
+
+        # |a - b|² = |a|² + |b|² - 2ab, calculado por blocos para limitar a memória
+        for inicio in range(0, len(self), TAMANHO_LOTE):
+            fim = inicio + TAMANHO_LOTE
+            bloco = self.matriz[inicio:fim]
+            produto = consultas @ bloco.T
+            resultado[:, inicio:fim] = normas_consultas[:, None] + self.normas[None, inicio:fim] - 2.0 * produto
+
+        np.maximum(resultado, 0.0, out=resultado)
+        return resultado
+
+    def vizinhos(self, consulta, k=5, categoria=None, menor_que=None):
+        """
+        Retorna os k produtos mais parecidos com a consulta (URL ou nome)
+
+        Args:
+            categoria (str): restringe a busca a uma categoria
+            menor_que (str): só aceita produtos com valor menor neste nutriente
+                             (ex.: 'SODIO (mg)' para substitutos com menos sódio);
+                             ValueError se não for uma das colunas do índice
+        """
+        posicao = self.localizar(consulta)
+        if posicao is None:
+            return []
+
+        distancias = self.distancias(self.matriz[posicao])[0]
+
+        validos = np.ones(len(self), dtype=bool)
+        validos[posicao] = False
+        if categoria:
+            validos &= self._categorias_minusculas == categoria.lower()
+        if menor_que:
+            if menor_que not in self.colunas:
+                raise ValueError(f"Nutriente desconhecido: {menor_que!r} (válidos: {', '.join(self.colunas)})")
+            coluna = self.colunas.index(menor_que)
+            validos &= self.valores[:, coluna] < self.valores[posicao, coluna]
+
+        candidatos = np.flatnonzero(validos)
+        if candidatos.size == 0:
+            return []
+
+        k = min(k, candidatos.size)
+        melhores = candidatos[np.argpartition(distancias[candidatos], k - 1)[:k]]
+        melhores = melhores[np.argsort(distancias[melhores], kind='stable')]
+
+        return [
+            {
+                'NOME_PRODUTO': str(self.nomes[i]),
+                'URL': str(self.urls[i]),
+                'CATEGORIA': str(self.categorias[i]),
+                'DISTANCIA': float(np.sqrt(distancias[i])),
+                **{coluna: float(self.valores[i, j]) for j, coluna in enumerate(self.colunas)},
+            }
+            for i in melhores
+        ]
+
+
+def main():
+    """Função principal"""
+    if len(sys.argv) < 2:
+        print("Uso: python config/similaridade.py <URL ou nome do produto> [k]")
+        return
+
+    indice = IndiceSimilaridade.carregar()
+    k = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    for vizinho in indice.vizinhos(sys.argv[1], k=k):
+        print(f"   • {vizinho['NOME_PRODUTO']} ({vizinho['CATEGORIA']}) - distância {vizinho['DISTANCIA']:.3f}")
+
+
+if __name__ == "__main__":
+    main()
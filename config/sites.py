@@ -0,0 +1,475 @@
+#!/usr/bin/env python3
+"""
+Perfis declarativos dos sites (marcas)
+Cada perfil descreve seletores, categorias, campos e conversores de valores;
+compilar_site transforma o perfil, uma vez só, num PlanoExtracao usado pelo
+coletor e pelo scraper para qualquer marca
+"""
+
+import html as html_lib
+import os
+import re
+import sys
+from urllib.parse import parse_qsl, urlsplit
+
+import soupsieve
+from bs4 import BeautifulSoup
+
+# Permite rodar tanto como script (python config/x.py) quanto como módulo (config.x)
+if not __package__:
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.canonico import canonicalizar_url
+from config.leitura import PaginaLida, ler_pagina
+from config.tabela import converter_valor
+
+SITE_PADRAO = 'sadia'
+
+SITES = {
+    'sadia': {
+        'marca': 'Sadia',
+        'host': 'www.sadia.com.br',
+        'hosts_equivalentes': ['sadia.com.br'],
+        'caminho_produtos': '/produtos/',
+        'niveis_produto': 2,  # categoria/produto
+        'categorias': {
+            'NBA': 'https://www.sadia.com.br/produtos/nba',
+            'AVES': 'https://www.sadia.com.br/produtos/aves',
+            'FRIOS': 'https://www.sadia.com.br/produtos/frios',
+            'LANCHES': 'https://www.sadia.com.br/produtos/lanches',
+            'SUINOS': 'https://www.sadia.com.br/produtos/suinos',
+            'LINGUICA': 'https://www.sadia.com.br/produtos/linguicas',
+            'PRATOS': 'https://www.sadia.com.br/produtos/pratos-prontos',
+            'PESCADOS': 'https://www.sadia.com.br/produtos/pescados',
+            'SALSICHAS': 'https://www.sadia.com.br/produtos/salsichas',
+            'SOBREMESAS': 'https://www.sadia.com.br/produtos/sobremesas',
+            'VEGETAIS': 'https://www.sadia.com.br/produtos/vegetais',
+            'COMEMORATIVOS': 'https://www.sadia.com.br/produtos/comemorativos',
+        },
+        # Além das categorias e da raiz de produtos, que nunca são produtos
+        'excluir': [],
+        'seletores': {
+            'titulo': 'h1.title-product',
+            'breadcrumb': 'nav.breadcrumb',
+            'tabela_nutricional': 'div.box-nutritional-table table',
+            'links_produtos': 'a.btn-default.tiny-btn.btn-veja-mais',
+            'ingredientes': 'div.ingredients',
+        },
+        'campos': {
+            'NOME_PRODUTO': {
+                'seletor': 'titulo', 'conversores': ['nome_com_marca'], 'padrao': 'Nome não encontrado',
+            },
+            'CATEGORIA': {
+                'seletor': 'breadcrumb', 'conversores': ['segundo_link', 'categoria_da_url'],
+                'padrao': 'Categoria não encontrada',
+            },
+            # Nem todo produto mostra ingredientes: a falta não conta para o monitor de saúde
+            'INGREDIENTES': {'seletor': 'ingredientes', 'conversores': ['texto_corrido'], 'opcional': True},
+        },
+        'tabela': {'seletor': 'tabela_nutricional', 'numeros': 'decimal_virgula'},
+        # Outras páginas de listagem da mesma categoria: paginação, "ver mais" e subcategorias
+        'listagens': {
+            'niveis': 2,  # /produtos/frios/frios-dia-a-dia/
+            'parametros_paginacao': ['page', 'pagina', 'p', 'offset'],
+            'atributos': ['href', 'data-url', 'data-href', 'data-next', 'data-load-more'],
+            'max_paginas': 100,  # por categoria
+        },
+    },
+}
+
+CHAVES_SITE = {
+    'marca', 'host', 'hosts_equivalentes', 'caminho_produtos', 'niveis_produto', 'categorias',
+    'excluir', 'seletores', 'campos', 'tabela', 'listagens',
+}
+
+
+# Conversores de campo: (elemento, soup, plano) -> valor ou None (passa para o próximo)
+def nome_com_marca(elemento, soup, plano):
+    """Texto do elemento com a primeira letra maiúscula e ' - Marca' no fim"""
+    if not elemento:
+        return None
+    nome = elemento.get_text(strip=True)
+    if not nome:
+        return None
+    return nome[0].upper() + nome[1:] + f" - {plano.marca}"
+
+
+def segundo_link(elemento, soup, plano):
+    """Texto do segundo link (breadcrumb: Início > Categoria > ...)"""
+    if not elemento:
+        return None
+    links = elemento.find_all('a')
+    return links[1].get_text(strip=True) if len(links) > 1 else None
+
+
+def categoria_da_url(elemento, soup, plano):
+    """Categoria a partir do og:url da página ('pratos-prontos' -> 'Pratos Prontos')"""
+    url = soup.find('meta', property='og:url')
+    conteudo = url.get('content', '') if url else ''
+    if plano.caminho_produtos not in conteudo:
+        return None
+    categoria = conteudo.split(plano.caminho_produtos, 1)[1].split('/')[0]
+    return categoria.replace('-', ' ').title() or None
+
+
+def texto(elemento, soup, plano):
+    """Texto do elemento"""
+    return elemento.get_text(strip=True) if elemento else None
+
+
+def texto_corrido(elemento, soup, plano):
+    """Texto do elemento com os trechos (parágrafos, <br>) separados por espaço"""
+    return elemento.get_text(' ', strip=True) if elemento else None
+
+
+CONVERSORES = {
+    'nome_com_marca': nome_com_marca,
+    'segundo_link': segundo_link,
+    'categoria_da_url': categoria_da_url,
+    'texto': texto,
+    'texto_corrido': texto_corrido,
+}
+
+
+def decimal_ponto(valor):
+    """'1,020.5' -> 1020.5; inválido -> 0.0"""
+    return converter_valor(valor.replace(',', '').replace('.', ','))
+
+
+# Leitura dos números da tabela nutricional
+CONVERSORES_NUMEROS = {
+    'decimal_virgula': converter_valor,
+    'decimal_ponto': decimal_ponto,
+}
+
+PADRAO_PAGINA_CAMINHO = re.compile(r'/(?:page|pagina)/\d+/$')
+
+PADRAO_SIMPLES = re.compile(r'^([a-zA-Z][\w-]*)?((?:\.[\w-]+)*)$')
+
+# Atributos de uma tag de abertura: nome="valor", nome='valor', nome=valor ou só nome
+PADRAO_ATRIBUTO = re.compile(r'([^\s=/>]+)(?:\s*=\s*(?:"([^"]*)"|\'([^\']*)\'|([^\s>]+)))?')
+
+
+class Seletor:
+    """
+    Seletor CSS compilado
+
+    Cadeias de 'tag.classe' viram buscas diretas do BeautifulSoup (o caso
+    comum e mais rápido); qualquer outra sintaxe é compilada pelo soupsieve.
+    """
+
+    def __init__(self, expressao):
+        self.expressao = expressao
+        self._css = soupsieve.compile(expressao)  # valida a sintaxe já na compilação do plano
+        passos = []
+        for parte in expressao.split():
+            encontrado = PADRAO_SIMPLES.match(parte)
+            if not encontrado or not any(encontrado.groups()):
+                passos = None
+                break
+            tag, classes = encontrado.groups()
+            passos.append((tag or True, [c for c in classes.split('.') if c]))
+        self.passos = passos
+
+        # Atalho sem árvore para seletores de um passo com tag ('a.btn-veja-mais'): só as tags de abertura
+        self._tag = None
+        if passos and len(passos) == 1 and passos[0][0] is not True:
+            tag, classes = passos[0]
+            self._tag = re.compile(rf'<{re.escape(tag)}(\s(?:[^>"\']|"[^"]*"|\'[^\']*\')*)?/?>', re.IGNORECASE)
+            self._classes = set(classes)
+
+    @staticmethod
+    def _buscar(raiz, tag, classes, todos=False):
+        if not classes:
+            return raiz.find_all(tag) if todos else raiz.find(tag)
+        # Busca pela primeira classe e confere as demais (qualquer ordem no atributo)
+        candidatos = raiz.find_all(tag, class_=classes[0])
+        if len(classes) > 1:
+            candidatos = [c for c in candidatos if set(classes).issubset(c.get('class', ()))]
+        if todos:
+            return candidatos
+        return candidatos[0] if candidatos else None
+
+    def primeiro(self, raiz):
+        """Primeiro elemento que casa com o seletor, ou None"""
+        if self.passos is None:
+            return self._css.select_one(raiz)
+        atual = raiz
+        for tag, classes in self.passos:
+            atual = self._buscar(atual, tag, classes)
+            if atual is None:
+                # O primeiro ancestral pode não ter o descendente; o CSS completo confere os demais
+                return self._css.select_one(raiz) if len(self.passos) > 1 else None
+        return atual
+
+    def todos(self, raiz):
+        """Todos os elementos que casam com o seletor, na ordem da página"""
+        if self.passos is None or len(self.passos) > 1:
+            return self._css.select(raiz)
+        tag, classes = self.passos[0]
+        return self._buscar(raiz, tag, classes, todos=True)
+
+    def varrer(self, html, atributo):
+        """
+        Valores do atributo nas tags que casam, lendo o HTML direto (sem montar a árvore)
+
+        Retorna None se o seletor não tem atalho; a árvore continua sendo a referência.
+        """
+        if self._tag is None:
+            return None
+        valores = []
+        for encontrado in self._tag.finditer(html):
+            trecho = encontrado.group(1)
+            # Descarta rápido as tags que nem mencionam as classes
+            if not trecho or not all(classe in trecho for classe in self._classes):
+                continue
+            atributos = {}
+            for nome, aspas, apostrofos, sem_aspas in PADRAO_ATRIBUTO.findall(trecho):
+                atributos.setdefault(nome.lower(), aspas or apostrofos or sem_aspas)
+            if not self._classes.issubset(html_lib.unescape(atributos.get('class', '')).split()):
+                continue
+            valor = atributos.get(atributo)
+            if valor:
+                valores.append(html_lib.unescape(valor))
+        return valores
+
+
+class Campo:
+    """Coluna do produto: seletor, cadeia de conversores e valor padrão"""
+
+    def __init__(self, coluna, nome_seletor, seletor, conversores, padrao, opcional=False):
+        self.coluna = coluna
+        self.nome_seletor = nome_seletor
+        self.seletor = seletor
+        self.conversores = conversores
+        self.padrao = padrao
+        self.opcional = opcional
+
+
+class PlanoExtracao:
+    """Perfil de um site já compilado: seletores prontos, conversores resolvidos e URLs canônicas"""
+
+    def __init__(self, nome, perfil):
+        desconhecidas = set(perfil) - CHAVES_SITE
+        if desconhecidas:
+            raise ValueError(f"Perfil {nome!r}: chaves desconhecidas {sorted(desconhecidas)}")
+
+        self.nome = nome
+        self.marca = perfil['marca']
+        self.host = perfil['host'].lower()
+        self.hosts_equivalentes = {equivalente.lower(): self.host for equivalente in perfil.get('hosts_equivalentes', ())}
+        self.caminho_produtos = perfil.get('caminho_produtos', '/produtos/')
+        self.niveis_produto = perfil.get('niveis_produto', 2)
+
+        self.seletores = {nome_seletor: Seletor(expressao) for nome_seletor, expressao in perfil['seletores'].items()}
+        self.campos = {}
+        for coluna, definicao in perfil.get('campos', {}).items():
+            nome_seletor = definicao['seletor']
+            try:
+                conversores = [CONVERSORES[conversor] for conversor in definicao['conversores']]
+            except KeyError as e:
+                raise ValueError(f"Perfil {nome!r}: conversor desconhecido {e} em {coluna}") from None
+            self.campos[coluna] = Campo(coluna, nome_seletor, self._seletor(nome_seletor), conversores,
+                                        definicao.get('padrao', ''), definicao.get('opcional', False))
+
+        tabela = perfil.get('tabela', {})
+        self.seletor_tabela = tabela.get('seletor', 'tabela_nutricional')
+        self.tabela = self._seletor(self.seletor_tabela)
+        numeros = tabela.get('numeros', 'decimal_virgula')
+        if numeros not in CONVERSORES_NUMEROS:
+            raise ValueError(f"Perfil {nome!r}: formato de números desconhecido {numeros!r}")
+        self.converter_numero = CONVERSORES_NUMEROS[numeros]
+        self.links = self._seletor('links_produtos')
+        # A leitura contínua (sem árvore) só entende cadeias de 'tag.classe'
+        self.leitura_continua = all(
+            seletor.passos is not None for seletor in [self.tabela, *(c.seletor for c in self.campos.values())]
+        )
+
+        listagens = perfil.get('listagens', {})
+        self.niveis_listagem = listagens.get('niveis', self.niveis_produto)
+        self.parametros_paginacao = set(listagens.get('parametros_paginacao', ()))
+        self.max_paginas_categoria = listagens.get('max_paginas', 100)
+        atributos = '|'.join(re.escape(atributo) for atributo in listagens.get('atributos', ['href']))
+        self._links_listagem = re.compile(
+            rf'\s(?:{atributos})\s*=\s*(?:"([^"]*)"|\'([^\']*)\')', re.IGNORECASE
+        )
+
+        self.categorias = dict(perfil.get('categorias', {}))
+        raiz = f'https://{self.host}{self.caminho_produtos}'
+        self.urls_excluir = {
+            canonicalizar_url(url, hosts_equivalentes=self.hosts_equivalentes)
+            for url in [raiz, *self.categorias.values(), *perfil.get('excluir', ())]
+        }
+
+    def _seletor(self, nome_seletor):
+        if nome_seletor not in self.seletores:
+            raise ValueError(f"Perfil {self.nome!r}: seletor {nome_seletor!r} não definido")
+        return self.seletores[nome_seletor]
+
+    def seletores_monitorados(self):
+        """Seletores que alimentam o monitor de saúde e a expressão CSS de cada um"""
+        nomes = [campo.nome_seletor for campo in self.campos.values() if not campo.opcional]
+        nomes += [self.seletor_tabela, 'links_produtos']
+        return {nome: self.seletores[nome].expressao for nome in nomes}
+
+    def do_site(self, url):
+        """Indica se a URL pertence ao site (host canônico ou subdomínio)"""
+        host = (urlsplit(url).hostname or '').lower()
+        dominio = self.host.removeprefix('www.')
+        return host == dominio or host.endswith('.' + dominio)
+
+    def campo(self, coluna, soup, registrar=None):
+        """
+        Valor da coluna; `registrar(nome_seletor, elemento)` alimenta o monitor de saúde
+
+        `soup` é a árvore da página ou uma PaginaLida da leitura contínua.
+        """
+        campo = self.campos[coluna]
+        if isinstance(soup, PaginaLida):
+            elemento = soup.selecionado(campo.nome_seletor)
+        else:
+            elemento = campo.seletor.primeiro(soup)
+        if registrar and not campo.opcional:
+            registrar(campo.nome_seletor, elemento)
+        for conversor in campo.conversores:
+            valor = conversor(elemento, soup, self)
+            if valor:
+                return valor
+        return campo.padrao
+
+    def linhas_tabela(self, soup, registrar=None):
+        """Texto das células de cada linha da tabela nutricional, ou None se ela não existe"""
+        if isinstance(soup, PaginaLida):
+            if registrar:
+                registrar(self.seletor_tabela, soup.linhas is not None)
+            return soup.linhas
+        tabela = self.tabela.primeiro(soup)
+        if registrar:
+            registrar(self.seletor_tabela, tabela)
+        if tabela is None:
+            return None
+        return [
+            [celula.get_text(' ', strip=True) for celula in linha.find_all(['td', 'th'])]
+            for linha in tabela.find_all('tr')
+        ]
+
+    def links_produtos(self, soup):
+        """hrefs dos links de produtos de uma página de listagem"""
+        return [link['href'] for link in self.links.todos(soup) if link.get('href')]
+
+    def links_produtos_html(self, html):
+        """hrefs dos links de produtos direto do HTML; a árvore só é montada se o atalho não achar nenhum"""
+        hrefs = self.links.varrer(html, 'href')
+        if hrefs:
+            return hrefs
+        soup = BeautifulSoup(html, 'html.parser')
+        try:
+            return self.links_produtos(soup)
+        finally:
+            soup.decompose()
+
+    def listagens(self, html, url, url_categoria):
+        """
+        Outras páginas de listagem da categoria citadas na página (sem montar a árvore)
+
+        Valem links e atributos de "ver mais" (data-url etc.) para a paginação da
+        própria listagem e para subcategorias dentro da categoria.
+        """
+        raiz = urlsplit(canonicalizar_url(url_categoria, hosts_equivalentes=self.hosts_equivalentes)).path
+        return [candidata for candidata in self.enderecos(html, url) if self.url_de_listagem(candidata, raiz)]
+
+    def enderecos(self, html, url):
+        """URLs canônicas (sem repetição) dos links e atributos de "ver mais" da página"""
+        encontradas = {}
+        for aspas, apostrofos in self._links_listagem.findall(html):
+            endereco = html_lib.unescape(aspas or apostrofos).strip()
+            if not endereco or endereco.startswith(('#', 'javascript:', 'mailto:')):
+                continue
+            if endereco.startswith('produtos/'):
+                endereco = '/' + endereco
+            encontradas.setdefault(canonicalizar_url(endereco, base=url, hosts_equivalentes=self.hosts_equivalentes))
+        return list(encontradas)
+
+    def links_internos(self, html, url):
+        """Páginas do site dentro do caminho de produtos citadas na página (rastreamento do site inteiro)"""
+        internos = []
+        for candidata in self.enderecos(html, url):
+            partes = urlsplit(candidata)
+            if not self.do_site(candidata) or not partes.path.startswith(self.caminho_produtos):
+                continue
+            # Só a paginação entre os parâmetros: filtros e ordenações multiplicariam as mesmas páginas
+            if {chave for chave, _ in parse_qsl(partes.query)} - self.parametros_paginacao:
+                continue
+            internos.append(candidata)
+        return internos
+
+    def pagina_de_produto(self, html):
+        """A página tem a tabela nutricional (classifica as páginas visitadas no rastreamento)"""
+        if self.leitura_continua:
+            return ler_pagina(html, self).linhas is not None
+        soup = BeautifulSoup(html, 'html.parser')
+        try:
+            return self.tabela.primeiro(soup) is not None
+        finally:
+            soup.decompose()
+
+    def url_de_listagem(self, url, raiz):
+        """Página de listagem dentro do caminho `raiz`: paginação (?page=2, /page/2/) ou subcategoria"""
+        if not self.do_site(url):
+            return False
+        partes = urlsplit(url)
+        if not partes.path.startswith(raiz) or self.caminho_produtos not in partes.path:
+            return False
+        parametros = {chave for chave, _ in parse_qsl(partes.query)}
+        if parametros & self.parametros_paginacao or PADRAO_PAGINA_CAMINHO.search(partes.path):
+            return True
+        niveis = [parte for parte in partes.path.split(self.caminho_produtos, 1)[1].split('/') if parte]
+        return not parametros and len(niveis) <= self.niveis_listagem
+
+    def url_de_produto(self, url):
+        """URL canônica com pelo menos `niveis_produto` níveis depois do caminho de produtos"""
+        if self.caminho_produtos not in url or url in self.urls_excluir:
+            return False
+        niveis = [parte for parte in url.split(self.caminho_produtos, 1)[1].split('/') if parte]
+        return len(niveis) >= self.niveis_produto
+
+
+def compilar_site(nome):
+    """Compila o perfil do site pelo nome"""
+    if nome not in SITES:
+        raise ValueError(f"Site desconhecido: {nome!r} (disponíveis: {', '.join(SITES)})")
+    return PlanoExtracao(nome, SITES[nome])
+
+
+class PlanosSites:
+    """Planos compilados de vários sites, escolhidos pelo host de cada URL"""
+
+    def __init__(self, nomes=None):
+        nomes = list(dict.fromkeys(nomes or [SITE_PADRAO]))
+        self.planos = [compilar_site(nome) for nome in nomes]
+        self.padrao = self.planos[0]
+        # Hosts alternativos -> host canônico de todos os sites (passado à canonicalização)
+        self.hosts_equivalentes = {}
+        for plano in self.planos:
+            self.hosts_equivalentes.update(plano.hosts_equivalentes)
+
+    def __iter__(self):
+        return iter(self.planos)
+
+    def __len__(self):
+        return len(self.planos)
+
+    def seletores_monitorados(self):
+        """Seletores monitorados de todos os sites; expressões diferentes do mesmo nome separadas por ' | '"""
+        expressoes = {}
+        for plano in self.planos:
+            for nome, expressao in plano.seletores_monitorados().items():
+                expressoes.setdefault(nome, {}).setdefault(expressao)
+        return {nome: ' | '.join(lista) for nome, lista in expressoes.items()}
+
+    def para(self, url):
+        """Plano do site da URL (o primeiro site quando nenhum casa)"""
+        for plano in self.planos:
+            if plano.do_site(url):
+                return plano
+        return self.padrao
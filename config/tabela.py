@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Leitura completa da tabela nutricional
+Cabeçalho, todas as colunas (100 g, porção, %VD), descrição da porção e linhas
+sem coluna própria, numa única passada; as colunas principais saem daqui
+"""
+
+import json
+import os
+import re
+import sys
+from itertools import zip_longest
+
+# Permite rodar tanto como script (python config/x.py) quanto como módulo (config.x)
+if not __package__:
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.registro import NUTRIENTES_TABELA
+
+# Termos de cada linha da tabela, na ordem de verificação (os mais específicos primeiro)
+MAPA_NUTRIENTES = [
+    (('valor energético', 'calorias'), 'CALORIAS'),
+    (('carboidratos',), 'CARBOIDRATOS'),
+    (('açúcares adicionados',), 'ACUCARES_ADICIONADOS'),
+    (('proteínas',), 'PROTEINAS'),
+    (('gorduras totais',), 'GORDURAS_TOTAIS'),
+    (('gorduras saturadas',), 'GORDURAS_SATURADAS'),
+    (('gorduras trans',), 'GORDURAS_TRANS'),
+    (('fibra alimentar', 'fibra'), 'FIBRAS'),
+    (('açúcares totais', 'açúcares'), 'ACUCARES'),
+    (('sódio',), 'SODIO'),
+]
+
+UNIDADES = dict(NUTRIENTES_TABELA)
+
+PADRAO_VALOR = re.compile(r'-?\d+(?:\.\d+)?')
+PADRAO_NUMERO = re.compile(r'^\s*-?[\d.,]+\s*$')
+PADRAO_QUANTIDADE = re.compile(r'(\d+(?:[.,]\d+)?)\s*(?:g|ml)\b', re.IGNORECASE)
+
+
+def converter_valor(valor):
+    """'1.020' -> 1020.0, '3,2' -> 3.2, '100 kcal = 420 kJ' -> 100.0; inválido ('**') -> 0.0"""
+    # Corrige o valor: remove pontos (milhar), troca vírgula por ponto (decimal)
+    valor_corrigido = valor.replace('.', '').replace(',', '.')
+    # Pega apenas o primeiro valor se houver divisores
+    valor_primeiro = valor_corrigido.split('=')[0].split('\\')[0].split('/')[0].strip()
+    # Número inicial, ignorando a unidade ('300 mg', '12%')
+    encontrado = PADRAO_VALOR.match(valor_primeiro)
+    return float(encontrado.group(0)) if encontrado else 0.0
+
+
+def quantidade(texto):
+    """Primeira quantidade em g/ml do texto ('Porção de 40 g (2 fatias)' -> 40.0), ou None"""
+    encontrado = PADRAO_QUANTIDADE.search(texto)
+    return float(encontrado.group(1).replace(',', '.')) if encontrado else None
+
+
+def identificar_nutriente(rotulo):
+    """Prefixo da coluna do nutriente da linha (None se a linha não tem coluna própria)"""
+    rotulo = rotulo.lower()
+    for termos, prefixo in MAPA_NUTRIENTES:
+        if any(termo in rotulo for termo in termos):
+            # Linha de energia só em kJ não é a de calorias
+            if prefixo == 'CALORIAS' and 'kj' in rotulo and 'kcal' not in rotulo:
+                return None
+            return prefixo
+    return None
+
+
+def papeis_colunas(cabecalho, quantidade_colunas):
+    """
+    Papel de cada coluna de valores: ('base', g), ('porcao', g) ou ('vd', None)
+
+    A coluna base alimenta as colunas principais (por 100 g quando o site
+    informa). Sem cabeçalho, vale o layout do site: 100 g, porção e %VD no fim.
+    """
+    papeis = {}
+    for i, texto in enumerate(cabecalho or ()):
+        if i == 0:
+            continue
+        texto = texto.lower()
+        if '%' in texto or 'vd' in texto:
+            papeis[i] = ('vd', None)
+            continue
+        gramas = quantidade(texto)
+        if gramas is not None:
+            papeis[i] = ('base', gramas) if gramas == 100 else ('porcao', gramas)
+
+    if not papeis:
+        papeis = {1: ('base', None)}
+        if quantidade_colunas >= 3:
+            papeis[quantidade_colunas - 1] = ('vd', None)
+            for i in range(2, quantidade_colunas - 1):
+                papeis[i] = ('porcao', None)
+
+    if not any(papel == 'base' for papel, _ in papeis.values()):
+        # Sem coluna de 100 g: as colunas principais usam a primeira coluna de valores (como antes)
+        primeira = min((i for i, (papel, _) in papeis.items() if papel != 'vd'), default=1)
+        papeis[primeira] = ('base', papeis.get(primeira, (None, None))[1])
+    return papeis
+
+
+def preencher_tabela(produto, linhas, converter=converter_valor):
+    """
+    Preenche o produto com a tabela inteira
+
+    `linhas` são listas com o texto das células de cada <tr>, na ordem da página;
+    `converter` lê os números no formato do site.
+    """
+    cabecalho = None
+    descricoes = []
+    outros = {}
+    nutrientes = []
+
+    for celulas in linhas:
+        if not celulas:
+            continue
+        rotulo = celulas[0]
+        prefixo = identificar_nutriente(rotulo) if len(celulas) >= 2 else None
+        if prefixo:
+            nutrientes.append((prefixo, celulas))
+            continue
+
+        if len(celulas) == 1 or 'porç' in rotulo.lower() or 'porc' in rotulo.lower():
+            descricoes.append(rotulo)
+        if len(celulas) < 2:
+            continue
+        if not nutrientes and not any(PADRAO_NUMERO.match(texto) for texto in celulas[1:]):
+            # Linhas de títulos antes dos nutrientes formam o cabeçalho (duas linhas são unidas)
+            cabecalho = celulas if cabecalho is None else [
+                ' '.join(texto for texto in par if texto) for par in zip_longest(cabecalho, celulas, fillvalue='')
+            ]
+        else:
+            outros[rotulo] = celulas[1:]
+
+    largura = max((len(celulas) for _, celulas in nutrientes), default=2)
+    papeis = papeis_colunas(cabecalho, largura)
+    gramas_porcao = None
+
+    for prefixo, celulas in nutrientes:
+        for i, (papel, gramas) in papeis.items():
+            if i >= len(celulas):
+                continue
+            valor = converter(celulas[i])
+            if papel == 'base':
+                produto[f'{prefixo} ({UNIDADES[prefixo]})'] = valor
+            elif papel == 'porcao':
+                produto[f'{prefixo}_PORCAO ({UNIDADES[prefixo]})'] = valor
+                gramas_porcao = gramas_porcao or gramas
+            else:
+                produto[f'{prefixo}_VD (%)'] = valor
+
+    # Porção de referência das colunas principais: a quantidade da coluna base (100 g se não informada)
+    gramas_base = next((gramas for papel, gramas in papeis.values() if papel == 'base'), None)
+    produto['PORCAO (g)'] = gramas_base or 100.0
+
+    descricao = ' | '.join(dict.fromkeys(descricoes))
+    produto['DESCRICAO_PORCAO'] = descricao
+    produto['PORCAO_DECLARADA (g)'] = quantidade(descricao) or gramas_porcao or 0.0
+    produto['CABECALHO_TABELA'] = ' | '.join(cabecalho) if cabecalho else ''
+    produto['OUTROS_NUTRIENTES'] = json.dumps(outros, ensure_ascii=False) if outros else ''
+    return produto
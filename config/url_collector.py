@@ -4,92 +4,94 @@ URL Collector para produtos da Sadia
 Coleta URLs de produtos de todas as categorias e salva em JSON
 """
 
-import requests
-from bs4 import BeautifulSoup
 import json
 import time
-import re
-from urllib.parse import urljoin, urlparse
+from urllib.parse import urlparse
 import os
+import sys
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+# Permite rodar tanto como script (python config/x.py) quanto como módulo (config.x)
+if not __package__:
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.estatisticas import ResumoDados
+from config.canonico import MapaCanonico, canonicalizar_url
+from config.saude import CircuitoAberto, MonitorSaude
+from config.rede import ClienteHTTP
+from config.cortesia import PoliticaRobots
+from config.sites import PlanosSites
+
+# Delay entre categorias de cada worker quando o robots.txt não define um Crawl-delay
+DELAY_PADRAO = 3.0
+
+# Limites de uma rodada do rastreamento do site inteiro
+MAX_PAGINAS_RASTREIO = 5000
+MAX_PROFUNDIDADE = 8
+
+# A fila e o filtro de páginas vistas são gravados a cada tantas páginas (a rodada pode ser retomada)
+INTERVALO_SALVAR_RASTREIO = 50
 
 class URLCollector:
-    def __init__(self):
+    def __init__(self, max_workers=1, delay=None, cliente=None, cortesia=None, sites=None, rastreamento=None):
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
         }
         self.urls_produtos = set()  # Usa set para evitar duplicatas
+        self.max_workers = max(1, int(max_workers))
+        # delay=None: segue o Crawl-delay do robots.txt (ou DELAY_PADRAO se o site não define)
+        self.delay_automatico = delay is None
+        self.delay = DELAY_PADRAO if delay is None else delay
+        self.cortesia = cortesia
+        self.cliente = cliente or ClienteHTTP(self.headers, tamanho_pool=max(10, self.max_workers))
         
-        # Categorias da Sadia
-        self.categorias = {
-            'NBA': 'https://www.sadia.com.br/produtos/nba',
-            'AVES': 'https://www.sadia.com.br/produtos/aves',
-            'FRIOS': 'https://www.sadia.com.br/produtos/frios',
-            'LANCHES': 'https://www.sadia.com.br/produtos/lanches',
-            'SUINOS': 'https://www.sadia.com.br/produtos/suinos',
-            'LINGUICA': 'https://www.sadia.com.br/produtos/linguicas',
-            'PRATOS': 'https://www.sadia.com.br/produtos/pratos-prontos',
-            'PESCADOS': 'https://www.sadia.com.br/produtos/pescados',
-            'SALSICHAS': 'https://www.sadia.com.br/produtos/salsichas',
-            'SOBREMESAS': 'https://www.sadia.com.br/produtos/sobremesas',
-            'VEGETAIS': 'https://www.sadia.com.br/produtos/vegetais',
-            'COMEMORATIVOS': 'https://www.sadia.com.br/produtos/comemorativos'
-        }
+        # Perfis dos sites compilados uma vez (categorias, seletores e URLs que não são produtos)
+        self.sites = sites if isinstance(sites, PlanosSites) else PlanosSites(sites)
+        self.canonicas = MapaCanonico.carregar(hosts_equivalentes=self.sites.hosts_equivalentes)
+        
+        # Categorias de todos os sites (com o nome do site na frente quando há mais de um)
+        self.categorias = {}
+        for plano in self.sites:
+            for nome, url in plano.categorias.items():
+                self.categorias[f"{plano.nome.upper()}/{nome}" if len(self.sites) > 1 else nome] = url
         
         # URLs para excluir (não são produtos)
-        self.urls_excluir = {
-            'https://www.sadia.com.br/produtos/',
-            'https://www.sadia.com.br/produtos/nba',
-            'https://www.sadia.com.br/produtos/aves',
-            'https://www.sadia.com.br/produtos/frios',
-            'https://www.sadia.com.br/produtos/lanches',
-            'https://www.sadia.com.br/produtos/suinos',
-            'https://www.sadia.com.br/produtos/linguicas',
-            'https://www.sadia.com.br/produtos/pratos-prontos',
-            'https://www.sadia.com.br/produtos/pescados',
-            'https://www.sadia.com.br/produtos/salsichas',
-            'https://www.sadia.com.br/produtos/sobremesas',
-            'https://www.sadia.com.br/produtos/vegetais',
-            'https://www.sadia.com.br/produtos/comemorativos'
-        }
+        self.urls_excluir = set().union(*(plano.urls_excluir for plano in self.sites))
+        
+        # Poucas páginas de listagem: aborta se as primeiras categorias não tiverem nenhum link
+        self.monitor = MonitorSaude(janela=len(self.categorias), limite_falhas=0.99, minimo_amostras=4,
+                                    seletores=self.sites.seletores_monitorados())
+        
+        # Rastreamento do site inteiro no lugar das categorias: dict com max_paginas, profundidade e continuar
+        self.rastreamento = rastreamento
     
     def extrair_html(self, url):
         """Extrai o HTML de uma URL"""
         try:
             print(f"🌐 Acessando: {url}")
-            response = requests.get(url, headers=self.headers, timeout=30)
-            response.raise_for_status()
-            response.encoding = 'utf-8'
+            html = self.cliente.obter(url)
             
-            print(f"✅ HTML extraído: {len(response.text)} caracteres")
-            return response.text
+            print(f"✅ HTML extraído: {len(html)} caracteres")
+            return html
             
         except Exception as e:
             print(f"❌ Erro ao acessar {url}: {e}")
             return None
     
     def extrair_urls_da_pagina(self, html, url_base):
-        """Extrai URLs de produtos usando o seletor específico"""
+        """Extrai URLs de produtos usando o seletor do perfil do site"""
         urls_encontradas = set()
         
         try:
-            soup = BeautifulSoup(html, 'html.parser')
-            
-            # Procura especificamente pelos links de produtos com a classe btn-veja-mais
-            links_produtos = soup.find_all('a', class_='btn-default tiny-btn btn-veja-mais')
-            
-            for link in links_produtos:
-                href = link.get('href')
-                if href:
-                    # Adiciona o domínio base se necessário
-                    if href.startswith('produtos/'):
-                        url_absoluta = f"https://www.sadia.com.br/{href}"
-                    else:
-                        # Converte para URL absoluta
-                        url_absoluta = urljoin(url_base, href)
-                    
-                    # Filtra apenas URLs da Sadia
-                    if 'sadia.com.br' in url_absoluta:
-                        urls_encontradas.add(url_absoluta)
+            # Atalho: lê as tags <a> direto do HTML; a árvore só é montada se ele não achar nenhum link
+            plano = self.sites.para(url_base)
+            for href in plano.links_produtos_html(html):
+                url_absoluta = self.resolver_url(href, url_base)
+                
+                # Filtra apenas URLs do próprio site
+                if plano.do_site(url_absoluta):
+                    urls_encontradas.add(url_absoluta)
             
             print(f"🔗 Encontradas {len(urls_encontradas)} URLs de produtos em {url_base}")
             return urls_encontradas
@@ -98,96 +100,254 @@ class URLCollector:
             print(f"❌ Erro ao extrair URLs: {e}")
             return set()
     
+    # Nome antigo, mantido para quem importa o coletor
+    extract_urls_from_page = extrair_urls_da_pagina
+    
+    def resolver_url(self, href, url_base):
+        """Converte o href em URL absoluta canônica (uma única forma por produto)"""
+        # Links relativos "produtos/..." são relativos à raiz do site
+        if href.startswith('produtos/'):
+            href = '/' + href
+        return self.canonicas.resolver(href, base=url_base)
+    
     def filtrar_urls_produtos(self, urls):
         """Filtra apenas URLs de produtos válidas"""
         urls_produtos = set()
         
         for url in urls:
+            url = canonicalizar_url(url, hosts_equivalentes=self.sites.hosts_equivalentes)
+            
             # Remove URLs que não são produtos
             if url in self.urls_excluir:
                 continue
             
-            # Verifica se é uma URL de produto válida
-            if '/produtos/' in url and not url.endswith('/'):
-                # Verifica se tem pelo menos 2 níveis após /produtos/
-                partes = url.split('/produtos/')
-                if len(partes) > 1:
-                    caminho = partes[1]
-                    if caminho.count('/') >= 1:  # Pelo menos categoria/produto
-                        urls_produtos.add(url)
+            # Verifica se é uma URL de produto válida (ex.: /produtos/categoria/produto/)
+            if self.sites.para(url).url_de_produto(url):
+                urls_produtos.add(url)
+        
+        if self.cortesia:
+            urls_produtos = set(self.cortesia.filtrar(sorted(urls_produtos)))
         
         print(f"✅ Filtradas {len(urls_produtos)} URLs de produtos válidas")
         return urls_produtos
     
     def processar_categoria(self, nome_categoria, url_categoria):
-        """Processa uma categoria específica"""
-        print(f"\n📂 Processando categoria: {nome_categoria}")
-        print(f"🔗 URL: {url_categoria}")
+        """Processa uma categoria específica (só a página da categoria)"""
+        return self.processar_listagem(nome_categoria, url_categoria, url_categoria)[0]
+    
+    def processar_listagem(self, nome_categoria, url, url_categoria):
+        """Processa uma página de listagem; retorna (URLs de produtos, outras listagens da categoria)"""
+        inicial = url == url_categoria
+        if inicial:
+            print(f"\n📂 Processando categoria: {nome_categoria}")
+            print(f"🔗 URL: {url}")
+        else:
+            print(f"\n📄 Listagem de {nome_categoria}: {url}")
         
-        # Extrai HTML da categoria
-        html = self.extrair_html(url_categoria)
+        # Extrai HTML da listagem
+        html = self.extrair_html(url)
         if not html:
-            return set()
+            return set(), []
         
         # Extrai URLs da página
-        urls_pagina = self.extract_urls_from_page(html, url_categoria)
+        urls_pagina = self.extrair_urls_da_pagina(html, url)
+        if inicial:
+            # Só a página da categoria conta para o disjuntor: a última página de uma paginação pode vir vazia
+            self.monitor.registrar('links_produtos', urls_pagina)
+            self.monitor.verificar()
         
         # Filtra URLs de produtos
         urls_produtos = self.filtrar_urls_produtos(urls_pagina)
         
-        return urls_produtos
+        # Paginação, "ver mais" e subcategorias citadas na página
+        listagens = self.sites.para(url).listagens(html, url, url_categoria)
+        return urls_produtos, listagens
     
-    def extract_urls_from_page(self, html, url_base):
-        """Extrai URLs de produtos usando o seletor específico (método auxiliar)"""
-        urls_encontradas = set()
+    def _processar_listagem_com_delay(self, nome_categoria, url, url_categoria):
+        """Processa uma listagem e aguarda o delay (usado pelos workers)"""
+        if self.monitor.aberto:
+            return set(), []
+        resultado = self.processar_listagem(nome_categoria, url, url_categoria)
+        if self.delay:
+            if self.max_workers == 1:
+                print(f"⏳ Aguardando {self.delay:g} segundos...")
+            time.sleep(self.delay)
+        return resultado
+    
+    def explorar_listagens(self, categorias):
+        """
+        Percorre as categorias e as listagens que elas citam, com todos os workers
+
+        Cada página nova entra na fila assim que é descoberta (o ritmo do cliente
+        vale para todas). Uma página que não traz nenhuma URL de produto nova
+        encerra aquele caminho; a página da categoria é sempre seguida.
+        """
+        fila = deque((nome, url, url) for nome, url in categorias.items())
+        vistas = {canonicalizar_url(url, hosts_equivalentes=self.sites.hosts_equivalentes) for url in categorias.values()}
+        paginas = dict.fromkeys(categorias, 1)
         
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            pendentes = {}
+            while fila or pendentes:
+                while fila and len(pendentes) < self.max_workers:
+                    nome, url, url_categoria = fila.popleft()
+                    futuro = executor.submit(self._processar_listagem_com_delay, nome, url, url_categoria)
+                    pendentes[futuro] = (nome, url, url_categoria)
+                
+                prontos, _ = wait(pendentes, return_when=FIRST_COMPLETED)
+                for futuro in prontos:
+                    nome, url, url_categoria = pendentes.pop(futuro)
+                    urls_produtos, listagens = futuro.result()
+                    novas = urls_produtos - self.urls_produtos
+                    self.urls_produtos.update(urls_produtos)
+                    if not novas and url != url_categoria:
+                        continue
+                    
+                    listagens = [listagem for listagem in listagens if listagem not in vistas]
+                    if listagens and self.cortesia:
+                        listagens = self.cortesia.filtrar(listagens)
+                    limite = self.sites.para(url_categoria).max_paginas_categoria
+                    for listagem in listagens:
+                        if paginas[nome] >= limite:
+                            print(f"⚠️ {nome}: limite de {limite} páginas de listagem atingido")
+                            break
+                        vistas.add(listagem)
+                        paginas[nome] += 1
+                        fila.append((nome, listagem, url_categoria))
+        
+        extras = sum(paginas.values()) - len(paginas)
+        if extras:
+            print(f"\n📑 {extras} páginas de listagem além das categorias (paginação e subcategorias)")
+    
+    def preparar_cortesia(self):
+        """Aplica o Crawl-delay do robots.txt; retorna as categorias que o robots.txt permite"""
+        if not self.cortesia or not self.categorias:
+            return dict(self.categorias)
+        primeiras = {urlparse(url).netloc: url for url in reversed(list(self.categorias.values()))}
+        intervalos = [self.cortesia.aplicar(url) for url in primeiras.values()]
+        if self.delay_automatico:
+            self.delay = 0.0 if all(intervalos) else DELAY_PADRAO
+        permitidas = set(self.cortesia.filtrar(list(self.categorias.values())))
+        return {nome: url for nome, url in self.categorias.items() if url in permitidas}
+    
+    def _visitar_pagina(self, url):
+        """Baixa uma página do rastreamento; retorna (produtos citados, links internos, é produto) ou None"""
+        html = self.extrair_html(url)
+        resultado = None
+        if html:
+            plano = self.sites.para(url)
+            produtos = self.filtrar_urls_produtos(self.extrair_urls_da_pagina(html, url))
+            # Sem links de produtos, a própria página é um produto se a URL e a tabela nutricional confirmarem
+            produto = not produtos and bool(self.filtrar_urls_produtos([url])) and plano.pagina_de_produto(html)
+            resultado = produtos, plano.links_internos(html, url), produto
+        if self.delay:
+            time.sleep(self.delay)
+        return resultado
+    
+    def rastrear_site(self, max_paginas=MAX_PAGINAS_RASTREIO, profundidade=MAX_PROFUNDIDADE, continuar=False,
+                      fronteira=None):
+        """
+        Percorre em largura as páginas de /produtos/ de cada site, seguindo os links internos
+
+        Não depende da lista de categorias: os produtos saem dos links de
+        produtos (mesmas regras de filtrar_urls_produtos) e das páginas que têm
+        a tabela nutricional. As páginas vistas ficam num filtro de Bloom e a
+        fila e os produtos num SQLite (config/fronteira.py), então a memória
+        não cresce com o tamanho do site.
+        """
+        from config.fronteira import FronteiraRastreamento
+        
+        print("🕸️  Rastreando o site inteiro a partir de /produtos/")
+        print("=" * 50)
+        fronteira = fronteira or FronteiraRastreamento(continuar=continuar)
+        categorias = self.preparar_cortesia()
+        raizes = [f'https://{plano.host}{plano.caminho_produtos}' for plano in self.sites]
+        if self.cortesia:
+            raizes = self.cortesia.filtrar(raizes)
+        for url in [*raizes, *categorias.values()]:
+            fronteira.adicionar(canonicalizar_url(url, hosts_equivalentes=self.sites.hosts_equivalentes), 0)
+        self.urls_produtos.update(fronteira.produtos_da_rodada())
+        
+        visitadas = 0
         try:
-            soup = BeautifulSoup(html, 'html.parser')
-            
-            # Procura especificamente pelos links de produtos com a classe btn-veja-mais
-            links_produtos = soup.find_all('a', class_='btn-default tiny-btn btn-veja-mais')
-            
-            for link in links_produtos:
-                href = link.get('href')
-                if href:
-                    # Adiciona o domínio base se necessário
-                    if href.startswith('produtos/'):
-                        url_absoluta = f"https://www.sadia.com.br/{href}"
-                    else:
-                        # Converte para URL absoluta
-                        url_absoluta = urljoin(url_base, href)
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                pendentes = {}
+                while True:
+                    vagas = min(self.max_workers - len(pendentes), max_paginas - visitadas - len(pendentes))
+                    if vagas > 0:
+                        for identificador, url, nivel in fronteira.proximas(vagas):
+                            print(f"\n🕸️  Nível {nivel}: {url}")
+                            pendentes[executor.submit(self._visitar_pagina, url)] = (identificador, url, nivel)
+                    if not pendentes:
+                        break
                     
-                    # Filtra apenas URLs da Sadia
-                    if 'sadia.com.br' in url_absoluta:
-                        urls_encontradas.add(url_absoluta)
+                    prontos, _ = wait(pendentes, return_when=FIRST_COMPLETED)
+                    for futuro in prontos:
+                        identificador, url, nivel = pendentes.pop(futuro)
+                        resultado = futuro.result()
+                        if resultado is not None:
+                            self._registrar_visita(fronteira, url, nivel, resultado, profundidade)
+                        # Sai da fila na mesma transação em que os links dela entram
+                        fronteira.concluir(identificador)
+                        visitadas += 1
+                        if visitadas % INTERVALO_SALVAR_RASTREIO == 0:
+                            fronteira.salvar()
             
-            return urls_encontradas
-            
-        except Exception as e:
-            print(f"❌ Erro ao extrair URLs: {e}")
-            return set()
+            restantes = len(fronteira)
+            print(f"\n✅ Rastreamento: {visitadas} páginas visitadas, {len(self.urls_produtos)} produtos nesta rodada "
+                  f"({fronteira.total_produtos()} no histórico)")
+            print(f"🧮 Filtro de páginas vistas: {len(fronteira.vistas)} URLs, "
+                  f"falso positivo estimado {fronteira.vistas.taxa_erro_atual():.2e}")
+            if restantes:
+                print(f"⚠️ Limite de {max_paginas} páginas atingido: {restantes} na fila "
+                      f"(continue com --continuar-rastreio)")
+        finally:
+            fronteira.fechar()
+    
+    def _registrar_visita(self, fronteira, url, nivel, resultado, profundidade):
+        """Confirma os produtos da página visitada e põe os links internos novos na fila"""
+        produtos, internos, produto = resultado
+        if produto:
+            produtos = produtos | {url}
+        for url_produto in produtos:
+            fronteira.confirmar_produto(url_produto)
+            self.urls_produtos.add(url_produto)
+        
+        if nivel < profundidade:
+            novas = [link for link in internos if link not in fronteira.vistas]
+            if novas and self.cortesia:
+                novas = self.cortesia.filtrar(novas)
+            for link in novas:
+                fronteira.adicionar(link, nivel + 1)
     
     def processar_todas_categorias(self):
         """Processa todas as categorias"""
+        if self.rastreamento is not None:
+            self.rastrear_site(**self.rastreamento)
+            return
+        
         print("🚀 Iniciando coleta de URLs de produtos")
         print("=" * 50)
+        categorias = self.preparar_cortesia()
         
-        for nome_categoria, url_categoria in self.categorias.items():
-            urls_produtos = self.processar_categoria(nome_categoria, url_categoria)
-            self.urls_produtos.update(urls_produtos)
-            
-            # Delay entre categorias
-            if nome_categoria != list(self.categorias.keys())[-1]:
-                print("⏳ Aguardando 3 segundos...")
-                time.sleep(3)
+        try:
+            if self.max_workers > 1:
+                print(f"⚙️  Usando {self.max_workers} workers em paralelo")
+            self.explorar_listagens(categorias)
+        
+        except CircuitoAberto as e:
+            print(f"\n🛑 {e}")
+            print("❌ Coleta interrompida: nenhuma URL será salva")
+            self.urls_produtos.clear()
+            return
         
         print(f"\n✅ Coleta concluída!")
         print(f"📊 Total de URLs de produtos encontradas: {len(self.urls_produtos)}")
     
     def salvar_json(self, nome_arquivo="urls_produtos.json"):
         """Salva as URLs em arquivo JSON"""
-        # Converte set para list para JSON
-        urls_lista = list(self.urls_produtos)
+        # Converte set para list para JSON (ordenada: a mesma coleta gera o mesmo arquivo)
+        urls_lista = sorted(self.urls_produtos)
         
         # Cria pasta dados se não existir
         os.makedirs('dados', exist_ok=True)
@@ -195,10 +355,21 @@ class URLCollector:
         # Salva o JSON
         caminho_arquivo = os.path.join('dados', nome_arquivo)
         
-        with open(caminho_arquivo, 'w', encoding='utf-8') as f:
+        temporario = caminho_arquivo + '.tmp'
+        with open(temporario, 'w', encoding='utf-8') as f:
             json.dump(urls_lista, f, indent=2, ensure_ascii=False)
+        os.replace(temporario, caminho_arquivo)
         
         print(f"💾 URLs salvas em: {caminho_arquivo}")
+        
+        # Atualiza o resumo pré-calculado usado pela tela de estatísticas
+        try:
+            resumo = ResumoDados.carregar()
+            resumo.registrar_urls(urls_lista, caminho_arquivo)
+            resumo.salvar()
+        except OSError as e:
+            print(f"⚠️ Não foi possível atualizar o resumo: {e}")
+        
         return caminho_arquivo
     
     def mostrar_estatisticas(self):
@@ -226,8 +397,9 @@ def main():
     print("🔗 URL Collector - Sadia")
     print("=" * 30)
     
-    # Cria o coletor
+    # Cria o coletor (respeitando o robots.txt do site)
     coletor = URLCollector()
+    coletor.cortesia = PoliticaRobots(coletor.cliente)
     
     # Processa todas as categorias
     coletor.processar_todas_categorias()
@@ -235,6 +407,11 @@ def main():
     # Mostra estatísticas
     coletor.mostrar_estatisticas()
     
+    # Não sobrescreve a coleta anterior com uma lista vazia
+    if not coletor.urls_produtos:
+        print("\n❌ Nenhuma URL de produto coletada")
+        sys.exit(1)
+    
     # Salva o JSON
     arquivo_salvo = coletor.salvar_json()
     
@@ -11,13 +11,15 @@ COMO USAR:
 2. Escolha a opção desejada no menu
 3. Acompanhe o progresso em tempo real
 4. Visualize os resultados na pasta dados/
+
+Para execução sem interação (cron/containers): python main.py <subcomando>
+(veja cli.py)
 """
 
 import os
 import sys
 import time
 import glob
-import json
 import subprocess
 from datetime import datetime
 from typing import List, Dict, Optional
@@ -195,42 +197,29 @@ def executar_coleta_completa():
     
     print(f"\n{Cores.AMARELO}⚠️  ATENÇÃO:{Cores.RESET}")
     print(f"   • Esta operação pode demorar {Cores.VERMELHO}5-10 minutos{Cores.RESET}")
-    print(f"   • Serão executadas duas etapas sequenciais")
-    print(f"   • 1º: Coleta de URLs de todas as categorias")
-    print(f"   • 2º: Extração de dados nutricionais")
+    print(f"   • Etapas: coleta de URLs, download, extração, validação, gravação e estatísticas")
+    print(f"   • Etapas em dia (entradas e código sem mudança) são puladas")
     
     confirmar = input(f"\n{Cores.MAGENTA}🤔 Continuar? (s/N): {Cores.RESET}").lower()
     
     if confirmar in ['s', 'sim', 'y', 'yes']:
         try:
-            # Etapa 1: Coleta de URLs
-            print(f"\n{Cores.VERDE}🔄 ETAPA 1: Coletando URLs...{Cores.RESET}")
-            mostrar_barra_progresso("Preparando coleta de URLs", 1.0)
-            resultado_urls = subprocess.run([
-                sys.executable, 'config/url_collector.py'
-            ], capture_output=True, text=True, encoding='utf-8')
-            
-            if resultado_urls.returncode != 0:
-                print(f"{Cores.VERMELHO}❌ Erro na coleta de URLs:{Cores.RESET}")
-                print(resultado_urls.stderr)
-                return
-            
-            print(f"{Cores.VERDE}✅ URLs coletadas com sucesso!{Cores.RESET}")
-            
-            # Etapa 2: Extração de dados
-            print(f"\n{Cores.VERDE}🔄 ETAPA 2: Extraindo dados nutricionais...{Cores.RESET}")
-            mostrar_barra_progresso("Preparando extração de dados", 1.0)
-            resultado_dados = subprocess.run([
-                sys.executable, 'config/scraper.py'
+            # Grafo de etapas: coleta, download, extração, validação, gravação e estatísticas
+            # (as etapas cujas entradas e código não mudaram desde a última execução são puladas)
+            print(f"\n{Cores.VERDE}🔄 Executando as etapas desatualizadas...{Cores.RESET}")
+            mostrar_barra_progresso("Preparando coleta completa", 1.0)
+            resultado = subprocess.run([
+                sys.executable, 'cli.py', 'completo'
             ], capture_output=True, text=True, encoding='utf-8')
             
-            if resultado_dados.returncode == 0:
+            if resultado.returncode == 0:
                 print(f"{Cores.VERDE}✅ Coleta completa finalizada com sucesso!{Cores.RESET}")
                 print(f"{Cores.CIANO}📊 Resultados:{Cores.RESET}")
-                print(resultado_dados.stdout)
+                print(resultado.stdout)
             else:
-                print(f"{Cores.VERMELHO}❌ Erro na extração de dados:{Cores.RESET}")
-                print(resultado_dados.stderr)
+                print(f"{Cores.VERMELHO}❌ Erro na coleta completa:{Cores.RESET}")
+                print(resultado.stdout)
+                print(resultado.stderr)
                 
         except Exception as e:
             print(f"\n{Cores.VERMELHO}❌ Erro durante execução: {e}{Cores.RESET}")
@@ -325,58 +314,58 @@ def limpar_dados_antigos():
     else:
         print(f"{Cores.AMARELO}⏭️  Operação cancelada{Cores.RESET}")
 
+def formatar_tamanho(tamanho: int) -> str:
+    """Formata um tamanho em bytes de forma legível"""
+    if tamanho < 1024:
+        return f"{tamanho} B"
+    elif tamanho < 1024 * 1024:
+        return f"{tamanho / 1024:.1f} KB"
+    return f"{tamanho / (1024 * 1024):.1f} MB"
+
 def mostrar_estatisticas():
     """Mostra estatísticas dos dados coletados"""
     print(f"\n{Cores.CIANO}{Cores.BOLD}📈 ESTATÍSTICAS DOS DADOS{Cores.RESET}")
     print(f"{Cores.AZUL}━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━{Cores.RESET}")
     
-    # Verifica arquivo de URLs
-    urls_file = "dados/urls_produtos.json"
-    if os.path.exists(urls_file):
-        try:
-            with open(urls_file, 'r', encoding='utf-8') as f:
-                urls = json.load(f)
-            print(f"{Cores.VERDE}🔗 URLs Coletadas:{Cores.RESET} {len(urls)} produtos")
-        except:
-            print(f"{Cores.VERMELHO}❌ Erro ao ler arquivo de URLs{Cores.RESET}")
-    else:
-        print(f"{Cores.AMARELO}⚠️  Arquivo de URLs não encontrado{Cores.RESET}")
+    # Lê apenas o resumo pré-calculado pelos gravadores (dados/resumo_dados.json)
+    from config.estatisticas import ResumoDados, ARQUIVO_RESUMO
+    resumo = ResumoDados.carregar()
+    if not resumo.existe():
+        print(f"{Cores.AMARELO}⚠️  Resumo não encontrado ({ARQUIVO_RESUMO}){Cores.RESET}")
+        print("   • Execute uma coleta para gerar as estatísticas")
+        return
     
-    # Verifica arquivo de dados
-    dados_file = "dados/produtos_sadia.csv"
-    if os.path.exists(dados_file):
-        try:
-            # Importa pandas apenas quando necessário
-            try:
-                import pandas as pd
-                df = pd.read_csv(dados_file)
-                print(f"{Cores.VERDE}📊 Dados Extraídos:{Cores.RESET} {len(df)} produtos")
-                
-                # Estatísticas por categoria
-                if 'CATEGORIA' in df.columns:
-                    categorias = df['CATEGORIA'].value_counts()
-                    print(f"\n{Cores.VERDE}📂 Produtos por Categoria:{Cores.RESET}")
-                    for categoria, quantidade in categorias.head(5).items():
-                        print(f"   • {categoria}: {quantidade} produtos")
-            except ImportError:
-                print(f"{Cores.AMARELO}⚠️  Pandas não instalado - não é possível ler estatísticas do CSV{Cores.RESET}")
-            
-        except Exception as e:
-            print(f"{Cores.VERMELHO}❌ Erro ao ler dados: {e}{Cores.RESET}")
+    # URLs coletadas
+    if resumo.urls['total']:
+        print(f"{Cores.VERDE}🔗 URLs Coletadas:{Cores.RESET} {resumo.urls['total']} produtos")
+    else:
+        print(f"{Cores.AMARELO}⚠️  Nenhuma URL coletada{Cores.RESET}")
+    
+    # Dados extraídos
+    produtos = resumo.produtos
+    if produtos['total']:
+        print(f"{Cores.VERDE}📊 Dados Extraídos:{Cores.RESET} {produtos['total']} produtos")
+        if produtos['gerado_em']:
+            print(f"   • Última extração: {produtos['gerado_em']}")
+        
+        # Estatísticas por categoria
+        categorias = sorted(produtos['por_categoria'].items(), key=lambda item: item[1], reverse=True)
+        print(f"\n{Cores.VERDE}📂 Produtos por Categoria:{Cores.RESET}")
+        for categoria, quantidade in categorias[:5]:
+            print(f"   • {categoria}: {quantidade} produtos")
+        
+        # Estatísticas nutricionais
+        print(f"\n{Cores.VERDE}🥗 Nutrientes (mín / média / máx):{Cores.RESET}")
+        for nome, valores in produtos['nutrientes'].items():
+            print(f"   • {nome}: {valores['min']:g} / {resumo.media(nome):.1f} / {valores['max']:g}")
     else:
-        print(f"{Cores.AMARELO}⚠️  Arquivo de dados não encontrado{Cores.RESET}")
+        print(f"{Cores.AMARELO}⚠️  Nenhum dado extraído{Cores.RESET}")
     
     # Informações do sistema
     print(f"\n{Cores.VERDE}💾 Espaço em Disco:{Cores.RESET}")
-    if os.path.exists('dados'):
-        total_size = sum(os.path.getsize(f) for f in glob.glob('dados/*') if os.path.isfile(f))
-        if total_size < 1024:
-            size_str = f"{total_size} B"
-        elif total_size < 1024 * 1024:
-            size_str = f"{total_size / 1024:.1f} KB"
-        else:
-            size_str = f"{total_size / (1024 * 1024):.1f} MB"
-        print(f"   • Pasta dados/: {size_str}")
+    print(f"   • Arquivos de saída registrados: {formatar_tamanho(resumo.tamanho_total())}")
+    if resumo.tamanho_pasta is not None:
+        print(f"   • Pasta dados/ (páginas, caches e relatórios incluídos): {formatar_tamanho(resumo.tamanho_pasta)}")
 
 def verificar_ambiente():
     """Verifica se o ambiente está configurado corretamente"""
@@ -534,4 +523,8 @@ def main():
         print(f"\n{Cores.VERMELHO}❌ Erro inesperado: {e}{Cores.RESET}")
 
 if __name__ == "__main__":
+    # Com argumentos, roda a CLI não interativa (cron/containers)
+    if len(sys.argv) > 1:
+        from cli import main as cli_main
+        sys.exit(cli_main(sys.argv[1:]))
     main() 
\ No newline at end of file